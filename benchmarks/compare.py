@@ -0,0 +1,183 @@
+"""Fail when hot-path benchmarks regress against a stored baseline.
+
+Compares the samples of each benchmark in a ``hot_paths.py`` result file with
+the baseline using a one-sided Mann-Whitney U test, and reports a regression
+when the median got slower by more than ``--threshold`` *and* the difference
+is significant at ``--alpha``. Only benchmarks matching a ``--gate`` prefix
+fail the command; the rest are reported for information. A benchmark with
+very few samples (such as the largest workflow graphs) cannot reach
+significance, so raise ``--repeat`` on both sides to gate it.
+
+    python benchmarks/hot_paths.py --output baseline.json   # on the old version
+    python benchmarks/compare.py baseline.json              # runs the suite now
+    python benchmarks/compare.py baseline.json --current hot_paths.json
+
+Baselines are only comparable with results from the same machine, so CI
+measures the target branch with its own ``hot_paths.py`` and the change on the
+same runner. Benchmarks missing from either side are listed and skipped.
+"""
+
+import argparse
+import json
+import math
+import sys
+
+GATED = (
+    "request_overhead_",
+    "workflow_to_noxus_",
+    "sse_aiter_messages",
+    "parse_",
+)
+
+
+def _ranks(values: list[float]) -> tuple[list[float], list[int]]:
+    """Average ranks (1-based) of ``values`` and the sizes of tied groups."""
+    order = sorted(range(len(values)), key=values.__getitem__)
+    ranks = [0.0] * len(values)
+    ties = []
+    i = 0
+    while i < len(order):
+        j = i
+        while j + 1 < len(order) and values[order[j + 1]] == values[order[i]]:
+            j += 1
+        for k in range(i, j + 1):
+            ranks[order[k]] = (i + j) / 2 + 1
+        ties.append(j - i + 1)
+        i = j + 1
+    return ranks, ties
+
+
+def slower_p_value(baseline: list[float], current: list[float]) -> float:
+    """P-value for "current is slower than baseline" (Mann-Whitney U, normal
+    approximation with tie correction)."""
+    n1, n2 = len(current), len(baseline)
+    if not n1 or not n2:
+        return 1.0
+    ranks, ties = _ranks(current + baseline)
+    u = sum(ranks[:n1]) - n1 * (n1 + 1) / 2
+    n = n1 + n2
+    tie_term = sum(t**3 - t for t in ties) / (n * (n - 1))
+    variance = n1 * n2 / 12 * ((n + 1) - tie_term)
+    if variance <= 0:
+        return 1.0
+    # Continuity correction towards the null
+    z = (u - n1 * n2 / 2 - 0.5) / math.sqrt(variance)
+    return 0.5 * math.erfc(z / math.sqrt(2))
+
+
+def _median(values: list[float]) -> float:
+    ordered = sorted(values)
+    middle = len(ordered) // 2
+    if len(ordered) % 2:
+        return ordered[middle]
+    return (ordered[middle - 1] + ordered[middle]) / 2
+
+
+def _samples(results: dict) -> dict[str, list[float]]:
+    """Samples by benchmark name; results from older versions of
+    ``hot_paths.py`` may lack benchmarks or fields."""
+    return {
+        r["name"]: r.get("samples") or []
+        for r in results.get("results", [])
+        if r.get("name")
+    }
+
+
+def compare(
+    baseline: dict,
+    current: dict,
+    threshold: float = 0.25,
+    alpha: float = 0.01,
+    gated: tuple[str, ...] = GATED,
+) -> list[dict]:
+    old = _samples(baseline)
+    rows = []
+    for name, after in _samples(current).items():
+        before = old.get(name)
+        if not before or not after:
+            # Only on one side, e.g. added by the change being checked
+            continue
+        ratio = _median(after) / _median(before) if _median(before) else 1.0
+        p_value = slower_p_value(before, after)
+        regressed = ratio > 1 + threshold and p_value < alpha
+        rows.append(
+            {
+                "name": name,
+                "baseline_us": round(_median(before), 3),
+                "current_us": round(_median(after), 3),
+                "ratio": round(ratio, 3),
+                "p_value": round(p_value, 5),
+                "gated": name.startswith(gated),
+                "regressed": regressed,
+            }
+        )
+    return rows
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("baseline", help="hot_paths.py JSON results to compare with")
+    parser.add_argument(
+        "--current", help="JSON results to check (default: run the suite now)"
+    )
+    parser.add_argument("--repeat", type=int, default=15)
+    parser.add_argument(
+        "--threshold",
+        type=float,
+        default=0.25,
+        help="allowed slowdown of the median, as a fraction (default: 0.25)",
+    )
+    parser.add_argument("--alpha", type=float, default=0.01)
+    parser.add_argument(
+        "--gate",
+        action="append",
+        help="benchmark name prefix that fails the check (repeatable, "
+        f"default: {', '.join(GATED)})",
+    )
+    parser.add_argument("--output", help="write the comparison as JSON to this file")
+    args = parser.parse_args(argv)
+
+    with open(args.baseline) as f:
+        baseline = json.load(f)
+    if args.current:
+        with open(args.current) as f:
+            current = json.load(f)
+    else:
+        from hot_paths import run_benchmarks
+
+        current = run_benchmarks(args.repeat)
+
+    rows = compare(
+        baseline, current, args.threshold, args.alpha, tuple(args.gate or GATED)
+    )
+    for row in rows:
+        flag = "REGRESSED" if row["regressed"] else "ok"
+        if row["regressed"] and not row["gated"]:
+            flag = "slower (not gated)"
+        print(
+            f"{row['name']:<28} {row['baseline_us']:>14.3f} -> "
+            f"{row['current_us']:>14.3f} us  x{row['ratio']:<6} "
+            f"p={row['p_value']:<8} {flag}",
+            file=sys.stderr,
+        )
+    compared = {row["name"] for row in rows}
+    skipped = sorted((_samples(baseline).keys() | _samples(current).keys()) - compared)
+    if skipped:
+        print(f"Not on both sides, skipped: {', '.join(skipped)}", file=sys.stderr)
+    if args.output:
+        with open(args.output, "w") as f:
+            json.dump(
+                {"benchmark": "compare", "results": rows, "skipped": skipped},
+                f,
+                indent=2,
+            )
+
+    failed = [row["name"] for row in rows if row["regressed"] and row["gated"]]
+    if failed:
+        print(f"Regressed hot paths: {', '.join(failed)}", file=sys.stderr)
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
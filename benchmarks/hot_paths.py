@@ -0,0 +1,421 @@
+"""Time the SDK's client-side hot paths against the in-process fake backend.
+
+Covers per-call ``Requester`` overhead, pagination throughput (page by page
+and with the prefetching iterators), ``Run.wait`` polling, SSE event
+throughput through ``aiter_messages``, Pydantic parsing of the main
+resources, ``WorkflowDefinition`` building and ``to_noxus`` for 10 to 10,000
+nodes, and cold import / ``Client()`` startup, with and without the on-disk
+node catalog cache. No network is used.
+
+Every result keeps its raw samples (microseconds per operation), so runs can
+be compared statistically between versions:
+
+    python benchmarks/hot_paths.py --output hot_paths.json
+    python benchmarks/hot_paths.py --only request_overhead --repeat 20
+    python benchmarks/hot_paths.py --keep-going  # skip benchmarks that fail
+"""
+
+import argparse
+import asyncio
+import io
+import json
+import platform
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from collections.abc import Awaitable, Callable
+from importlib import metadata
+
+import httpx
+
+from noxus_sdk.client import Client
+from noxus_sdk.fake_backend import DEFAULT_NODES, FAKE_API_KEY, FakeBackend
+from noxus_sdk.node_cache import NodeCatalogCache
+from noxus_sdk.resources.conversations import (
+    Conversation,
+    ConversationSettings,
+    MessageRequest,
+)
+from noxus_sdk.resources.knowledge_bases import KBConfigV3, KnowledgeBase, SearchResult
+from noxus_sdk.resources.runs import Run
+from noxus_sdk.workflows import WorkflowDefinition
+from noxus_sdk.workflows.workflow import load_node_types
+
+GRAPH_SIZES = (10, 100, 1000, 10_000)
+
+
+def _result(name: str, samples: list[float], ops: int = 1, **extra) -> dict:
+    per_op = [round(s / ops * 1e6, 3) for s in samples]
+    return {
+        "name": name,
+        "unit": "us",
+        "ops": ops,
+        "median": round(statistics.median(per_op), 3),
+        "mean": round(statistics.fmean(per_op), 3),
+        "stdev": round(statistics.stdev(per_op), 3) if len(per_op) > 1 else 0.0,
+        "min": min(per_op),
+        "samples": per_op,
+        **extra,
+    }
+
+
+def _measure(fn: Callable[[], object], repeat: int, number: int) -> list[float]:
+    fn()  # warm up
+    samples = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        for _ in range(number):
+            fn()
+        samples.append(time.perf_counter() - start)
+    return samples
+
+
+async def _ameasure(
+    fn: Callable[[], Awaitable[object]], repeat: int, number: int
+) -> list[float]:
+    await fn()
+    samples = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        for _ in range(number):
+            await fn()
+        samples.append(time.perf_counter() - start)
+    return samples
+
+
+def _mock_client(handler: Callable[[httpx.Request], httpx.Response]) -> Client:
+    client = Client(
+        FAKE_API_KEY,
+        load_nodes=False,
+        load_me=False,
+        transport=httpx.MockTransport(handler),
+        async_transport=httpx.MockTransport(handler),
+    )
+    client.base_url = "http://noxus.test"
+    return client
+
+
+def bench_request_overhead(repeat: int) -> list[dict]:
+    """Client-side cost of one call, with a transport that answers instantly."""
+    body = json.dumps({"id": "w", "name": "x", "items": list(range(20))}).encode()
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        return httpx.Response(
+            200, content=body, headers={"Content-Type": "application/json"}
+        )
+
+    number = 200
+    with _mock_client(handler) as client:
+        sync = _measure(lambda: client.get("/v1/workflows/w"), repeat, number)
+
+    async def run() -> list[float]:
+        async with _mock_client(handler) as client:
+            return await _ameasure(
+                lambda: client.aget("/v1/workflows/w"), repeat, number
+            )
+
+    return [
+        _result("request_overhead_sync", sync, number),
+        _result("request_overhead_async", asyncio.run(run()), number),
+    ]
+
+
+def bench_pagination(repeat: int, runs: int = 2000, page_size: int = 100) -> list[dict]:
+    backend = FakeBackend()
+    workflow_id = "w"
+    for _ in range(runs):
+        backend._new_run(workflow_id, {}, {})
+
+    async def scan(client: Client) -> None:
+        page = 1
+        while True:
+            items = await client.runs.alist(workflow_id, page, page_size)
+            if len(items) < page_size:
+                return
+            page += 1
+
+    async def iterate(client: Client) -> None:
+        async for _ in client.runs.aiter_all(workflow_id, page_size):
+            pass
+
+    async def run(fn: Callable[[Client], Awaitable[None]]) -> list[float]:
+        async with backend.client(load_me=False, load_nodes=False) as client:
+            return await _ameasure(lambda: fn(client), repeat, 1)
+
+    async def fan_out(client: Client) -> None:
+        async for _ in client.runs.aiter_all(workflow_id, page_size, concurrency=8):
+            pass
+
+    results = [
+        _result(name, asyncio.run(run(fn)), runs, runs=runs, page_size=page_size)
+        for name, fn in (("pagination_runs", scan), ("pagination_aiter_runs", iterate))
+    ]
+    # With a round trip per page, fetching pages concurrently is what counts
+    backend.latency = 0.01
+    results.extend(
+        _result(name, asyncio.run(run(fn)), runs, runs=runs, latency=backend.latency)
+        for name, fn in (
+            ("pagination_latency_sequential", scan),
+            ("pagination_latency_concurrent", fan_out),
+        )
+    )
+    return results
+
+
+def bench_run_wait(repeat: int, polls: int = 100) -> dict:
+    """Cost per poll of ``Run.wait``, excluding the sleep between polls."""
+    state = {"polls": 0}
+    run_body = {
+        "id": "r",
+        "group_id": "g",
+        "workflow_id": "w",
+        "input": {},
+        "status": "running",
+        "progress": 50,
+        "created_at": "2025-01-01T00:00:00",
+    }
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        state["polls"] += 1
+        status = "completed" if state["polls"] >= polls else "running"
+        return httpx.Response(200, json={**run_body, "status": status})
+
+    with _mock_client(handler) as client:
+
+        def wait() -> None:
+            state["polls"] = 0
+            Run(client=client, **run_body).wait(interval=0)
+
+        return _result("run_wait_poll", _measure(wait, repeat, 1), polls)
+
+
+def bench_sse(repeat: int, words: int = 500) -> dict:
+    backend = FakeBackend()
+    settings = ConversationSettings(model=["gpt-4o"], temperature=0, tools=[])
+
+    async def run() -> list[float]:
+        async with backend.client(load_me=False, load_nodes=False) as client:
+            conversation = await client.conversations.acreate("bench", settings)
+            await conversation.aadd_message(MessageRequest(content="word " * words))
+
+            async def consume() -> None:
+                async for _ in conversation.aiter_messages():
+                    pass
+
+            return await _ameasure(consume, repeat, 1)
+
+    # "You said:" plus the echoed words and the end event
+    return _result("sse_aiter_messages", asyncio.run(run()), words + 3)
+
+
+def bench_parse(repeat: int) -> list[dict]:
+    backend = FakeBackend()
+    with backend.client(load_me=False, load_nodes=False) as client:
+        kb = client.knowledge_bases.create(
+            name="kb", description="", document_types=["text"], settings_=KBConfigV3()
+        )
+        document = io.BytesIO(b"quick brown fox " * 100)
+        document.name = "doc.txt"
+        kb.upload_document([document])
+        search = client.post(
+            f"/v1/knowledge-bases/{kb.id}/search", params={"query": "fox"}
+        )[0]
+        kb_body = client.get(f"/v1/knowledge-bases/{kb.id}")
+        workflow = client.workflows.save(WorkflowDefinition(name="bench"))
+        run_body = client.post(
+            f"/v1/workflows/{workflow.id}/runs", {"input": {"text": "x" * 1000}}
+        )
+        settings = ConversationSettings(model=["gpt-4o"], temperature=0, tools=[])
+        conversation = client.conversations.create("bench", settings)
+        for _ in range(10):
+            conversation.add_message(MessageRequest(content="hello there"))
+        conversation_body = client.get(f"/v1/conversations/{conversation.id}")
+
+        number = 500
+        return [
+            _result(
+                f"parse_{name}",
+                _measure(parse, repeat, number),
+                number,
+            )
+            for name, parse in (
+                ("knowledge_base", lambda: KnowledgeBase(client=client, **kb_body)),
+                ("run", lambda: Run(client=client, **run_body)),
+                (
+                    "conversation",
+                    lambda: Conversation(client=client, **conversation_body),
+                ),
+                ("search_result", lambda: SearchResult(**search)),
+            )
+        ]
+
+
+def _build(nodes: int) -> WorkflowDefinition:
+    workflow = WorkflowDefinition(name="bench")
+    previous = workflow.node("InputNode")
+    for i in range(nodes - 2):
+        node = workflow.node("TextGenerationNode").config(
+            template=f"Step {i}: rewrite ((Input))"
+        )
+        workflow.link(previous.output(), node.input("variables", "Input"))
+        previous = node
+    workflow.link(previous.output(), workflow.node("OutputNode").input())
+    return workflow
+
+
+def bench_workflows(repeat: int, sizes: tuple[int, ...] = GRAPH_SIZES) -> list[dict]:
+    load_node_types(DEFAULT_NODES)
+    results = []
+    for size in sizes:
+        # Keep the total work per size roughly constant
+        number = max(1, 1000 // size)
+        runs = max(3, repeat // max(1, size // 100))
+        workflow = _build(size)
+        results.append(
+            _result(
+                f"workflow_build_{size}",
+                _measure(lambda s=size: _build(s), runs, number),
+                number,
+                nodes=size,
+            )
+        )
+        results.append(
+            _result(
+                f"workflow_to_noxus_{size}",
+                _measure(workflow.to_noxus, runs, number),
+                number,
+                nodes=size,
+            )
+        )
+    return results
+
+
+def _subprocess_time(code: str) -> float:
+    start = time.perf_counter()
+    subprocess.run([sys.executable, "-c", code], check=True)
+    return time.perf_counter() - start
+
+
+# What a short-lived process (serverless handler, CLI) pays before its first
+# request, each measured in a fresh interpreter
+COLD_STARTS = {
+    "cold_import": "import noxus_sdk",
+    "cold_import_resources": "import noxus_sdk.resources",
+    "cold_start_runs_client": (
+        "from noxus_sdk import Client\n"
+        "Client('key', load_nodes=False, load_me=False).runs"
+    ),
+}
+
+
+def bench_startup(repeat: int) -> list[dict]:
+    baseline = min(_subprocess_time("pass") for _ in range(3))
+    results = [
+        _result(
+            name,
+            [max(0.0, _subprocess_time(code) - baseline) for _ in range(repeat)],
+        )
+        for name, code in COLD_STARTS.items()
+    ]
+    nodes = json.dumps(DEFAULT_NODES).encode()
+    me = json.dumps(
+        {"id": "k", "name": "bench", "tenant_admin": False, "value": "v"}
+    ).encode()
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        body = nodes if request.url.path == "/v1/nodes" else me
+        return httpx.Response(
+            200, content=body, headers={"Content-Type": "application/json"}
+        )
+
+    transport = httpx.MockTransport(handler)
+
+    def startup() -> None:
+        Client(FAKE_API_KEY, base_url="http://noxus.test", transport=transport)
+
+    results.append(_result("client_startup", _measure(startup, repeat, 10), 10))
+
+    with tempfile.TemporaryDirectory() as directory:
+        cache = NodeCatalogCache(directory)
+
+        def cached_startup() -> None:
+            Client(
+                FAKE_API_KEY,
+                base_url="http://noxus.test",
+                transport=transport,
+                node_cache=cache,
+            )
+
+        results.append(
+            _result("client_startup_cached", _measure(cached_startup, repeat, 10), 10)
+        )
+    return results
+
+
+BENCHMARKS: dict[str, Callable[[int], dict | list[dict]]] = {
+    "request_overhead": bench_request_overhead,
+    "pagination": bench_pagination,
+    "run_wait": bench_run_wait,
+    "sse": bench_sse,
+    "parse": bench_parse,
+    "workflows": bench_workflows,
+    "startup": bench_startup,
+}
+
+
+def run_benchmarks(
+    repeat: int = 10, only: str | None = None, keep_going: bool = False
+) -> dict:
+    results = []
+    for name, bench in BENCHMARKS.items():
+        if only and only not in name:
+            continue
+        try:
+            result = bench(repeat)
+        except Exception as e:
+            if not keep_going:
+                raise
+            print(f"Skipping {name}: {e!r}", file=sys.stderr)
+            continue
+        results.extend(result if isinstance(result, list) else [result])
+    try:
+        version = metadata.version("noxus-sdk")
+    except metadata.PackageNotFoundError:
+        version = "unknown"
+    return {
+        "benchmark": "hot_paths",
+        "sdk_version": version,
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "repeat": repeat,
+        "results": results,
+    }
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--repeat", type=int, default=10)
+    parser.add_argument(
+        "--only", help="run only benchmarks whose name contains this string"
+    )
+    parser.add_argument("--output", help="write the JSON results to this file")
+    parser.add_argument(
+        "--keep-going",
+        action="store_true",
+        help="leave out benchmarks that fail instead of stopping",
+    )
+    args = parser.parse_args(argv)
+
+    results = run_benchmarks(args.repeat, args.only, args.keep_going)
+    output = json.dumps(results, indent=2)
+    if args.output:
+        with open(args.output, "w") as f:
+            f.write(output)
+    print(output)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,182 @@
+"""Compare the HTTP/1.1 pool against HTTP/2 multiplexing on a local server.
+
+Fires ``--requests`` concurrent ``Client.aget`` calls at a local hypercorn
+server (which answers after ``--latency`` seconds) and reports how many sockets
+the server saw and the client-side latency percentiles for each mode.
+
+    python benchmarks/http2.py --requests 500 --latency 0.05
+
+Requires the ``bench`` extra (``pip install noxus-sdk[bench]``) and the
+``openssl`` command. Both modes go through ``Client(http2=...)`` over TLS, with
+HTTP/2 negotiated by ALPN as against the real API, using a throwaway
+self-signed certificate that the client trusts through ``SSL_CERT_FILE``.
+"""
+
+import argparse
+import asyncio
+import json
+import os
+import socket
+import statistics
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+from pathlib import Path
+
+import httpx
+
+from noxus_sdk.client import Client
+
+
+class LocalServer:
+    def __init__(self, latency: float, certfile: Path, keyfile: Path):
+        self.latency = latency
+        self.certfile = certfile
+        self.keyfile = keyfile
+        self.peers: set[tuple[str, int]] = set()
+        self.port = _free_port()
+        self._shutdown: asyncio.Event | None = None
+        self._loop: asyncio.AbstractEventLoop | None = None
+        self._thread = threading.Thread(target=self._run, daemon=True)
+
+    async def app(self, scope, receive, send):
+        if scope["type"] != "http":
+            return
+        self.peers.add(tuple(scope["client"]))
+        await asyncio.sleep(self.latency)
+        await send(
+            {
+                "type": "http.response.start",
+                "status": 200,
+                "headers": [(b"content-type", b"application/json")],
+            }
+        )
+        await send({"type": "http.response.body", "body": b'{"ok": true}'})
+
+    def _run(self):
+        from hypercorn.asyncio import serve
+        from hypercorn.config import Config
+
+        config = Config()
+        config.bind = [f"127.0.0.1:{self.port}"]
+        config.certfile = str(self.certfile)
+        config.keyfile = str(self.keyfile)
+        config.loglevel = "ERROR"
+        config.keep_alive_max_requests = 1_000_000
+        config.h2_max_concurrent_streams = 1000
+        self._loop = asyncio.new_event_loop()
+        self._shutdown = asyncio.Event()
+        self._loop.run_until_complete(
+            serve(self.app, config, shutdown_trigger=self._shutdown.wait)  # type: ignore
+        )
+
+    def __enter__(self):
+        self._thread.start()
+        deadline = time.monotonic() + 10
+        while time.monotonic() < deadline:
+            try:
+                socket.create_connection(("127.0.0.1", self.port), timeout=0.1).close()
+                return self
+            except OSError:
+                time.sleep(0.05)
+        raise RuntimeError("local server did not start")
+
+    def __exit__(self, *args):
+        if self._loop and self._shutdown:
+            self._loop.call_soon_threadsafe(self._shutdown.set)
+        self._thread.join(timeout=5)
+
+
+def _self_signed_cert(directory: Path) -> tuple[Path, Path]:
+    certfile, keyfile = directory / "cert.pem", directory / "key.pem"
+    subprocess.run(
+        ["openssl", "req", "-x509", "-newkey", "rsa:2048", "-nodes", "-days", "1"]
+        + ["-keyout", str(keyfile), "-out", str(certfile)]
+        + ["-subj", "/CN=127.0.0.1", "-addext", "subjectAltName=IP:127.0.0.1"],
+        check=True,
+        capture_output=True,
+    )
+    return certfile, keyfile
+
+
+def _free_port() -> int:
+    with socket.socket() as s:
+        s.bind(("127.0.0.1", 0))
+        return s.getsockname()[1]
+
+
+def _percentile(samples: list[float], q: float) -> float:
+    ordered = sorted(samples)
+    return ordered[min(len(ordered) - 1, int(round(q * (len(ordered) - 1))))]
+
+
+async def _run_mode(server: LocalServer, http2: bool, requests: int, limits):
+    server.peers.clear()
+    base_url = f"https://127.0.0.1:{server.port}"
+    client = Client(
+        "bench",
+        base_url=base_url,
+        load_nodes=False,
+        load_me=False,
+        limits=limits,
+        http2=http2,
+        # Every request must reach the server to measure the connections
+        coalesce_gets=False,
+    )
+    # NOXUS_BACKEND_URL would otherwise take precedence over base_url
+    client.base_url = base_url
+
+    async def one() -> float:
+        start = time.perf_counter()
+        await client.aget("/v1/nodes")
+        return time.perf_counter() - start
+
+    async with client:
+        await one()
+        started = time.perf_counter()
+        latencies = await asyncio.gather(*(one() for _ in range(requests)))
+        wall = time.perf_counter() - started
+
+    return {
+        "mode": "http2" if http2 else "http1.1",
+        "requests": requests,
+        "sockets": len(server.peers),
+        "wall_s": round(wall, 4),
+        "p50_ms": round(statistics.median(latencies) * 1000, 2),
+        "p99_ms": round(_percentile(latencies, 0.99) * 1000, 2),
+    }
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--requests", type=int, default=500)
+    parser.add_argument("--latency", type=float, default=0.05)
+    parser.add_argument("--max-connections", type=int, default=100)
+    parser.add_argument("--output", help="write the JSON results to this file")
+    args = parser.parse_args(argv)
+
+    limits = httpx.Limits(
+        max_connections=args.max_connections,
+        max_keepalive_connections=args.max_connections,
+    )
+    with tempfile.TemporaryDirectory() as directory:
+        certfile, keyfile = _self_signed_cert(Path(directory))
+        os.environ["SSL_CERT_FILE"] = str(certfile)
+        with LocalServer(args.latency, certfile, keyfile) as server:
+            results = [
+                asyncio.run(_run_mode(server, False, args.requests, limits)),
+                asyncio.run(_run_mode(server, True, args.requests, limits)),
+            ]
+
+    output = json.dumps({"benchmark": "http2", "results": results}, indent=2)
+    if args.output:
+        with open(args.output, "w") as f:
+            f.write(output)
+    print(output)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
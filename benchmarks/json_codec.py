@@ -0,0 +1,162 @@
+"""Micro-benchmark the JSON codecs on typical Noxus payload shapes.
+
+Times ``loads``/``dumps`` for workflow definitions (as produced by
+``WorkflowDefinition.to_noxus``), run outputs and knowledge base search results
+of several sizes, plus SSE ``MessageEvent`` parsing, with every available codec.
+
+    python benchmarks/json_codec.py --output json_codec.json
+"""
+
+import argparse
+import json
+import sys
+import timeit
+import uuid
+
+from noxus_sdk.codec import JsonCodec, OrjsonCodec
+from noxus_sdk.resources.conversations import MessageEvent
+
+
+def workflow_payload(nodes: int) -> dict:
+    node_ids = [str(uuid.uuid4()) for _ in range(nodes)]
+    return {
+        "name": "Benchmark",
+        "type": "flow",
+        "definition": {
+            "nodes": [
+                {
+                    "type": "TextGenerationNode",
+                    "id": node_id,
+                    "name": "Generate Text",
+                    "display": {"position": {"x": 350 * i, "y": 0}},
+                    "node_config": {"template": "Write about ((Input 1))" * 4},
+                    "connector_config": {
+                        "inputs": [{"name": "variables", "type": "variable_connector"}],
+                        "outputs": [{"name": "output", "type": "output"}],
+                    },
+                    "config_definition": {},
+                    "subflow_config": None,
+                    "subflow_id": None,
+                    "inputs": [
+                        {"node_id": node_id, "name": "variables", "type": "input"}
+                    ],
+                    "outputs": [
+                        {"node_id": node_id, "name": "output", "type": "output"}
+                    ],
+                }
+                for i, node_id in enumerate(node_ids)
+            ],
+            "edges": [
+                {
+                    "id": str(uuid.uuid4()),
+                    "from_id": {"node_id": a, "connector_name": "output"},
+                    "to_id": {"node_id": b, "connector_name": "variables"},
+                }
+                for a, b in zip(node_ids, node_ids[1:], strict=False)
+            ],
+        },
+    }
+
+
+def run_payload(output_kb: int) -> dict:
+    return {
+        "id": str(uuid.uuid4()),
+        "group_id": str(uuid.uuid4()),
+        "workflow_id": str(uuid.uuid4()),
+        "input": {"Input 1": "cars"},
+        "status": "completed",
+        "progress": 100,
+        "created_at": "2025-01-01T00:00:00",
+        "output": {"Output": "lorem ipsum dolor sit amet " * (output_kb * 38)},
+    }
+
+
+def search_payload(results: int) -> list:
+    return [
+        {
+            "score": 0.5,
+            "content": "chunk text " * 200,
+            "source": None,
+            "document_source": {
+                "id": str(uuid.uuid4()),
+                "name": "doc.pdf",
+                "status": "trained",
+                "doc_metadata": {"pages": 10},
+                "prefix": "/",
+            },
+        }
+        for _ in range(results)
+    ]
+
+
+PAYLOADS = {
+    "workflow_10_nodes": workflow_payload(10),
+    "workflow_1000_nodes": workflow_payload(1000),
+    "run_output_10kb": run_payload(10),
+    "run_output_1mb": run_payload(1024),
+    "kb_search_50_results": search_payload(50),
+}
+
+
+def _time(fn, repeat: int) -> float:
+    number = max(1, repeat)
+    return min(timeit.repeat(fn, number=number, repeat=5)) / number
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--repeat", type=int, default=50)
+    parser.add_argument("--output", help="write the JSON results to this file")
+    args = parser.parse_args(argv)
+
+    codecs: list[JsonCodec] = [JsonCodec()]
+    try:
+        codecs.append(OrjsonCodec())
+    except ImportError:
+        print("orjson not installed, timing the stdlib codec only", file=sys.stderr)
+
+    results = []
+    for name, payload in PAYLOADS.items():
+        encoded = JsonCodec().dumps(payload)
+        for codec in codecs:
+            results.append(
+                {
+                    "payload": name,
+                    "bytes": len(encoded),
+                    "codec": codec.name,
+                    "loads_us": round(
+                        _time(lambda: codec.loads(encoded), args.repeat) * 1e6, 2
+                    ),
+                    "dumps_us": round(
+                        _time(lambda: codec.dumps(payload), args.repeat) * 1e6, 2
+                    ),
+                }
+            )
+
+    event = json.dumps({"role": "assistant", "type": "message", "content": "hi " * 100})
+    for parse_name, parse in [
+        ("model_validate_json", lambda: MessageEvent.model_validate_json(event)),
+        (
+            "json.loads+model_validate",
+            lambda: MessageEvent.model_validate(json.loads(event)),
+        ),
+    ]:
+        results.append(
+            {
+                "payload": "sse_message_event",
+                "bytes": len(event),
+                "codec": parse_name,
+                "loads_us": round(_time(parse, args.repeat * 100) * 1e6, 3),
+            }
+        )
+
+    output = json.dumps({"benchmark": "json_codec", "results": results}, indent=2)
+    if args.output:
+        with open(args.output, "w") as f:
+            f.write(output)
+    print(output)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
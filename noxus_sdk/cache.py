@@ -0,0 +1,163 @@
+import threading
+import time
+from collections import OrderedDict
+from collections.abc import Hashable
+
+import httpx
+
+# Stored bodies are already decoded, so headers describing the wire encoding
+# must not be replayed with them.
+_DROPPED_HEADERS = frozenset(
+    {"content-encoding", "content-length", "transfer-encoding"}
+)
+
+
+class CacheEntry:
+    __slots__ = (
+        "content",
+        "etag",
+        "headers",
+        "last_modified",
+        "path",
+        "status_code",
+        "stored_at",
+        "ttl",
+    )
+
+    def __init__(self, path: str, response: httpx.Response, ttl: float):
+        self.path = path
+        self.status_code = response.status_code
+        self.headers = [
+            (k, v)
+            for k, v in response.headers.multi_items()
+            if k.lower() not in _DROPPED_HEADERS
+        ]
+        self.content = response.content
+        self.etag = response.headers.get("etag")
+        self.last_modified = response.headers.get("last-modified")
+        self.ttl = ttl
+        self.stored_at = time.monotonic()
+
+    @property
+    def size(self) -> int:
+        return len(self.content)
+
+    def is_fresh(self) -> bool:
+        return time.monotonic() - self.stored_at < self.ttl
+
+    def conditional_headers(self) -> dict[str, str]:
+        headers = {}
+        if self.etag:
+            headers["If-None-Match"] = self.etag
+        if self.last_modified:
+            headers["If-Modified-Since"] = self.last_modified
+        return headers
+
+    def to_response(self, request: httpx.Request) -> httpx.Response:
+        return httpx.Response(
+            self.status_code,
+            headers=self.headers,
+            content=self.content,
+            request=request,
+        )
+
+
+class ResponseCache:
+    """In-memory LRU cache for GET responses, bounded by total body size.
+
+    Entries younger than their TTL are served without a request. Older entries
+    that carry an ``ETag`` or ``Last-Modified`` validator are revalidated with a
+    conditional request and served from memory on ``304 Not Modified``.
+    ``ttl_overrides`` maps path prefixes (e.g. ``"/v1/nodes"``) to a TTL in
+    seconds; the longest matching prefix wins.
+    """
+
+    def __init__(
+        self,
+        max_bytes: int = 32 * 1024 * 1024,
+        default_ttl: float = 0.0,
+        ttl_overrides: dict[str, float] | None = None,
+    ):
+        self.max_bytes = max_bytes
+        self.default_ttl = default_ttl
+        self.ttl_overrides = sorted(
+            (ttl_overrides or {}).items(), key=lambda item: len(item[0]), reverse=True
+        )
+        self._entries: OrderedDict[Hashable, CacheEntry] = OrderedDict()
+        self._lock = threading.Lock()
+        self.size = 0
+        self.hits = 0
+        self.revalidated = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def ttl_for(self, path: str) -> float:
+        for prefix, ttl in self.ttl_overrides:
+            if path.startswith(prefix):
+                return ttl
+        return self.default_ttl
+
+    def get(self, key: Hashable) -> CacheEntry | None:
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            if entry.is_fresh():
+                self.hits += 1
+            return entry
+
+    def store(self, key: Hashable, path: str, response: httpx.Response) -> None:
+        if response.status_code != 200:
+            return
+        if "no-store" in response.headers.get("cache-control", ""):
+            return
+        entry = CacheEntry(path, response, self.ttl_for(path))
+        if entry.size > self.max_bytes or not (
+            entry.ttl > 0 or entry.etag or entry.last_modified
+        ):
+            return
+        with self._lock:
+            old = self._entries.pop(key, None)
+            if old is not None:
+                self.size -= old.size
+            self._entries[key] = entry
+            self.size += entry.size
+            while self.size > self.max_bytes:
+                _, evicted = self._entries.popitem(last=False)
+                self.size -= evicted.size
+                self.evictions += 1
+
+    def mark_revalidated(self, entry: CacheEntry) -> None:
+        with self._lock:
+            entry.stored_at = time.monotonic()
+            self.revalidated += 1
+
+    def invalidate(self, path: str) -> None:
+        """Drop entries for ``path``, the resources below it and its parents."""
+        path = path.split("?", 1)[0]
+        with self._lock:
+            stale = [
+                key
+                for key, entry in self._entries.items()
+                if entry.path.startswith(path) or path.startswith(entry.path)
+            ]
+            for key in stale:
+                self.size -= self._entries.pop(key).size
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+            self.size = 0
+
+    def snapshot(self) -> dict:
+        with self._lock:
+            return {
+                "entries": len(self._entries),
+                "size": self.size,
+                "hits": self.hits,
+                "revalidated": self.revalidated,
+                "misses": self.misses,
+                "evictions": self.evictions,
+            }
@@ -0,0 +1,310 @@
+import asyncio
+import base64
+import gzip
+import json
+import threading
+import time
+from collections import defaultdict, deque
+from collections.abc import AsyncIterator, Callable, Iterator
+from pathlib import Path
+from typing import IO, Any
+
+import httpx
+
+RECORD = "record"
+REPLAY = "replay"
+
+# Recomputed by httpx on replay, or would describe the wrong framing
+_DROPPED_HEADERS = frozenset({"transfer-encoding", "connection", "keep-alive"})
+
+
+class CassetteMiss(LookupError):
+    pass
+
+
+class Interaction:
+    __slots__ = ("chunks", "elapsed", "headers", "method", "status", "url")
+
+    def __init__(
+        self,
+        method: str,
+        url: str,
+        status: int,
+        headers: list[tuple[str, str]],
+        elapsed: float,
+        chunks: list[tuple[float, bytes]] | None = None,
+    ):
+        self.method = method
+        self.url = url
+        self.status = status
+        self.headers = headers
+        self.elapsed = elapsed
+        self.chunks = chunks if chunks is not None else []
+
+    def to_json(self) -> dict[str, Any]:
+        chunks = []
+        for offset, data in self.chunks:
+            try:
+                chunks.append({"t": round(offset, 6), "text": data.decode()})
+            except UnicodeDecodeError:
+                chunks.append(
+                    {"t": round(offset, 6), "b64": base64.b64encode(data).decode()}
+                )
+        return {
+            "method": self.method,
+            "url": self.url,
+            "status": self.status,
+            "headers": self.headers,
+            "elapsed": round(self.elapsed, 6),
+            "chunks": chunks,
+        }
+
+    @classmethod
+    def from_json(cls, data: dict[str, Any]) -> "Interaction":
+        chunks = [
+            (
+                chunk["t"],
+                chunk["text"].encode()
+                if "text" in chunk
+                else base64.b64decode(chunk["b64"]),
+            )
+            for chunk in data["chunks"]
+        ]
+        return cls(
+            data["method"],
+            data["url"],
+            data["status"],
+            [(k, v) for k, v in data["headers"]],
+            data["elapsed"],
+            chunks,
+        )
+
+
+def _key(request: httpx.Request) -> tuple[str, str]:
+    # Host-independent, so a cassette can be replayed against any base URL
+    return request.method, request.url.raw_path.decode("ascii")
+
+
+def _open(path: Path, mode: str) -> IO[str]:
+    if path.suffix == ".gz":
+        return gzip.open(path, mode + "t", encoding="utf-8")  # type: ignore[return-value]
+    return open(path, mode, encoding="utf-8")
+
+
+class Cassette:
+    """Recorded API interactions, for running the client without a network.
+
+    In ``"record"`` mode every response that passes through the client,
+    including streamed and SSE bodies, is written to ``path`` as one JSON
+    line with the time to headers and the arrival time of each chunk. In
+    ``"replay"`` mode requests are answered from the file in recorded order
+    per method and path. ``speed=None`` replays as fast as possible, while
+    ``speed=1.0`` reproduces the original timings (``2.0`` is twice as fast).
+    Once the recordings for a request are used up, the last one is repeated
+    unless ``allow_repeats=False``, in which case :class:`CassetteMiss` is
+    raised. Paths ending in ``.gz`` are compressed.
+
+        client = Client(api_key, cassette=Cassette("api.jsonl", mode="record"))
+    """
+
+    def __init__(
+        self,
+        path: str | Path,
+        mode: str = REPLAY,
+        speed: float | None = None,
+        allow_repeats: bool = True,
+    ):
+        if mode not in (RECORD, REPLAY):
+            raise ValueError(f"Unknown cassette mode: {mode}")
+        self.path = Path(path)
+        self.mode = mode
+        self.speed = speed
+        self.allow_repeats = allow_repeats
+        self._lock = threading.Lock()
+        self._file: IO[str] | None = None
+        self._queues: dict[tuple[str, str], deque[Interaction]] = defaultdict(deque)
+        self._last: dict[tuple[str, str], Interaction] = {}
+        if mode == RECORD:
+            self._file = _open(self.path, "w")
+        else:
+            with _open(self.path, "r") as f:
+                for line in f:
+                    if line.strip():
+                        interaction = Interaction.from_json(json.loads(line))
+                        key = (interaction.method, interaction.url)
+                        self._queues[key].append(interaction)
+
+    def transport(
+        self, inner: "httpx.BaseTransport | httpx.AsyncBaseTransport | None" = None
+    ) -> "RecordingTransport | ReplayTransport":
+        if self.mode == REPLAY:
+            return ReplayTransport(self)
+        if inner is None:
+            raise ValueError("Recording needs a transport to send requests through")
+        return RecordingTransport(self, inner)
+
+    def append(self, interaction: Interaction) -> None:
+        line = json.dumps(interaction.to_json(), separators=(",", ":"))
+        with self._lock:
+            if self._file is None or self._file.closed:
+                return
+            self._file.write(line + "\n")
+            self._file.flush()
+
+    def next(self, request: httpx.Request) -> Interaction:
+        key = _key(request)
+        with self._lock:
+            queue = self._queues.get(key)
+            if queue:
+                interaction = self._last[key] = queue.popleft()
+                return interaction
+            if self.allow_repeats and key in self._last:
+                return self._last[key]
+        raise CassetteMiss(f"No recorded response for {key[0]} {key[1]}")
+
+    def delay(self, seconds: float) -> float:
+        return 0.0 if not self.speed else seconds / self.speed
+
+    def close(self) -> None:
+        with self._lock:
+            if self._file is not None:
+                self._file.close()
+
+
+class _RecordingStream(httpx.SyncByteStream, httpx.AsyncByteStream):
+    def __init__(
+        self,
+        stream: Any,
+        interaction: Interaction,
+        started: float,
+        on_close: Callable[[Interaction], None],
+    ):
+        self.stream = stream
+        self.interaction = interaction
+        self.started = started
+        self.on_close = on_close
+        self.closed = False
+
+    def _record(self, chunk: bytes) -> None:
+        self.interaction.chunks.append((time.monotonic() - self.started, chunk))
+
+    def __iter__(self) -> Iterator[bytes]:
+        for chunk in self.stream:
+            self._record(chunk)
+            yield chunk
+
+    async def __aiter__(self) -> AsyncIterator[bytes]:
+        async for chunk in self.stream:
+            self._record(chunk)
+            yield chunk
+
+    def _finish(self) -> None:
+        if not self.closed:
+            self.closed = True
+            self.on_close(self.interaction)
+
+    def close(self) -> None:
+        try:
+            self.stream.close()
+        finally:
+            self._finish()
+
+    async def aclose(self) -> None:
+        try:
+            await self.stream.aclose()
+        finally:
+            self._finish()
+
+
+class RecordingTransport(httpx.BaseTransport, httpx.AsyncBaseTransport):
+    def __init__(self, cassette: Cassette, inner: Any):
+        self.cassette = cassette
+        self.inner = inner
+
+    def _wrap(
+        self, request: httpx.Request, response: httpx.Response, started: float
+    ) -> httpx.Response:
+        now = time.monotonic()
+        interaction = Interaction(
+            request.method,
+            _key(request)[1],
+            response.status_code,
+            [
+                (k, v)
+                for k, v in response.headers.multi_items()
+                if k.lower() not in _DROPPED_HEADERS
+            ],
+            now - started,
+        )
+        return httpx.Response(
+            response.status_code,
+            headers=response.headers,
+            stream=_RecordingStream(
+                response.stream, interaction, now, self.cassette.append
+            ),
+            extensions=response.extensions,
+        )
+
+    def handle_request(self, request: httpx.Request) -> httpx.Response:
+        started = time.monotonic()
+        return self._wrap(request, self.inner.handle_request(request), started)
+
+    async def handle_async_request(self, request: httpx.Request) -> httpx.Response:
+        started = time.monotonic()
+        response = await self.inner.handle_async_request(request)
+        return self._wrap(request, response, started)
+
+    def close(self) -> None:
+        self.inner.close()
+
+    async def aclose(self) -> None:
+        await self.inner.aclose()
+
+
+class _ReplayStream(httpx.SyncByteStream, httpx.AsyncByteStream):
+    def __init__(self, cassette: Cassette, interaction: Interaction):
+        self.cassette = cassette
+        self.interaction = interaction
+
+    def __iter__(self) -> Iterator[bytes]:
+        previous = 0.0
+        for offset, chunk in self.interaction.chunks:
+            if pause := self.cassette.delay(offset - previous):
+                time.sleep(pause)
+            previous = offset
+            yield chunk
+
+    async def __aiter__(self) -> AsyncIterator[bytes]:
+        previous = 0.0
+        for offset, chunk in self.interaction.chunks:
+            if pause := self.cassette.delay(offset - previous):
+                await asyncio.sleep(pause)
+            previous = offset
+            yield chunk
+
+
+class ReplayTransport(httpx.BaseTransport, httpx.AsyncBaseTransport):
+    def __init__(self, cassette: Cassette):
+        self.cassette = cassette
+
+    def _response(
+        self, request: httpx.Request, interaction: Interaction
+    ) -> httpx.Response:
+        return httpx.Response(
+            interaction.status,
+            headers=interaction.headers,
+            stream=_ReplayStream(self.cassette, interaction),
+            request=request,
+        )
+
+    def handle_request(self, request: httpx.Request) -> httpx.Response:
+        interaction = self.cassette.next(request)
+        if pause := self.cassette.delay(interaction.elapsed):
+            time.sleep(pause)
+        return self._response(request, interaction)
+
+    async def handle_async_request(self, request: httpx.Request) -> httpx.Response:
+        interaction = self.cassette.next(request)
+        if pause := self.cassette.delay(interaction.elapsed):
+            await asyncio.sleep(pause)
+        return self._response(request, interaction)
@@ -0,0 +1,174 @@
+import threading
+import time
+from collections.abc import Callable, Iterator
+from contextlib import contextmanager
+
+import httpx
+
+from noxus_sdk.endpoints import endpoint_family
+
+CLOSED = "closed"
+OPEN = "open"
+HALF_OPEN = "half_open"
+
+DEFAULT_FAMILY = "default"
+
+
+class CircuitOpenError(Exception):
+    """Raised without contacting the backend while a circuit is open."""
+
+    def __init__(self, host: str, family: str, retry_in: float):
+        super().__init__(
+            f"Circuit for {host} ({family}) is open, retry in {retry_in:.1f}s"
+        )
+        self.host = host
+        self.family = family
+        self.retry_in = retry_in
+
+
+class Circuit:
+    def __init__(self) -> None:
+        self.state = CLOSED
+        self.failures = 0
+        self.opened_at: float | None = None
+        self.probes = 0
+        self.total_failures = 0
+        self.rejected = 0
+        self.times_opened = 0
+
+    def snapshot(self) -> dict:
+        return {
+            "state": self.state,
+            "consecutive_failures": self.failures,
+            "total_failures": self.total_failures,
+            "rejected": self.rejected,
+            "times_opened": self.times_opened,
+        }
+
+
+class CircuitBreaker:
+    """Fails fast while the backend is failing.
+
+    A circuit is kept per host and endpoint family. It opens after
+    ``failure_threshold`` consecutive 5xx responses, timeouts or connection
+    errors, rejects requests with :class:`CircuitOpenError` for
+    ``recovery_time`` seconds, then lets up to ``half_open_probes`` requests
+    through. A successful probe closes the circuit and a failed one reopens it.
+    """
+
+    def __init__(
+        self,
+        failure_threshold: int = 5,
+        recovery_time: float = 30.0,
+        half_open_probes: int = 1,
+    ):
+        self.failure_threshold = failure_threshold
+        self.recovery_time = recovery_time
+        self.half_open_probes = half_open_probes
+        self._lock = threading.Lock()
+        self._circuits: dict[tuple[str, str], Circuit] = {}
+
+    def is_failure(self, response: httpx.Response) -> bool:
+        return response.status_code >= 500
+
+    def _circuit(self, key: tuple[str, str]) -> Circuit:
+        circuit = self._circuits.get(key)
+        if circuit is None:
+            circuit = self._circuits[key] = Circuit()
+        return circuit
+
+    def _acquire(self, key: tuple[str, str]) -> None:
+        with self._lock:
+            circuit = self._circuit(key)
+            if circuit.state == OPEN:
+                assert circuit.opened_at is not None
+                retry_in = circuit.opened_at + self.recovery_time - time.monotonic()
+                if retry_in > 0:
+                    circuit.rejected += 1
+                    raise CircuitOpenError(*key, retry_in)
+                circuit.state = HALF_OPEN
+            if circuit.state == HALF_OPEN:
+                if circuit.probes >= self.half_open_probes:
+                    circuit.rejected += 1
+                    raise CircuitOpenError(*key, 0.0)
+                circuit.probes += 1
+
+    def _release(self, key: tuple[str, str], failed: bool | None) -> None:
+        with self._lock:
+            circuit = self._circuit(key)
+            if circuit.state == HALF_OPEN:
+                circuit.probes -= 1
+            if failed is None:
+                return
+            if not failed:
+                circuit.failures = 0
+                if circuit.state == HALF_OPEN:
+                    circuit.state = CLOSED
+                return
+            circuit.failures += 1
+            circuit.total_failures += 1
+            if circuit.state == HALF_OPEN or (
+                circuit.state == CLOSED and circuit.failures >= self.failure_threshold
+            ):
+                circuit.state = OPEN
+                circuit.opened_at = time.monotonic()
+                circuit.times_opened += 1
+
+    @contextmanager
+    def guard(
+        self, base_url: str, method: str, url: str
+    ) -> Iterator[Callable[[httpx.Response], None]]:
+        """Admit one attempt, yielding a callback that records its response.
+
+        Recording releases the attempt, so a streamed body read afterwards
+        does not keep holding a half-open probe. Timeouts count as failures,
+        but not ``DeadlineExceeded``: callers report a timeout caused by their
+        own expired deadline as that, so it says nothing about the backend.
+        """
+        key = (httpx.URL(base_url).host, endpoint_family(method, url) or DEFAULT_FAMILY)
+        self._acquire(key)
+        released = False
+
+        def settle(failed: bool | None) -> None:
+            nonlocal released
+            if not released:
+                released = True
+                self._release(key, failed)
+
+        try:
+            yield lambda response: settle(self.is_failure(response))
+        except (httpx.TimeoutException, httpx.NetworkError):
+            settle(True)
+            raise
+        finally:
+            settle(None)
+
+    def _state(self, circuit: Circuit) -> str:
+        if (
+            circuit.state == OPEN
+            and circuit.opened_at is not None
+            and time.monotonic() - circuit.opened_at >= self.recovery_time
+        ):
+            return HALF_OPEN
+        return circuit.state
+
+    def state(self, host: str, family: str | None = None) -> str:
+        with self._lock:
+            circuit = self._circuits.get((host, family or DEFAULT_FAMILY))
+            return CLOSED if circuit is None else self._state(circuit)
+
+    def healthy(self) -> bool:
+        """False while any circuit is open."""
+        with self._lock:
+            return all(self._state(c) != OPEN for c in self._circuits.values())
+
+    def snapshot(self) -> dict:
+        with self._lock:
+            return {
+                f"{host}/{family}": circuit.snapshot()
+                for (host, family), circuit in self._circuits.items()
+            }
+
+    def reset(self) -> None:
+        with self._lock:
+            self._circuits.clear()
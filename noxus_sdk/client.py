@@ -1,25 +1,380 @@
 import asyncio
+import importlib
+import logging
 import os
+import threading
 import time
-from typing import Any, BinaryIO, TYPE_CHECKING
+import weakref
+from contextlib import asynccontextmanager, contextmanager, nullcontext
+from typing import Any, BinaryIO, Generic, TYPE_CHECKING, TypeVar, overload
 
 import httpx
 from httpx_sse import ServerSentEvent, connect_sse, aconnect_sse
 
+from noxus_sdk.cache import ResponseCache
+from noxus_sdk.cassette import Cassette
+from noxus_sdk.circuit import CircuitBreaker
+from noxus_sdk.codec import JsonCodec, default_codec
+from noxus_sdk.compression import RequestCompressor
+from noxus_sdk.concurrency import ConcurrencyLimiter, gather_or_cancel
+from noxus_sdk.deadlines import (
+    Deadline,
+    DeadlineExceeded,
+    current_deadline,
+    earliest,
+    expiry_errors,
+)
+from noxus_sdk.endpoints import url_template
+from noxus_sdk.hooks import (
+    REQUEST,
+    RESPONSE,
+    RETRY,
+    THROTTLE,
+    Hooks,
+    RequestTrace,
+)
+from noxus_sdk.metrics import Metrics
+from noxus_sdk.node_cache import CachedCatalog, NodeCatalogCache
+from noxus_sdk.pagination import (
+    PageCursor,
+    aiter_pages,
+    aiter_pages_concurrently,
+    iter_pages,
+)
+from noxus_sdk.retry import RetryPolicy, ThrottleStats
+from noxus_sdk.singleflight import SingleFlight
+from noxus_sdk.tracing import NOOP_SPAN, Span, Tracer
+from noxus_sdk.uploads import MultipartUpload
+
 if TYPE_CHECKING:
-    from collections.abc import AsyncIterator, Iterator
+    from collections.abc import AsyncIterator, Callable, Iterator
+    from contextlib import AbstractContextManager
+
+    from noxus_sdk.resources.admin import AdminService
+    from noxus_sdk.resources.agentflows import AgentFlowService
+    from noxus_sdk.resources.assistants import AgentService
+    from noxus_sdk.resources.conversations import ConversationService
+    from noxus_sdk.resources.files import FileService
+    from noxus_sdk.resources.knowledge_bases import KnowledgeBaseService
+    from noxus_sdk.resources.runs import RunService
+    from noxus_sdk.resources.workflows import WorkflowService
+    from noxus_sdk.workflows.workflow import NodeRegistry
+
+logger = logging.getLogger(__name__)
 
 FileContent = BinaryIO | bytes | str
 HttpxFile = tuple[str, tuple[str, FileContent, str | None]]
-RequestFiles = dict[str, Any] | list[HttpxFile] | None
+HttpxFiles = dict[str, Any] | list[HttpxFile] | None
+RequestFiles = HttpxFiles | MultipartUpload
+
+
+DEFAULT_LIMITS = httpx.Limits(
+    max_connections=100, max_keepalive_connections=20, keepalive_expiry=30.0
+)
+
+
+@contextmanager
+def _ending(span: Span) -> "Iterator[Span]":
+    try:
+        yield span
+    except Exception as e:
+        span.record_exception(e)
+        raise
+    finally:
+        span.end()
+
+
+def _unguarded(response: httpx.Response) -> None:
+    pass
+
+
+S = TypeVar("S")
+
+
+class _Service(Generic[S]):
+    """A client attribute holding a service, built on first access."""
+
+    def __init__(self, path: str):
+        self.module, _, self.cls = f"noxus_sdk.{path}".rpartition(".")
+
+    def __set_name__(self, owner: type, name: str) -> None:
+        self.name = name
+
+    @overload
+    def __get__(self, client: None, owner: type) -> "_Service[S]": ...
+
+    @overload
+    def __get__(self, client: "Client", owner: type) -> S: ...
+
+    def __get__(self, client: "Client | None", owner: type) -> Any:
+        if client is None:
+            return self
+        service = getattr(importlib.import_module(self.module), self.cls)(client)
+        # Stored on the instance, which takes precedence from then on
+        client.__dict__[self.name] = service
+        return service
 
 
 class Requester:
     base_url = os.environ.get("NOXUS_BACKEND_URL", "https://backend.noxus.ai")
 
-    def __init__(self, api_key: str, extra_headers: dict | None = None):
+    def __init__(
+        self,
+        api_key: str,
+        extra_headers: dict | None = None,
+        limits: httpx.Limits | None = None,
+        http2: bool = False,
+        transport: httpx.BaseTransport | None = None,
+        async_transport: httpx.AsyncBaseTransport | None = None,
+        retry_policy: RetryPolicy | None = None,
+        concurrency: ConcurrencyLimiter | None = None,
+        coalesce_gets: bool = False,
+        cache: ResponseCache | None = None,
+        json_codec: JsonCodec | None = None,
+        compression: RequestCompressor | None = None,
+        deadline: float | None = None,
+        circuit_breaker: CircuitBreaker | None = None,
+        hooks: Hooks | None = None,
+        metrics: Metrics | None = None,
+        tracer: Tracer | None = None,
+        cassette: Cassette | None = None,
+    ):
+        if http2:
+            try:
+                import h2  # type: ignore  # noqa: F401
+            except ImportError as e:
+                raise ImportError(
+                    "http2=True requires the 'h2' package "
+                    "(install with `pip install noxus-sdk[http2]`)"
+                ) from e
         self.api_key = api_key
         self.extra_headers = extra_headers
+        self.limits = limits or DEFAULT_LIMITS
+        self.http2 = http2
+        self.transport = transport
+        self.async_transport = async_transport
+        self._client: httpx.Client | None = None
+        self._async_clients: weakref.WeakKeyDictionary[
+            asyncio.AbstractEventLoop, httpx.AsyncClient
+        ] = weakref.WeakKeyDictionary()
+        self._client_lock = threading.Lock()
+        self.retry_policy = retry_policy or RetryPolicy()
+        self.throttle_stats = ThrottleStats()
+        self.concurrency = concurrency or ConcurrencyLimiter()
+        self.single_flight: SingleFlight[httpx.Response] | None = (
+            SingleFlight() if coalesce_gets else None
+        )
+        self.cache = cache
+        self.json_codec = json_codec or default_codec()
+        self.compression = compression
+        self.deadline = deadline
+        self.circuit_breaker = circuit_breaker
+        self.hooks = hooks if hooks is not None else Hooks()
+        self.metrics = metrics
+        if metrics is not None:
+            metrics.install(self.hooks)
+        self.tracer = tracer
+        self.cassette = cassette
+        self._paced_until = 0.0
+
+    def _transport(self, transport: Any, default: Any) -> Any:
+        if self.cassette is None:
+            return transport
+        # httpx ignores ``limits`` and ``http2`` when given a transport
+        return self.cassette.transport(
+            transport or default(limits=self.limits, http2=self.http2)
+        )
+
+    def _get_client(self) -> httpx.Client:
+        if self._client is None or self._client.is_closed:
+            with self._client_lock:
+                if self._client is None or self._client.is_closed:
+                    self._client = httpx.Client(
+                        limits=self.limits,
+                        http2=self.http2,
+                        transport=self._transport(self.transport, httpx.HTTPTransport),
+                    )
+        return self._client
+
+    def _get_async_client(self) -> httpx.AsyncClient:
+        # Pooled connections are bound to the event loop that opened them, so
+        # each loop gets its own pool, dropped once the loop is closed.
+        loop = asyncio.get_running_loop()
+        with self._client_lock:
+            client = self._async_clients.get(loop)
+            if client is None or client.is_closed:
+                for other in [
+                    other for other in self._async_clients if other.is_closed()
+                ]:
+                    del self._async_clients[other]
+                client = self._async_clients[loop] = httpx.AsyncClient(
+                    limits=self.limits,
+                    http2=self.http2,
+                    transport=self._transport(
+                        self.async_transport, httpx.AsyncHTTPTransport
+                    ),
+                )
+        return client
+
+    def close(self) -> None:
+        if self._client is not None:
+            self._client.close()
+            self._client = None
+        with self._client_lock:
+            pools = list(self._async_clients.items())
+            self._async_clients.clear()
+        for loop, client in pools:
+            # aclose has to run on the pool's own loop
+            if loop.is_running() and not client.is_closed:
+                asyncio.run_coroutine_threadsafe(client.aclose(), loop)
+
+    async def aclose(self) -> None:
+        client = self._async_clients.pop(asyncio.get_running_loop(), None)
+        if client is not None:
+            await client.aclose()
+        self.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *args) -> None:
+        self.close()
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *args) -> None:
+        await self.aclose()
+
+    def stats(self) -> dict:
+        """Request counts, errors, 429s, bytes and latency per endpoint.
+
+        Empty unless the client was created with ``metrics=Metrics()``.
+        """
+        if self.metrics is None:
+            return {}
+        return self.metrics.snapshot()
+
+    def span(
+        self, name: str, attributes: dict[str, Any] | None = None
+    ) -> "AbstractContextManager[Any]":
+        """A span that is current for the duration of the block, if tracing."""
+        if self.tracer is None:
+            return nullcontext(NOOP_SPAN)
+        return self.tracer.start_as_current_span(name, attributes)
+
+    def start_span(self, name: str, attributes: dict[str, Any] | None = None) -> Any:
+        if self.tracer is None:
+            return NOOP_SPAN
+        return self.tracer.start_span(name, attributes)
+
+    def use_span(self, span: Span) -> "AbstractContextManager[Any]":
+        if self.tracer is None:
+            return nullcontext(span)
+        return self.tracer.use_span(span)
+
+    def _attempt_span(
+        self, method: str, url: str, attempt: int, current: bool = True
+    ) -> Any:
+        if self.tracer is None:
+            return nullcontext(NOOP_SPAN)
+        template = url_template(url)
+        name = f"{method} {template}"
+        attributes = {
+            "http.request.method": method,
+            "url.path": url.split("?", 1)[0],
+            "url.template": template,
+            "http.request.resend_count": attempt,
+        }
+        if current:
+            return self.tracer.start_as_current_span(name, attributes)
+        # Streams yield to the caller while the span is open, so it stays detached
+        return _ending(self.tracer.start_span(name, attributes))
+
+    def _build_headers(self, headers: dict | None = None) -> dict:
+        headers_ = {"X-API-Key": self.api_key}
+        if headers:
+            headers_.update(headers)
+        if self.extra_headers:
+            headers_.update(self.extra_headers)
+        return headers_
+
+    def _pacing_delay(self) -> float:
+        delay = self._paced_until - time.monotonic()
+        if delay <= 0:
+            return 0.0
+        self.throttle_stats.record_pacing(delay)
+        return delay
+
+    def _retry_delay(
+        self,
+        response: httpx.Response,
+        attempt: int,
+        waited: float,
+        files: RequestFiles = None,
+    ) -> float | None:
+        if isinstance(files, MultipartUpload) and not files.replayable():
+            # The file would be sent again from where the first attempt stopped
+            return None
+        if not self.retry_policy.should_retry(response):
+            pace = self.retry_policy.pacing_delay(response)
+            if pace > 0:
+                self._paced_until = max(self._paced_until, time.monotonic() + pace)
+            return None
+        delay = self.retry_policy.retry_delay(response, attempt, waited)
+        if delay is not None:
+            self.throttle_stats.record_throttle(delay, first=attempt == 0)
+        return delay
+
+    def _deadline(self, deadline: Deadline | None = None) -> Deadline | None:
+        default = Deadline(self.deadline) if self.deadline is not None else None
+        return earliest(current_deadline(), deadline, default)
+
+    @staticmethod
+    def _attempt_timeout(deadline: Deadline | None, timeout: float | None) -> float:
+        if deadline is None:
+            return timeout or 120
+        return deadline.clamp(timeout or 120)
+
+    @staticmethod
+    def _check_wait(deadline: Deadline | None, delay: float) -> None:
+        if deadline is not None and delay >= deadline.remaining():
+            raise DeadlineExceeded(
+                f"Deadline of {deadline.timeout}s exceeded "
+                f"(would wait {delay:.2f}s to retry)"
+            )
+
+    def _guard(
+        self, method: str, url: str
+    ) -> "AbstractContextManager[Callable[[httpx.Response], None]]":
+        if self.circuit_breaker is None:
+            return nullcontext(_unguarded)
+        return self.circuit_breaker.guard(self.base_url, method, url)
+
+    def _encode_body(
+        self,
+        headers_: dict,
+        json: Any | None,
+        files: RequestFiles,
+        is_async: bool = False,
+    ) -> tuple[Any, HttpxFiles]:
+        if isinstance(files, MultipartUpload):
+            headers_.update(files.headers())
+            return (files.astream() if is_async else files.stream()), None
+        # Multipart uploads ignore the JSON body, as httpx does
+        if json is None or files:
+            return None, files
+        headers_["Content-Type"] = "application/json"
+        content = self.json_codec.dumps(json)
+        if self.compression is not None:
+            content = self.compression.compress(headers_, content)
+        return content, files
+
+    def _flight_key(self, url: str, headers: dict, params: dict | None) -> tuple:
+        return (
+            str(httpx.URL(f"{self.base_url}{url}", params=params)),
+            tuple(sorted(headers.items())),
+        )
 
     async def _arequest(
         self,
@@ -31,31 +386,85 @@ class Requester:
         params: dict | None = None,
         timeout: int | None = None,
     ) -> httpx.Response:
-        headers_ = {"X-API-Key": self.api_key}
-        if headers:
-            headers_.update(headers)
-        if self.extra_headers:
-            headers_.update(self.extra_headers)
-        ratelimited = True
-        while ratelimited:
-            async with httpx.AsyncClient() as client:
-                response = await client.request(
-                    method,
-                    f"{self.base_url}{url}",
-                    headers=headers_,
-                    follow_redirects=True,
-                    json=json,
-                    files=files,
-                    params=params,
-                    timeout=timeout or 120,
-                )
-                if response.status_code == 429:
-                    await asyncio.sleep(1)
-                    continue
-                ratelimited = False
-                response.raise_for_status()
-                return response
-        raise Exception("Request failed")
+        headers_ = self._build_headers(headers)
+        if self.cache is None:
+            return await self._asend(
+                method, url, headers_, json, files, params, timeout
+            )
+        if method != "GET":
+            response = await self._asend(
+                method, url, headers_, json, files, params, timeout
+            )
+            self.cache.invalidate(url)
+            return response
+        key = self._flight_key(url, headers_, params)
+        entry = self.cache.get(key)
+        if entry is not None:
+            if entry.is_fresh():
+                return entry.to_response(httpx.Request(method, key[0]))
+            headers_.update(entry.conditional_headers())
+        response = await self._asend(
+            method, url, headers_, json, files, params, timeout
+        )
+        if response.status_code == 304 and entry is not None:
+            self.cache.mark_revalidated(entry)
+            return entry.to_response(response.request)
+        self.cache.store(key, url.split("?", 1)[0], response)
+        return response
+
+    async def _asend(
+        self,
+        method: str,
+        url: str,
+        headers_: dict,
+        json: dict | None,
+        files: RequestFiles,
+        params: dict | None,
+        timeout: int | None,
+    ) -> httpx.Response:
+        client = self._get_async_client()
+        content, form = self._encode_body(headers_, json, files, is_async=True)
+        deadline = self._deadline()
+        attempt, waited = 0, 0.0
+        while True:
+            trace = RequestTrace(method, url, attempt)
+            with (
+                self.hooks.reporting(trace),
+                self._attempt_span(method, url, attempt) as span,
+            ):
+                if pause := self._pacing_delay():
+                    self._check_wait(deadline, pause)
+                    self.hooks.emit(THROTTLE, trace, delay=pause)
+                    span.add_event("throttle", {"delay": pause})
+                    await asyncio.sleep(pause)
+                with self._guard(method, url) as record, expiry_errors(deadline):
+                    async with self.concurrency.aslot(method, url, deadline):
+                        trace.dispatch(content)
+                        self.hooks.emit(REQUEST, trace)
+                        response = await client.request(
+                            method,
+                            f"{self.base_url}{url}",
+                            headers=headers_,
+                            follow_redirects=True,
+                            content=content,
+                            files=form,
+                            params=params,
+                            timeout=self._attempt_timeout(deadline, timeout),
+                            extensions=self.hooks.extensions(trace, is_async=True),
+                        )
+                    record(response)
+                self.hooks.emit(RESPONSE, trace, response)
+                span.set_attribute("http.response.status_code", response.status_code)
+                delay = self._retry_delay(response, attempt, waited, files)
+                if delay is None:
+                    if response.status_code != 304:
+                        response.raise_for_status()
+                    return response
+                self._check_wait(deadline, delay)
+                self.hooks.emit(RETRY, trace, response, delay=delay)
+                span.add_event("retry", {"delay": delay})
+            await asyncio.sleep(delay)
+            attempt, waited = attempt + 1, waited + delay
 
     async def arequest(
         self,
@@ -67,7 +476,18 @@ class Requester:
         params: dict | None = None,
         timeout: int | None = None,
     ):
-        return (
+        if method == "GET" and self.single_flight is not None:
+            # Concurrent identical GETs share one round trip; each caller still
+            # decodes its own copy of the body.
+            key = self._flight_key(url, self._build_headers(headers), params)
+            response = await self.single_flight.ado(
+                key,
+                lambda: self._arequest(
+                    method, url, headers=headers, params=params, timeout=timeout
+                ),
+            )
+            return self.json_codec.loads(response.content)
+        content = (
             await self._arequest(
                 method,
                 url,
@@ -77,7 +497,8 @@ class Requester:
                 params=params,
                 timeout=timeout,
             )
-        ).json()
+        ).content
+        return self.json_codec.loads(content)
 
     async def aget(
         self,
@@ -103,11 +524,7 @@ class Requester:
         params_["page"] = params_.get("page", page)
         params_["size"] = params_.get("page_size", page_size)
 
-        headers_ = {"X-API-Key": self.api_key}
-        if headers:
-            headers_.update(headers)
-        if self.extra_headers:
-            headers_.update(self.extra_headers)
+        headers_ = self._build_headers(headers)
         result = await self.arequest(
             "GET", url, headers=headers_, params=params_, timeout=timeout
         )
@@ -115,6 +532,39 @@ class Requester:
             return []
         return result["items"]
 
+    def aiter_pages(
+        self,
+        url: str,
+        params: dict | None = None,
+        page_size: int = 100,
+        max_page_size: int = 1000,
+        prefetch: bool = True,
+        adaptive: bool = True,
+        timeout: int | None = None,
+        concurrency: int = 1,
+        ordered: bool = True,
+    ) -> "AsyncIterator[list[dict]]":
+        """Every page of a paginated list, see ``iter_pages``.
+
+        With ``concurrency`` above 1 and a ``total`` in the first page, the
+        other pages are fetched that many at a time with a fixed
+        ``page_size``, and yielded in page order unless ``ordered=False``.
+        """
+
+        async def fetch(page: int, size: int) -> Any:
+            return await self.arequest(
+                "GET",
+                url,
+                params=self._page_params(params, page, size),
+                timeout=timeout,
+            )
+
+        if concurrency > 1:
+            cursor = PageCursor(page_size, adaptive=False)
+            return aiter_pages_concurrently(fetch, cursor, concurrency, ordered)
+        cursor = PageCursor(page_size, max_page_size, adaptive=adaptive)
+        return aiter_pages(fetch, cursor, prefetch)
+
     async def apost(
         self,
         url: str,
@@ -164,30 +614,82 @@ class Requester:
         params: dict | None = None,
         timeout: int | None = None,
     ) -> httpx.Response:
-        headers_ = {"X-API-Key": self.api_key}
-        if headers:
-            headers_.update(headers)
-        if self.extra_headers:
-            headers_.update(self.extra_headers)
-        ratelimited = True
-        while ratelimited:
-            response = httpx.request(
-                method,
-                f"{self.base_url}{url}",
-                headers=headers_,
-                follow_redirects=True,
-                json=json,
-                files=files,
-                params=params,
-                timeout=timeout or 120,
-            )
-            if response.status_code == 429:
-                time.sleep(1)
-                continue
-            ratelimited = False
-            response.raise_for_status()
+        headers_ = self._build_headers(headers)
+        if self.cache is None:
+            return self._send(method, url, headers_, json, files, params, timeout)
+        if method != "GET":
+            response = self._send(method, url, headers_, json, files, params, timeout)
+            self.cache.invalidate(url)
             return response
-        raise Exception("Request failed")
+        key = self._flight_key(url, headers_, params)
+        entry = self.cache.get(key)
+        if entry is not None:
+            if entry.is_fresh():
+                return entry.to_response(httpx.Request(method, key[0]))
+            headers_.update(entry.conditional_headers())
+        response = self._send(method, url, headers_, json, files, params, timeout)
+        if response.status_code == 304 and entry is not None:
+            self.cache.mark_revalidated(entry)
+            return entry.to_response(response.request)
+        self.cache.store(key, url.split("?", 1)[0], response)
+        return response
+
+    def _send(
+        self,
+        method: str,
+        url: str,
+        headers_: dict,
+        json: dict | None,
+        files: RequestFiles,
+        params: dict | None,
+        timeout: int | None,
+    ) -> httpx.Response:
+        client = self._get_client()
+        content, form = self._encode_body(headers_, json, files)
+        deadline = self._deadline()
+        attempt, waited = 0, 0.0
+        while True:
+            trace = RequestTrace(method, url, attempt)
+            with (
+                self.hooks.reporting(trace),
+                self._attempt_span(method, url, attempt) as span,
+            ):
+                if pause := self._pacing_delay():
+                    self._check_wait(deadline, pause)
+                    self.hooks.emit(THROTTLE, trace, delay=pause)
+                    span.add_event("throttle", {"delay": pause})
+                    time.sleep(pause)
+                with (
+                    self.concurrency.slot(method, url, deadline),
+                    self._guard(method, url) as record,
+                    expiry_errors(deadline),
+                ):
+                    trace.dispatch(content)
+                    self.hooks.emit(REQUEST, trace)
+                    response = client.request(
+                        method,
+                        f"{self.base_url}{url}",
+                        headers=headers_,
+                        follow_redirects=True,
+                        content=content,
+                        files=form,
+                        params=params,
+                        timeout=self._attempt_timeout(deadline, timeout),
+                        extensions=self.hooks.extensions(trace),
+                    )
+                    record(response)
+                self.hooks.emit(RESPONSE, trace, response)
+                span.set_attribute("http.response.status_code", response.status_code)
+                delay = self._retry_delay(response, attempt, waited, files)
+                if delay is None:
+                    if response.status_code != 304:
+                        response.raise_for_status()
+                    return response
+                self._check_wait(deadline, delay)
+                self.hooks.emit(RETRY, trace, response, delay=delay)
+                span.add_event("retry", {"delay": delay})
+            time.sleep(delay)
+            attempt, waited = attempt + 1, waited + delay
 
     def request(
         self,
@@ -199,6 +701,15 @@ class Requester:
         params: dict | None = None,
         timeout: int | None = None,
     ):
+        if method == "GET" and self.single_flight is not None:
+            key = self._flight_key(url, self._build_headers(headers), params)
+            response = self.single_flight.do(
+                key,
+                lambda: self._request(
+                    method, url, headers=headers, params=params, timeout=timeout
+                ),
+            )
+            return self.json_codec.loads(response.content)
         response = self._request(
             method,
             url,
@@ -208,7 +719,130 @@ class Requester:
             params=params,
             timeout=timeout,
         )
-        return response.json()
+        return self.json_codec.loads(response.content)
+
+    @contextmanager
+    def stream(
+        self,
+        method: str,
+        url: str,
+        headers: dict | None = None,
+        params: dict | None = None,
+        timeout: int | None = None,
+    ) -> "Iterator[httpx.Response]":
+        """Send a request and yield the response without reading its body.
+
+        The ``response`` hook fires once the caller is done with the body.
+        """
+        headers_ = self._build_headers(headers)
+        deadline = self._deadline()
+        client = self._get_client()
+        attempt, waited = 0, 0.0
+        while True:
+            trace = RequestTrace(method, url, attempt)
+            with (
+                self.hooks.reporting(trace),
+                self._attempt_span(method, url, attempt, current=False) as span,
+            ):
+                if pause := self._pacing_delay():
+                    self._check_wait(deadline, pause)
+                    self.hooks.emit(THROTTLE, trace, delay=pause)
+                    span.add_event("throttle", {"delay": pause})
+                    time.sleep(pause)
+                with (
+                    self.concurrency.slot(method, url, deadline),
+                    self._guard(method, url) as record,
+                    expiry_errors(deadline),
+                ):
+                    trace.dispatch(None)
+                    self.hooks.emit(REQUEST, trace)
+                    with client.stream(
+                        method,
+                        f"{self.base_url}{url}",
+                        headers=headers_,
+                        follow_redirects=True,
+                        params=params,
+                        timeout=self._attempt_timeout(deadline, timeout),
+                        extensions=self.hooks.extensions(trace),
+                    ) as response:
+                        record(response)
+                        span.set_attribute(
+                            "http.response.status_code", response.status_code
+                        )
+                        delay = self._retry_delay(response, attempt, waited)
+                        if delay is None:
+                            try:
+                                response.raise_for_status()
+                                yield response
+                            finally:
+                                self.hooks.emit(RESPONSE, trace, response)
+                            return
+                self.hooks.emit(RESPONSE, trace, response)
+                self._check_wait(deadline, delay)
+                self.hooks.emit(RETRY, trace, response, delay=delay)
+                span.add_event("retry", {"delay": delay})
+            time.sleep(delay)
+            attempt, waited = attempt + 1, waited + delay
+
+    @asynccontextmanager
+    async def astream(
+        self,
+        method: str,
+        url: str,
+        headers: dict | None = None,
+        params: dict | None = None,
+        timeout: int | None = None,
+    ) -> "AsyncIterator[httpx.Response]":
+        """Send a request and yield the response without reading its body.
+
+        The ``response`` hook fires once the caller is done with the body.
+        """
+        headers_ = self._build_headers(headers)
+        deadline = self._deadline()
+        client = self._get_async_client()
+        attempt, waited = 0, 0.0
+        while True:
+            trace = RequestTrace(method, url, attempt)
+            with (
+                self.hooks.reporting(trace),
+                self._attempt_span(method, url, attempt, current=False) as span,
+            ):
+                if pause := self._pacing_delay():
+                    self._check_wait(deadline, pause)
+                    self.hooks.emit(THROTTLE, trace, delay=pause)
+                    span.add_event("throttle", {"delay": pause})
+                    await asyncio.sleep(pause)
+                with self._guard(method, url) as record, expiry_errors(deadline):
+                    async with self.concurrency.aslot(method, url, deadline):
+                        trace.dispatch(None)
+                        self.hooks.emit(REQUEST, trace)
+                        async with client.stream(
+                            method,
+                            f"{self.base_url}{url}",
+                            headers=headers_,
+                            follow_redirects=True,
+                            params=params,
+                            timeout=self._attempt_timeout(deadline, timeout),
+                            extensions=self.hooks.extensions(trace, is_async=True),
+                        ) as response:
+                            record(response)
+                            span.set_attribute(
+                                "http.response.status_code", response.status_code
+                            )
+                            delay = self._retry_delay(response, attempt, waited)
+                            if delay is None:
+                                try:
+                                    response.raise_for_status()
+                                    yield response
+                                finally:
+                                    self.hooks.emit(RESPONSE, trace, response)
+                                return
+                self.hooks.emit(RESPONSE, trace, response)
+                self._check_wait(deadline, delay)
+                self.hooks.emit(RETRY, trace, response, delay=delay)
+                span.add_event("retry", {"delay": delay})
+            await asyncio.sleep(delay)
+            attempt, waited = attempt + 1, waited + delay
 
     def event_stream(
         self,
@@ -218,29 +852,63 @@ class Requester:
         files: RequestFiles = None,
         params: dict | None = None,
         timeout: int | None = None,
+        deadline: Deadline | None = None,
     ) -> "Iterator[ServerSentEvent]":
-        headers_ = {"X-API-Key": self.api_key}
-        if headers:
-            headers_.update(headers)
-        if self.extra_headers:
-            headers_.update(self.extra_headers)
-        ratelimited = True
-        with httpx.Client() as client:
-            while ratelimited:
-                with connect_sse(
-                    client=client,
-                    method="GET",
-                    url=f"{self.base_url}{url}",
-                    headers=headers_,
-                    follow_redirects=True,
-                    json=json,
-                    files=files,
-                    params=params,
-                    timeout=timeout or 120,
-                ) as response:
-                    ratelimited = False
-                    yield from response.iter_sse()
-        raise Exception("Request failed")
+        headers_ = self._build_headers(headers)
+        deadline = self._deadline(deadline)
+        client = self._get_client()
+        attempt, waited = 0, 0.0
+        while True:
+            trace = RequestTrace("GET", url, attempt)
+            with (
+                self.hooks.reporting(trace),
+                self._attempt_span("GET", url, attempt, current=False) as span,
+            ):
+                if pause := self._pacing_delay():
+                    self._check_wait(deadline, pause)
+                    self.hooks.emit(THROTTLE, trace, delay=pause)
+                    span.add_event("throttle", {"delay": pause})
+                    time.sleep(pause)
+                with (
+                    self.concurrency.slot("GET", url, deadline),
+                    self._guard("GET", url) as record,
+                    expiry_errors(deadline),
+                ):
+                    trace.dispatch(None)
+                    self.hooks.emit(REQUEST, trace)
+                    with connect_sse(
+                        client=client,
+                        method="GET",
+                        url=f"{self.base_url}{url}",
+                        headers=headers_,
+                        follow_redirects=True,
+                        json=json,
+                        files=files,
+                        params=params,
+                        timeout=self._attempt_timeout(deadline, timeout),
+                        extensions=self.hooks.extensions(trace),
+                    ) as response:
+                        record(response.response)
+                        span.set_attribute(
+                            "http.response.status_code", response.response.status_code
+                        )
+                        delay = self._retry_delay(response.response, attempt, waited)
+                        if delay is None:
+                            try:
+                                response.response.raise_for_status()
+                                for event in response.iter_sse():
+                                    if deadline is not None:
+                                        deadline.check()
+                                    yield event
+                            finally:
+                                self.hooks.emit(RESPONSE, trace, response.response)
+                            return
+                self.hooks.emit(RESPONSE, trace, response.response)
+                self._check_wait(deadline, delay)
+                self.hooks.emit(RETRY, trace, response.response, delay=delay)
+                span.add_event("retry", {"delay": delay})
+            time.sleep(delay)
+            attempt, waited = attempt + 1, waited + delay
 
     async def aevent_stream(
         self,
@@ -250,30 +918,63 @@ class Requester:
         files: RequestFiles = None,
         params: dict | None = None,
         timeout: int | None = None,
+        deadline: Deadline | None = None,
     ) -> "AsyncIterator[ServerSentEvent]":
-        headers_ = {"X-API-Key": self.api_key}
-        if headers:
-            headers_.update(headers)
-        if self.extra_headers:
-            headers_.update(self.extra_headers)
-        ratelimited = True
-        async with httpx.AsyncClient() as client:
-            while ratelimited:
-                async with aconnect_sse(
-                    client=client,
-                    method="GET",
-                    url=f"{self.base_url}{url}",
-                    headers=headers_,
-                    follow_redirects=True,
-                    json=json,
-                    files=files,
-                    params=params,
-                    timeout=timeout or 120,
-                ) as response:
-                    ratelimited = False
-                    async for event in response.aiter_sse():
-                        yield event
-        raise Exception("Request failed")
+        headers_ = self._build_headers(headers)
+        deadline = self._deadline(deadline)
+        client = self._get_async_client()
+        attempt, waited = 0, 0.0
+        while True:
+            trace = RequestTrace("GET", url, attempt)
+            with (
+                self.hooks.reporting(trace),
+                self._attempt_span("GET", url, attempt, current=False) as span,
+            ):
+                if pause := self._pacing_delay():
+                    self._check_wait(deadline, pause)
+                    self.hooks.emit(THROTTLE, trace, delay=pause)
+                    span.add_event("throttle", {"delay": pause})
+                    await asyncio.sleep(pause)
+                with self._guard("GET", url) as record, expiry_errors(deadline):
+                    async with self.concurrency.aslot("GET", url, deadline):
+                        trace.dispatch(None)
+                        self.hooks.emit(REQUEST, trace)
+                        async with aconnect_sse(
+                            client=client,
+                            method="GET",
+                            url=f"{self.base_url}{url}",
+                            headers=headers_,
+                            follow_redirects=True,
+                            json=json,
+                            files=files,
+                            params=params,
+                            timeout=self._attempt_timeout(deadline, timeout),
+                            extensions=self.hooks.extensions(trace, is_async=True),
+                        ) as response:
+                            record(response.response)
+                            span.set_attribute(
+                                "http.response.status_code",
+                                response.response.status_code,
+                            )
+                            delay = self._retry_delay(
+                                response.response, attempt, waited
+                            )
+                            if delay is None:
+                                try:
+                                    response.response.raise_for_status()
+                                    async for event in response.aiter_sse():
+                                        if deadline is not None:
+                                            deadline.check()
+                                        yield event
+                                finally:
+                                    self.hooks.emit(RESPONSE, trace, response.response)
+                                return
+                self.hooks.emit(RESPONSE, trace, response.response)
+                self._check_wait(deadline, delay)
+                self.hooks.emit(RETRY, trace, response.response, delay=delay)
+                span.add_event("retry", {"delay": delay})
+            await asyncio.sleep(delay)
+            attempt, waited = attempt + 1, waited + delay
 
     def get(
         self,
@@ -297,11 +998,7 @@ class Requester:
         params_["page"] = params_.get("page", page)
         params_["size"] = params_.get("page_size", page_size)
 
-        headers_ = {"X-API-Key": self.api_key}
-        if headers:
-            headers_.update(headers)
-        if self.extra_headers:
-            headers_.update(self.extra_headers)
+        headers_ = self._build_headers(headers)
         result = self.request(
             "GET", url, headers=headers_, params=params_, timeout=timeout
         )
@@ -309,6 +1006,37 @@ class Requester:
             return []
         return result["items"]
 
+    def _page_params(self, params: dict | None, page: int, size: int) -> dict:
+        return {**(params or {}), "page": page, "size": size, "page_size": size}
+
+    def iter_pages(
+        self,
+        url: str,
+        params: dict | None = None,
+        page_size: int = 100,
+        max_page_size: int = 1000,
+        prefetch: bool = True,
+        adaptive: bool = True,
+        timeout: int | None = None,
+    ) -> "Iterator[list[dict]]":
+        """Every page of a paginated list, as lists of items.
+
+        The next page is requested while the current one is being consumed,
+        and with ``adaptive`` the page size grows (up to ``max_page_size``)
+        while pages come back quickly. Only about two pages are held at once.
+        """
+
+        def fetch(page: int, size: int) -> Any:
+            return self.request(
+                "GET",
+                url,
+                params=self._page_params(params, page, size),
+                timeout=timeout,
+            )
+
+        cursor = PageCursor(page_size, max_page_size, adaptive=adaptive)
+        return iter_pages(fetch, cursor, prefetch)
+
     def patch(
         self,
         url: str,
@@ -350,6 +1078,20 @@ class Requester:
 
 
 class Client(Requester):
+    # Services, and the models they use, are only imported on first access
+    workflows = _Service["WorkflowService"]("resources.workflows.WorkflowService")
+    agentflows = _Service["AgentFlowService"]("resources.agentflows.AgentFlowService")
+    agents = _Service["AgentService"]("resources.assistants.AgentService")
+    conversations = _Service["ConversationService"](
+        "resources.conversations.ConversationService"
+    )
+    knowledge_bases = _Service["KnowledgeBaseService"](
+        "resources.knowledge_bases.KnowledgeBaseService"
+    )
+    runs = _Service["RunService"]("resources.runs.RunService")
+    admin = _Service["AdminService"]("resources.admin.AdminService")
+    files = _Service["FileService"]("resources.files.FileService")
+
     def __init__(
         self,
         api_key: str,
@@ -357,38 +1099,162 @@ class Client(Requester):
         load_nodes: bool = True,
         load_me: bool = True,
         extra_headers: dict | None = None,
+        limits: httpx.Limits | None = None,
+        http2: bool = False,
+        transport: httpx.BaseTransport | None = None,
+        async_transport: httpx.AsyncBaseTransport | None = None,
+        retry_policy: RetryPolicy | None = None,
+        concurrency: ConcurrencyLimiter | None = None,
+        coalesce_gets: bool = False,
+        cache: ResponseCache | None = None,
+        json_codec: JsonCodec | None = None,
+        compression: RequestCompressor | None = None,
+        deadline: float | None = None,
+        circuit_breaker: CircuitBreaker | None = None,
+        hooks: Hooks | None = None,
+        metrics: Metrics | None = None,
+        tracer: Tracer | None = None,
+        cassette: Cassette | None = None,
+        node_cache: NodeCatalogCache | None = None,
     ):
-        from noxus_sdk.resources.admin import AdminService
-        from noxus_sdk.resources.assistants import AgentService
-        from noxus_sdk.resources.conversations import ConversationService
-        from noxus_sdk.resources.knowledge_bases import KnowledgeBaseService
-        from noxus_sdk.resources.runs import RunService
-        from noxus_sdk.resources.workflows import WorkflowService
-        from noxus_sdk.resources.agentflows import AgentFlowService
-        from noxus_sdk.resources.files import FileService
-        from noxus_sdk.workflows import load_node_types
-
-        self.api_key = api_key
+        super().__init__(
+            api_key,
+            extra_headers=extra_headers,
+            limits=limits,
+            http2=http2,
+            transport=transport,
+            async_transport=async_transport,
+            retry_policy=retry_policy,
+            concurrency=concurrency,
+            coalesce_gets=coalesce_gets,
+            cache=cache,
+            json_codec=json_codec,
+            compression=compression,
+            deadline=deadline,
+            circuit_breaker=circuit_breaker,
+            hooks=hooks,
+            metrics=metrics,
+            tracer=tracer,
+            cassette=cassette,
+        )
         self.base_url = os.environ.get("NOXUS_BACKEND_URL", base_url)
-        self.extra_headers = extra_headers
 
+        self.node_cache = node_cache
+        self.nodes: list[dict] = []
+        self.node_types: NodeRegistry | None = None
+        self._nodes_refresher: asyncio.Task | None = None
         if load_nodes:
-            self.nodes = self.get_nodes()
-            load_node_types(self.nodes)
-        else:
-            self.nodes = []
-
-        self.workflows = WorkflowService(self)
-        self.agentflows = AgentFlowService(self)
-        self.agents = AgentService(self)
-        self.conversations = ConversationService(self)
-        self.knowledge_bases = KnowledgeBaseService(self)
-        self.runs = RunService(self)
-        self.admin = AdminService(self, enabled=bool(not load_me))
-        self.files = FileService(self)
+            self.refresh_nodes()
         if load_me:
             self.admin.enabled = self.admin.get_me().tenant_admin
 
+    @classmethod
+    async def acreate(
+        cls,
+        api_key: str,
+        load_nodes: bool = True,
+        load_me: bool = True,
+        refresh_nodes_every: float | None = None,
+        **kwargs: Any,
+    ) -> "Client":
+        """Create a client without blocking the event loop.
+
+        The node catalog and the API key's identity are fetched concurrently
+        on the async pool. With ``refresh_nodes_every`` the catalog is then
+        refreshed in a background task every that many seconds, until the
+        client is closed.
+        """
+        client = cls(api_key, load_nodes=False, load_me=False, **kwargs)
+        try:
+            if load_nodes and load_me:
+                _, me = await gather_or_cancel(
+                    client.arefresh_nodes(), client.admin.aget_me()
+                )
+                client.admin.enabled = me.tenant_admin
+            elif load_nodes:
+                await client.arefresh_nodes()
+            elif load_me:
+                client.admin.enabled = (await client.admin.aget_me()).tenant_admin
+        except BaseException:
+            await client.aclose()
+            raise
+        if refresh_nodes_every is not None:
+            client._nodes_refresher = asyncio.create_task(
+                client._refresh_nodes_every(refresh_nodes_every)
+            )
+        return client
+
+    def _set_nodes(self, nodes: list[dict], definitions: list | None = None) -> None:
+        from noxus_sdk.workflows import load_node_types
+
+        # Swapped as a whole, so workflows built during a refresh see one catalog
+        self.node_types = load_node_types(nodes, definitions)
+        self.nodes = nodes
+
+    def _set_cached_nodes(self, entry: CachedCatalog) -> list[dict]:
+        self._set_nodes(entry.nodes, entry.definitions)
+        return self.nodes
+
+    def refresh_nodes(self) -> list[dict]:
+        if self.node_cache is None:
+            self._set_nodes(self.get_nodes())
+            return self.nodes
+        entry = self.node_cache.load(self.base_url, self.api_key)
+        if entry is None or not entry.is_fresh():
+            response = self._request(
+                "GET", "/v1/nodes", headers=self.node_cache.conditional_headers(entry)
+            )
+            entry = self.node_cache.update(self.base_url, response, entry, self.api_key)
+        return self._set_cached_nodes(entry)
+
+    async def arefresh_nodes(self) -> list[dict]:
+        if self.node_cache is None:
+            self._set_nodes(await self.aget_nodes())
+            return self.nodes
+        # Disk reads and writes, and validating a fresh catalog, stay off the loop
+        entry = await asyncio.to_thread(
+            self.node_cache.load, self.base_url, self.api_key
+        )
+        if entry is None or not entry.is_fresh():
+            response = await self._arequest(
+                "GET", "/v1/nodes", headers=self.node_cache.conditional_headers(entry)
+            )
+            entry = await asyncio.to_thread(
+                self.node_cache.update, self.base_url, response, entry, self.api_key
+            )
+        return self._set_cached_nodes(entry)
+
+    async def _refresh_nodes_every(self, interval: float) -> None:
+        while True:
+            await asyncio.sleep(interval)
+            try:
+                await self.arefresh_nodes()
+            except Exception:
+                # Keep serving the previous catalog
+                logger.warning("Refreshing the node catalog failed", exc_info=True)
+
+    def _stop_refreshing_nodes(self) -> None:
+        task, self._nodes_refresher = self._nodes_refresher, None
+        if task is None or task.done() or task.get_loop().is_closed():
+            return
+        try:
+            running = asyncio.get_running_loop()
+        except RuntimeError:
+            running = None
+        if running is task.get_loop():
+            task.cancel()
+        else:
+            # Task.cancel() is not thread-safe
+            task.get_loop().call_soon_threadsafe(task.cancel)
+
+    def close(self) -> None:
+        self._stop_refreshing_nodes()
+        super().close()
+
+    async def aclose(self) -> None:
+        self._stop_refreshing_nodes()
+        await super().aclose()
+
     def get_nodes(self) -> list[dict]:
         return self.get("/v1/nodes")
 
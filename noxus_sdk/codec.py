@@ -0,0 +1,50 @@
+import json
+from typing import Any
+
+try:
+    import orjson  # type: ignore
+except ImportError:  # pragma: no cover - depends on the installed extras
+    orjson = None  # type: ignore[assignment]
+
+
+class JsonCodec:
+    """Encodes request bodies and decodes response bodies.
+
+    Subclass and pass an instance as ``Client(json_codec=...)`` to plug in a
+    different JSON library.
+    """
+
+    name = "json"
+
+    def loads(self, data: bytes | str) -> Any:
+        return json.loads(data)
+
+    def dumps(self, obj: Any) -> bytes:
+        # Same compact, non-ASCII-escaping output httpx produces for ``json=``
+        return json.dumps(
+            obj, ensure_ascii=False, separators=(",", ":"), allow_nan=False
+        ).encode("utf-8")
+
+
+class OrjsonCodec(JsonCodec):
+    name = "orjson"
+
+    def __init__(self) -> None:
+        if orjson is None:
+            raise ImportError(
+                "OrjsonCodec requires the 'orjson' package "
+                "(install with `pip install noxus-sdk[speedups]`)"
+            )
+
+    def loads(self, data: bytes | str) -> Any:
+        return orjson.loads(data)
+
+    def dumps(self, obj: Any) -> bytes:
+        return orjson.dumps(obj, option=orjson.OPT_NON_STR_KEYS)
+
+
+def default_codec() -> JsonCodec:
+    """orjson when it is installed, the standard library otherwise."""
+    if orjson is not None:
+        return OrjsonCodec()
+    return JsonCodec()
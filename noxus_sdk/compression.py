@@ -0,0 +1,82 @@
+import gzip
+import threading
+from collections.abc import Callable
+
+ENCODINGS = ("gzip", "br", "zstd")
+
+
+def _compressor(encoding: str, level: int | None) -> Callable[[bytes], bytes]:
+    if encoding == "gzip":
+        return lambda data: gzip.compress(data, compresslevel=level or 6, mtime=0)
+    if encoding == "br":
+        try:
+            import brotli  # type: ignore
+        except ImportError as e:
+            raise ImportError(
+                "Brotli request compression requires the 'brotli' package "
+                "(install with `pip install noxus-sdk[compression]`)"
+            ) from e
+        return lambda data: brotli.compress(data, quality=level or 5)
+    if encoding == "zstd":
+        try:
+            import zstandard  # type: ignore
+        except ImportError as e:
+            raise ImportError(
+                "Zstandard request compression requires the 'zstandard' package "
+                "(install with `pip install noxus-sdk[compression]`)"
+            ) from e
+        # ZstdCompressor instances are not thread-safe, so keep one per thread
+        local = threading.local()
+
+        def compress(data: bytes) -> bytes:
+            if not hasattr(local, "compressor"):
+                local.compressor = zstandard.ZstdCompressor(level=level or 3)
+            return local.compressor.compress(data)
+
+        return compress
+    raise ValueError(f"Unsupported encoding: {encoding} (possible: {list(ENCODINGS)})")
+
+
+class RequestCompressor:
+    """Compresses request bodies larger than ``threshold`` bytes.
+
+    Response compression is negotiated by httpx itself: ``Accept-Encoding``
+    advertises gzip and deflate, plus ``br`` and ``zstd`` when ``brotli`` and
+    ``zstandard`` are installed, and bodies are decoded incrementally as they
+    are read.
+    """
+
+    def __init__(
+        self,
+        encoding: str = "gzip",
+        threshold: int = 16 * 1024,
+        level: int | None = None,
+    ):
+        self.encoding = encoding
+        self.threshold = threshold
+        self._compress = _compressor(encoding, level)
+        self._lock = threading.Lock()
+        self.compressed_requests = 0
+        self.bytes_in = 0
+        self.bytes_out = 0
+
+    def compress(self, headers_: dict, content: bytes) -> bytes:
+        if len(content) < self.threshold:
+            return content
+        compressed = self._compress(content)
+        if len(compressed) >= len(content):
+            return content
+        headers_["Content-Encoding"] = self.encoding
+        with self._lock:
+            self.compressed_requests += 1
+            self.bytes_in += len(content)
+            self.bytes_out += len(compressed)
+        return compressed
+
+    def snapshot(self) -> dict:
+        with self._lock:
+            return {
+                "compressed_requests": self.compressed_requests,
+                "bytes_in": self.bytes_in,
+                "bytes_out": self.bytes_out,
+            }
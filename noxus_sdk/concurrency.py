@@ -0,0 +1,244 @@
+import asyncio
+import threading
+import time
+from collections import deque
+from collections.abc import AsyncIterator, Awaitable, Iterator
+from contextlib import asynccontextmanager, contextmanager
+from typing import Any
+
+from noxus_sdk.deadlines import Deadline, DeadlineExceeded
+from noxus_sdk.endpoints import FAMILIES, endpoint_family
+
+GLOBAL = "global"
+
+
+class _Waiter:
+    __slots__ = ("event", "future", "granted", "loop")
+
+    def __init__(
+        self,
+        loop: asyncio.AbstractEventLoop | None = None,
+        future: "asyncio.Future[None] | None" = None,
+    ):
+        self.loop = loop
+        self.future = future
+        self.event = threading.Event() if future is None else None
+        self.granted = False
+
+
+class Budget:
+    """A FIFO counting semaphore shared by threads and event loops.
+
+    Slots are handed directly to the oldest waiter on release, so callers are
+    served in arrival order whether they wait synchronously or with ``await``.
+    """
+
+    def __init__(self, name: str, limit: int):
+        if limit < 1:
+            raise ValueError(f"Concurrency limit for {name} must be at least 1")
+        self.name = name
+        self.limit = limit
+        self.active = 0
+        self._lock = threading.Lock()
+        self._waiters: deque[_Waiter] = deque()
+        self.acquired = 0
+        self.queued = 0
+        self.max_queue_depth = 0
+        self.total_wait = 0.0
+        self.max_wait = 0.0
+
+    def _try_acquire(self) -> bool:
+        if self.active < self.limit and not self._waiters:
+            self.active += 1
+            self.acquired += 1
+            return True
+        return False
+
+    def _enqueue(self, waiter: _Waiter) -> None:
+        self._waiters.append(waiter)
+        self.queued += 1
+        self.max_queue_depth = max(self.max_queue_depth, len(self._waiters))
+
+    def _record_wait(self, waited: float) -> None:
+        with self._lock:
+            self.acquired += 1
+            self.total_wait += waited
+            self.max_wait = max(self.max_wait, waited)
+
+    def _withdraw(self, waiter: _Waiter) -> bool:
+        """Leave the queue after a timeout; False if the slot came first."""
+        with self._lock:
+            if waiter.granted:
+                return False
+            self._waiters.remove(waiter)
+            return True
+
+    def acquire(self, timeout: float | None = None) -> bool:
+        """Take a slot, waiting up to ``timeout`` seconds; False if none came."""
+        with self._lock:
+            if self._try_acquire():
+                return True
+            waiter = _Waiter()
+            self._enqueue(waiter)
+        start = time.monotonic()
+        if not waiter.event.wait(timeout) and self._withdraw(waiter):  # type: ignore[union-attr]
+            return False
+        self._record_wait(time.monotonic() - start)
+        return True
+
+    async def aacquire(self, timeout: float | None = None) -> bool:
+        with self._lock:
+            if self._try_acquire():
+                return True
+            loop = asyncio.get_running_loop()
+            future: asyncio.Future[None] = loop.create_future()
+            waiter = _Waiter(loop, future)
+            self._enqueue(waiter)
+        start = time.monotonic()
+        try:
+            # Through asyncio.wait, so a timeout leaves the future uncancelled
+            await asyncio.wait({future}, timeout=timeout)
+            if not future.done() and self._withdraw(waiter):
+                return False
+        except asyncio.CancelledError:
+            with self._lock:
+                if not waiter.granted:
+                    self._waiters.remove(waiter)
+                    raise
+            # Granted while being cancelled: the future itself is never
+            # cancelled, so the slot is handed back here rather than by _wake
+            self.release()
+            raise
+        self._record_wait(time.monotonic() - start)
+        return True
+
+    def _wake(self, waiter: _Waiter) -> None:
+        future = waiter.future
+        if future is None:
+            return
+        if future.cancelled():
+            self.release()
+        elif not future.done():
+            future.set_result(None)
+
+    def release(self) -> None:
+        with self._lock:
+            if not self._waiters:
+                self.active -= 1
+                return
+            waiter = self._waiters.popleft()
+            waiter.granted = True
+        if waiter.event is not None:
+            waiter.event.set()
+        else:
+            waiter.loop.call_soon_threadsafe(self._wake, waiter)  # type: ignore[union-attr]
+
+    def snapshot(self) -> dict:
+        with self._lock:
+            return {
+                "limit": self.limit,
+                "active": self.active,
+                "queue_depth": len(self._waiters),
+                "max_queue_depth": self.max_queue_depth,
+                "acquired": self.acquired,
+                "queued": self.queued,
+                "total_wait": self.total_wait,
+                "max_wait": self.max_wait,
+            }
+
+
+def _remaining(deadline: Deadline | None) -> float | None:
+    return deadline.remaining() if deadline is not None else None
+
+
+def _expired(deadline: Deadline | None, budget: Budget) -> None:
+    timeout = deadline.timeout if deadline is not None else None
+    raise DeadlineExceeded(
+        f"Deadline of {timeout}s exceeded (waiting for a {budget.name} slot)"
+    )
+
+
+class ConcurrencyLimiter:
+    """Caps in-flight requests globally and per endpoint family.
+
+    ``endpoint_limits`` maps the families from :mod:`noxus_sdk.endpoints`
+    (``runs``, ``kb_search``, ``uploads``, ``conversations``) to their own
+    budget. A request takes its family slot first and then a global slot, so it
+    never holds global capacity while queued behind its family.
+    """
+
+    def __init__(
+        self,
+        max_concurrency: int | None = None,
+        endpoint_limits: dict[str, int] | None = None,
+    ):
+        self.budgets: dict[str, Budget] = {}
+        for family, limit in (endpoint_limits or {}).items():
+            if family not in FAMILIES:
+                raise ValueError(
+                    f"Unknown endpoint family: {family} (possible: {list(FAMILIES)})"
+                )
+            self.budgets[family] = Budget(family, limit)
+        self.global_budget = (
+            Budget(GLOBAL, max_concurrency) if max_concurrency is not None else None
+        )
+
+    def _budgets_for(self, method: str, url: str) -> list[Budget]:
+        budgets = []
+        family = endpoint_family(method, url)
+        if family in self.budgets:
+            budgets.append(self.budgets[family])
+        if self.global_budget is not None:
+            budgets.append(self.global_budget)
+        return budgets
+
+    @contextmanager
+    def slot(
+        self, method: str, url: str, deadline: Deadline | None = None
+    ) -> Iterator[None]:
+        """Hold the request's slots; raises ``DeadlineExceeded`` if ``deadline``
+        runs out while queued."""
+        acquired: list[Budget] = []
+        try:
+            for budget in self._budgets_for(method, url):
+                if not budget.acquire(_remaining(deadline)):
+                    _expired(deadline, budget)
+                acquired.append(budget)
+            yield
+        finally:
+            for budget in reversed(acquired):
+                budget.release()
+
+    @asynccontextmanager
+    async def aslot(
+        self, method: str, url: str, deadline: Deadline | None = None
+    ) -> AsyncIterator[None]:
+        acquired: list[Budget] = []
+        try:
+            for budget in self._budgets_for(method, url):
+                if not await budget.aacquire(_remaining(deadline)):
+                    _expired(deadline, budget)
+                acquired.append(budget)
+            yield
+        finally:
+            for budget in reversed(acquired):
+                budget.release()
+
+    def snapshot(self) -> dict[str, dict]:
+        budgets = dict(self.budgets)
+        if self.global_budget is not None:
+            budgets[GLOBAL] = self.global_budget
+        return {name: budget.snapshot() for name, budget in budgets.items()}
+
+
+async def gather_or_cancel(*aws: Awaitable[Any]) -> list[Any]:
+    """Like ``asyncio.gather``, but the other tasks are cancelled (and waited
+    for) as soon as one fails."""
+    tasks = [asyncio.ensure_future(aw) for aw in aws]
+    try:
+        return await asyncio.gather(*tasks)
+    except BaseException:
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+        raise
@@ -0,0 +1,78 @@
+import time
+from collections.abc import Iterator
+from contextlib import contextmanager
+from contextvars import ContextVar
+
+import httpx
+
+
+class DeadlineExceeded(TimeoutError):
+    pass
+
+
+class Deadline:
+    """An absolute point in time by which an operation must finish."""
+
+    def __init__(self, timeout: float):
+        self.timeout = timeout
+        self.expires_at = time.monotonic() + timeout
+
+    def remaining(self) -> float:
+        return max(0.0, self.expires_at - time.monotonic())
+
+    def expired(self) -> bool:
+        return time.monotonic() >= self.expires_at
+
+    def check(self) -> None:
+        if self.expired():
+            raise DeadlineExceeded(f"Deadline of {self.timeout}s exceeded")
+
+    def clamp(self, timeout: float) -> float:
+        """``timeout`` shortened to the remaining budget; raises if none is left."""
+        self.check()
+        return min(timeout, self.remaining())
+
+
+_current: ContextVar[Deadline | None] = ContextVar("noxus_deadline", default=None)
+
+
+def current_deadline() -> Deadline | None:
+    return _current.get()
+
+
+def earliest(*deadlines: Deadline | None) -> Deadline | None:
+    candidates = [d for d in deadlines if d is not None]
+    return min(candidates, key=lambda d: d.expires_at) if candidates else None
+
+
+@contextmanager
+def deadline_scope(
+    timeout: float | Deadline | None,
+) -> Iterator[Deadline | None]:
+    """Bound every SDK call made inside the block by a shared time budget.
+
+    Retries, pagination and polling loops all draw from the same budget, and
+    an inner scope can only shorten the deadline of an outer one.
+
+        with deadline_scope(10):
+            run = workflow.run({"input": "cars"})
+            run.wait()
+    """
+    new = Deadline(timeout) if isinstance(timeout, int | float) else timeout
+    effective = earliest(_current.get(), new)
+    token = _current.set(effective)
+    try:
+        yield effective
+    finally:
+        _current.reset(token)
+
+
+@contextmanager
+def expiry_errors(deadline: Deadline | None) -> Iterator[None]:
+    """Report transport timeouts caused by an expired deadline as such."""
+    try:
+        yield
+    except httpx.TimeoutException as e:
+        if deadline is not None and deadline.expired():
+            raise DeadlineExceeded(f"Deadline of {deadline.timeout}s exceeded") from e
+        raise
@@ -0,0 +1,73 @@
+from functools import lru_cache
+
+RUNS = "runs"
+KB_SEARCH = "kb_search"
+UPLOADS = "uploads"
+CONVERSATIONS = "conversations"
+
+FAMILIES = (RUNS, KB_SEARCH, UPLOADS, CONVERSATIONS)
+
+
+def _segments(url: str) -> list[str]:
+    return [s for s in url.split("?", 1)[0].split("/") if s]
+
+
+def endpoint_family(method: str, url: str) -> str | None:
+    """Classify an API path into one of the endpoint families, if any."""
+    segments = _segments(url)
+    if len(segments) < 2:
+        return None
+    resource = segments[1]
+    if resource == "file" and method.upper() == "POST":
+        return UPLOADS
+    if resource == "knowledge-bases":
+        if segments[-1] == "upload_train":
+            return UPLOADS
+        if segments[-1] == "search":
+            return KB_SEARCH
+    if resource == "conversations":
+        return CONVERSATIONS
+    if "runs" in segments or "run" in segments:
+        return RUNS
+    return None
+
+
+STATIC_SEGMENTS = frozenset(
+    {
+        "admin",
+        "agents",
+        "api-keys",
+        "conversations",
+        "document",
+        "documents",
+        "events",
+        "file",
+        "generic_train",
+        "groups",
+        "knowledge-bases",
+        "llms",
+        "me",
+        "models",
+        "nodes",
+        "presets",
+        "run",
+        "runs",
+        "search",
+        "triggers",
+        "upload_train",
+        "versions",
+        "workflows",
+    }
+)
+
+
+@lru_cache(maxsize=4096)
+def url_template(url: str) -> str:
+    """The path with identifiers replaced by ``{id}``, for grouping metrics.
+
+    ``/v1/workflows/3f2a.../runs?page=2`` becomes ``/v1/workflows/{id}/runs``.
+    """
+    segments = _segments(url)
+    return "/" + "/".join(
+        s if i == 0 or s in STATIC_SEGMENTS else "{id}" for i, s in enumerate(segments)
+    )
@@ -0,0 +1,1123 @@
+import asyncio
+import base64
+import gzip
+import hashlib
+import json
+import random
+import re
+import socket
+import threading
+import time
+import uuid
+from collections import Counter
+from collections.abc import AsyncIterator, Awaitable, Callable, Iterator
+from contextlib import contextmanager
+from datetime import datetime, timezone
+from typing import Any
+from urllib.parse import parse_qsl
+
+import httpx
+
+from noxus_sdk.endpoints import url_template
+
+FAKE_API_KEY = "fake-api-key"
+FAKE_BASE_URL = "http://fake.noxus.test"
+
+DEFAULT_MODELS = [
+    {"name": "gpt-4o", "provider": "openai"},
+    {"name": "gpt-4.1", "provider": "openai"},
+    {"name": "claude-4-sonnet", "provider": "anthropic"},
+    {"name": "gemini-2.5-flash", "provider": "google"},
+]
+
+
+def _config(type_: str, optional: bool = True, visible: bool = True) -> dict:
+    return {
+        "type": type_,
+        "description": None,
+        "visible": visible,
+        "optional": optional,
+        "default": None,
+    }
+
+
+# A small node catalog, enough to build and run simple workflows
+DEFAULT_NODES = [
+    {
+        "type": "InputNode",
+        "title": "Input",
+        "description": "A workflow input",
+        "integrations": [],
+        "inputs": [],
+        "outputs": [{"name": "output", "type": "output"}],
+        "config": {
+            "label": _config("str"),
+            "fixed_value": _config("bool"),
+            "value": _config("str"),
+        },
+        "is_available": True,
+        "visible": True,
+        "config_endpoint": None,
+    },
+    {
+        "type": "TextGenerationNode",
+        "title": "Generate Text",
+        "description": "Generate text with a language model",
+        "integrations": [],
+        "inputs": [{"name": "variables", "type": "variable_connector"}],
+        "outputs": [{"name": "output", "type": "output"}],
+        "config": {
+            "label": _config("str"),
+            "template": _config("str", optional=False),
+            "model": _config("list"),
+        },
+        "is_available": True,
+        "visible": True,
+        "config_endpoint": None,
+    },
+    {
+        "type": "OutputNode",
+        "title": "Output",
+        "description": "A workflow output",
+        "integrations": [],
+        "inputs": [{"name": "input", "type": "input"}],
+        "outputs": [],
+        "config": {"label": _config("str")},
+        "is_available": True,
+        "visible": True,
+        "config_endpoint": None,
+    },
+]
+
+
+def _now() -> str:
+    return datetime.now(timezone.utc).isoformat()
+
+
+def _id() -> str:
+    return str(uuid.uuid4())
+
+
+class Reply:
+    def __init__(
+        self,
+        body: Any = None,
+        status: int = 200,
+        headers: dict[str, str] | None = None,
+        stream: AsyncIterator[bytes] | None = None,
+    ):
+        self.body = body
+        self.status = status
+        self.headers = headers or {}
+        self.stream = stream
+
+
+class NotFound(Exception):
+    pass
+
+
+class FakeRequest:
+    def __init__(
+        self,
+        method: str,
+        path: str,
+        query: dict[str, str],
+        headers: dict[str, str],
+        body: bytes,
+    ):
+        self.method = method
+        self.path = path
+        self.query = query
+        self.headers = headers
+        self.body = body
+
+    def json(self) -> Any:
+        return json.loads(self.body) if self.body else None
+
+    def files(self) -> list[tuple[str, str, str, bytes]]:
+        """``(field, filename, content_type, data)`` for each multipart part."""
+        match = re.search(
+            r"boundary=\"?([^\";]+)", self.headers.get("content-type", "")
+        )
+        if match is None:
+            return []
+        parts = []
+        for raw in self.body.split(b"--" + match.group(1).encode())[1:]:
+            if raw.startswith(b"--"):
+                break
+            head, _, data = raw.partition(b"\r\n\r\n")
+            head_text = head.decode("utf-8", "replace")
+            field = re.search(r'name="([^"]*)"', head_text)
+            filename = re.search(r'filename="([^"]*)"', head_text)
+            ctype = re.search(r"Content-Type: ([^\r\n]+)", head_text, re.IGNORECASE)
+            parts.append(
+                (
+                    field.group(1) if field else "",
+                    filename.group(1) if filename else "upload",
+                    ctype.group(1) if ctype else "application/octet-stream",
+                    data.removesuffix(b"\r\n"),
+                )
+            )
+        return parts
+
+
+def _decode_body(body: bytes, encoding: str | None) -> bytes:
+    if not encoding or encoding == "identity":
+        return body
+    if encoding == "gzip":
+        return gzip.decompress(body)
+    if encoding == "br":
+        import brotli  # type: ignore
+
+        return brotli.decompress(body)
+    if encoding == "zstd":
+        import zstandard  # type: ignore
+
+        return zstandard.ZstdDecompressor().decompressobj().decompress(body)
+    raise ValueError(f"Unsupported Content-Encoding: {encoding}")
+
+
+Handler = Callable[..., Awaitable[Any]]
+
+
+class FakeBackend:
+    """An in-memory stand-in for the Noxus API, served as an ASGI app.
+
+    It implements the endpoints the SDK calls, keeps state in memory and
+    simulates the backend's timing: ``latency`` (plus up to ``jitter``) is
+    added to every request, a ``throttle_rate`` fraction of requests is
+    answered with a 429 carrying ``Retry-After: retry_after``, runs and
+    document training progress from queued to completed over
+    ``run_duration`` seconds, and conversation events are streamed
+    ``stream_interval`` seconds apart.
+
+    Use it in-process through :meth:`client` (or :meth:`transport` /
+    :meth:`async_transport`), or on a local port with :meth:`serve`.
+
+        backend = FakeBackend(latency=0.05, throttle_rate=0.1)
+        with backend.client() as client:
+            run = client.workflows.get(workflow_id).run({"input": "x"})
+    """
+
+    def __init__(
+        self,
+        latency: float = 0.0,
+        jitter: float = 0.0,
+        throttle_rate: float = 0.0,
+        retry_after: float = 0.0,
+        run_duration: float = 0.0,
+        stream_interval: float = 0.0,
+        nodes: list[dict] | None = None,
+        models: list[dict] | None = None,
+        seed: int | None = None,
+    ):
+        self.latency = latency
+        self.jitter = jitter
+        self.throttle_rate = throttle_rate
+        self.retry_after = retry_after
+        self.run_duration = run_duration
+        self.stream_interval = stream_interval
+        self.nodes = nodes if nodes is not None else DEFAULT_NODES
+        self.models = models if models is not None else DEFAULT_MODELS
+        self.group_id = _id()
+        self.requests: Counter[str] = Counter()
+        self.throttled = 0
+        self._random = random.Random(seed)
+        self._lock = threading.Lock()
+        self.workflows: dict[str, dict] = {}
+        self.versions: dict[str, list[dict]] = {}
+        self.runs: dict[str, dict] = {}
+        self.knowledge_bases: dict[str, dict] = {}
+        self.documents: dict[str, dict[str, dict]] = {}
+        self.conversations: dict[str, dict] = {}
+        self.agents: dict[str, dict] = {}
+        self.triggers: dict[str, dict] = {}
+        self.files: dict[str, tuple[dict, bytes]] = {}
+        self.groups: dict[str, dict] = {}
+        self.api_keys: dict[str, dict] = {}
+        self._routes: list[tuple[str, re.Pattern[str], Handler]] = []
+        for method, pattern, handler in (
+            ("GET", "/v1/nodes", self._get_nodes),
+            ("GET", "/v1/models/llms", self._get_models),
+            ("GET", "/v1/models/llms/presets", self._get_presets),
+            ("GET", "/v1/admin/me", self._get_me),
+            ("GET", "/v1/admin/groups", self._list_groups),
+            ("POST", "/v1/admin/groups", self._create_group),
+            ("DELETE", "/v1/admin/groups/{group_id}", self._delete_group),
+            ("POST", "/v1/admin/groups/{group_id}/api-keys", self._create_api_key),
+            ("GET", "/v1/workflows", self._list_workflows),
+            ("POST", "/v1/workflows", self._create_workflow),
+            ("GET", "/v1/workflows/{workflow_id}", self._get_workflow),
+            ("PATCH", "/v1/workflows/{workflow_id}", self._update_workflow),
+            ("DELETE", "/v1/workflows/{workflow_id}", self._delete_workflow),
+            ("GET", "/v1/workflows/{workflow_id}/versions", self._list_versions),
+            ("POST", "/v1/workflows/{workflow_id}/versions", self._create_version),
+            (
+                "PATCH",
+                "/v1/workflows/{workflow_id}/versions/{version_id}",
+                self._update_version,
+            ),
+            ("GET", "/v1/workflows/{workflow_id}/runs", self._list_runs),
+            ("POST", "/v1/workflows/{workflow_id}/runs", self._create_run),
+            ("GET", "/v1/workflows/{workflow_id}/runs/{run_id}", self._get_run),
+            ("GET", "/v1/workflows/{workflow_id}/run/{run_id}", self._get_run),
+            ("GET", "/v1/knowledge-bases", self._list_kbs),
+            ("POST", "/v1/knowledge-bases", self._create_kb),
+            ("GET", "/v1/knowledge-bases/{kb_id}", self._get_kb),
+            ("DELETE", "/v1/knowledge-bases/{kb_id}", self._delete_kb),
+            ("GET", "/v1/knowledge-bases/{kb_id}/runs", self._list_kb_runs),
+            ("POST", "/v1/knowledge-bases/{kb_id}/upload_train", self._upload_train),
+            ("POST", "/v1/knowledge-bases/{kb_id}/search", self._search_kb),
+            ("POST", "/v1/knowledge-bases/{kb_id}/document", self._create_document),
+            (
+                "GET",
+                "/v1/knowledge-bases/{kb_id}/documents/{status}",
+                self._list_documents,
+            ),
+            (
+                "GET",
+                "/v1/knowledge-bases/{kb_id}/document/{document_id}",
+                self._get_document,
+            ),
+            (
+                "PATCH",
+                "/v1/knowledge-bases/{kb_id}/document/{document_id}",
+                self._update_document,
+            ),
+            (
+                "DELETE",
+                "/v1/knowledge-bases/{kb_id}/document/{document_id}",
+                self._delete_document,
+            ),
+            ("GET", "/v1/conversations", self._list_conversations),
+            ("POST", "/v1/conversations", self._create_conversation),
+            ("GET", "/v1/conversations/{conversation_id}", self._get_conversation),
+            ("POST", "/v1/conversations/{conversation_id}", self._add_message),
+            ("PATCH", "/v1/conversations/{conversation_id}", self._update_conversation),
+            (
+                "DELETE",
+                "/v1/conversations/{conversation_id}",
+                self._delete_conversation,
+            ),
+            ("GET", "/v1/conversations/{conversation_id}/events", self._events),
+            ("GET", "/v1/agents", self._list_agents),
+            ("POST", "/v1/agents", self._create_agent),
+            ("GET", "/v1/agents/{agent_id}", self._get_agent),
+            ("PATCH", "/v1/agents/{agent_id}", self._update_agent),
+            ("DELETE", "/v1/agents/{agent_id}", self._delete_agent),
+            ("GET", "/v1/agents/{agent_id}/triggers", self._list_triggers),
+            (
+                "POST",
+                "/v1/agents/{agent_id}/triggers/{trigger_type}",
+                self._create_trigger,
+            ),
+            ("DELETE", "/v1/triggers/{trigger_id}", self._delete_trigger),
+            ("POST", "/v1/file", self._upload_file),
+            ("GET", "/v1/file/{file_id}", self._download_file),
+        ):
+            regex = re.sub(r"\{(\w+)\}", r"(?P<\1>[^/]+)", pattern)
+            self._routes.append((method, re.compile(f"^{regex}$"), handler))
+
+    # ASGI
+
+    async def __call__(self, scope: dict, receive: Callable, send: Callable) -> None:
+        if scope["type"] == "lifespan":
+            while True:
+                message = await receive()
+                if message["type"] == "lifespan.startup":
+                    await send({"type": "lifespan.startup.complete"})
+                elif message["type"] == "lifespan.shutdown":
+                    await send({"type": "lifespan.shutdown.complete"})
+                    return
+        if scope["type"] != "http":
+            return
+        body = b""
+        while True:
+            message = await receive()
+            body += message.get("body", b"")
+            if not message.get("more_body"):
+                break
+        headers = {k.decode().lower(): v.decode() for k, v in scope["headers"]}
+        request = FakeRequest(
+            scope["method"],
+            scope["path"],
+            dict(parse_qsl(scope["query_string"].decode())),
+            headers,
+            _decode_body(body, headers.get("content-encoding")),
+        )
+        reply = await self.handle(request)
+        await self._send(request, reply, send)
+
+    async def handle(self, request: FakeRequest) -> Reply:
+        self.requests[f"{request.method} {url_template(request.path)}"] += 1
+        delay = self.latency + (
+            self._random.uniform(0, self.jitter) if self.jitter else 0
+        )
+        if delay:
+            await asyncio.sleep(delay)
+        if self.throttle_rate and self._random.random() < self.throttle_rate:
+            self.throttled += 1
+            return Reply(
+                {"detail": "Too Many Requests"},
+                429,
+                {
+                    "Retry-After": str(self.retry_after),
+                    "X-RateLimit-Remaining": "0",
+                },
+            )
+        if request.headers.get("x-api-key") is None:
+            return Reply({"detail": "Missing API key"}, 401)
+        for method, regex, handler in self._routes:
+            match = regex.match(request.path)
+            if match is None or method != request.method:
+                continue
+            try:
+                with self._lock:
+                    result = await handler(request, **match.groupdict())
+            except NotFound:
+                return Reply({"detail": "Not Found"}, 404)
+            return result if isinstance(result, Reply) else Reply(result)
+        return Reply({"detail": "Not Found"}, 404)
+
+    async def _send(self, request: FakeRequest, reply: Reply, send: Callable) -> None:
+        headers = dict(reply.headers)
+        if reply.stream is not None:
+            headers.setdefault("Content-Type", "text/event-stream")
+            await send(
+                {
+                    "type": "http.response.start",
+                    "status": reply.status,
+                    "headers": _encode_headers(headers),
+                }
+            )
+            async for chunk in reply.stream:
+                await send(
+                    {"type": "http.response.body", "body": chunk, "more_body": True}
+                )
+            await send({"type": "http.response.body", "body": b""})
+            return
+        if isinstance(reply.body, bytes):
+            body = reply.body
+            headers.setdefault("Content-Type", "application/octet-stream")
+        else:
+            body = json.dumps(reply.body).encode()
+            headers["Content-Type"] = "application/json"
+        status = reply.status
+        if request.method == "GET" and status == 200:
+            etag = '"' + hashlib.blake2b(body, digest_size=8).hexdigest() + '"'
+            headers["ETag"] = etag
+            if request.headers.get("if-none-match") == etag:
+                status, body = 304, b""
+        headers["Content-Length"] = str(len(body))
+        await send(
+            {
+                "type": "http.response.start",
+                "status": status,
+                "headers": _encode_headers(headers),
+            }
+        )
+        await send({"type": "http.response.body", "body": body})
+
+    # Transports
+
+    def async_transport(self) -> httpx.AsyncBaseTransport:
+        return httpx.ASGITransport(app=self)  # type: ignore[arg-type]
+
+    def transport(self) -> httpx.BaseTransport:
+        return _ThreadedASGITransport(self)
+
+    def client(self, api_key: str = FAKE_API_KEY, **kwargs: Any) -> Any:
+        """A ``Client`` wired to this backend in-process."""
+        from noxus_sdk.client import Client
+
+        return Client(
+            api_key,
+            base_url=FAKE_BASE_URL,
+            transport=self.transport(),
+            async_transport=self.async_transport(),
+            **kwargs,
+        )
+
+    @contextmanager
+    def serve(self, host: str = "127.0.0.1", port: int = 0) -> Iterator[str]:
+        """Serve the backend over HTTP from a background thread.
+
+        Yields the base URL. Requires ``hypercorn`` (``pip install
+        noxus-sdk[bench]``).
+        """
+        try:
+            from hypercorn.asyncio import serve  # type: ignore
+            from hypercorn.config import Config  # type: ignore
+        except ImportError as e:
+            raise ImportError(
+                "FakeBackend.serve requires the 'hypercorn' package "
+                "(install with `pip install noxus-sdk[bench]`)"
+            ) from e
+        sock = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
+        sock.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEADDR, 1)
+        sock.bind((host, port))
+        sock.listen(1024)
+        sock.setblocking(False)
+        config = Config()
+        config.bind = [f"fd://{sock.fileno()}"]
+        config.accesslog = None
+        config.errorlog = None
+        loop = asyncio.new_event_loop()
+        stopped = asyncio.Event()
+        ready = threading.Event()
+
+        async def main() -> None:
+            ready.set()
+            await serve(self, config, shutdown_trigger=stopped.wait)  # type: ignore[arg-type]
+
+        thread = threading.Thread(target=loop.run_until_complete, args=(main(),))
+        thread.start()
+        ready.wait()
+        try:
+            yield f"http://{host}:{sock.getsockname()[1]}"
+        finally:
+            loop.call_soon_threadsafe(stopped.set)
+            thread.join()
+            loop.close()
+            # hypercorn closes the listening socket itself on shutdown
+            sock.detach()
+
+    # Simulation
+
+    def _progress(self, started: float) -> tuple[str, int]:
+        if self.run_duration <= 0:
+            return "completed", 100
+        elapsed = time.monotonic() - started
+        if elapsed >= self.run_duration:
+            return "completed", 100
+        if elapsed < self.run_duration * 0.1:
+            return "queued", 0
+        return "running", int(100 * elapsed / self.run_duration)
+
+    def _run_view(self, run: dict) -> dict:
+        status, progress = self._progress(run["_started"])
+        view = {k: v for k, v in run.items() if not k.startswith("_")}
+        view["status"], view["progress"] = status, progress
+        if status == "completed":
+            view["finished_at"] = view["finished_at"] or _now()
+            run["finished_at"] = view["finished_at"]
+            view["output"] = run["_output"]
+        return view
+
+    def _document_view(self, document: dict) -> dict:
+        view = {k: v for k, v in document.items() if not k.startswith("_")}
+        if view["status"] == "training":
+            status, _ = self._progress(document["_started"])
+            if status == "completed":
+                view["status"] = document["status"] = "trained"
+        return view
+
+    def _kb_view(self, kb: dict) -> dict:
+        documents = [self._document_view(d) for d in self.documents[kb["id"]].values()]
+        statuses = Counter(d["status"] for d in documents)
+        view = dict(kb)
+        view.update(
+            size=sum(d["size"] for d in documents),
+            num_docs=len(documents),
+            total_documents=len(documents),
+            training_documents=statuses["training"],
+            trained_documents=statuses["trained"],
+            error_documents=statuses["error"],
+            uploaded_documents=statuses["uploaded"],
+            source_types={"document": len(documents)} if documents else {},
+            training_source_types=["document"] if statuses["training"] else [],
+        )
+        if statuses["training"]:
+            view["status"] = "training"
+        elif statuses["trained"]:
+            view["status"] = "trained"
+        return view
+
+    # Platform
+
+    async def _get_nodes(self, request: FakeRequest) -> Any:
+        return self.nodes
+
+    async def _get_models(self, request: FakeRequest) -> Any:
+        return self.models
+
+    async def _get_presets(self, request: FakeRequest) -> Any:
+        return []
+
+    # Admin
+
+    async def _get_me(self, request: FakeRequest) -> Any:
+        key = self.api_keys.get(request.headers["x-api-key"])
+        if key is not None:
+            return key
+        return {
+            "id": _id(),
+            "name": "fake",
+            "tenant_admin": True,
+            "value": request.headers["x-api-key"],
+        }
+
+    async def _list_groups(self, request: FakeRequest) -> Any:
+        return list(self.groups.values())
+
+    async def _create_group(self, request: FakeRequest) -> Any:
+        body = request.json()
+        group = {
+            "id": _id(),
+            "name": body["name"],
+            "description": body.get("description"),
+        }
+        self.groups[group["id"]] = group
+        return group
+
+    async def _delete_group(self, request: FakeRequest, group_id: str) -> Any:
+        if self.groups.pop(group_id, None) is None:
+            raise NotFound
+        return {"success": True}
+
+    async def _create_api_key(self, request: FakeRequest, group_id: str) -> Any:
+        if group_id not in self.groups:
+            raise NotFound
+        body = request.json()
+        key = {
+            "id": _id(),
+            "name": body["name"],
+            "tenant_admin": body.get("tenant_admin", False),
+            "value": f"fake-{uuid.uuid4().hex}",
+        }
+        self.api_keys[key["value"]] = key
+        return key
+
+    # Workflows
+
+    def _workflow(self, workflow_id: str) -> dict:
+        workflow = self.workflows.get(workflow_id)
+        if workflow is None:
+            raise NotFound
+        return workflow
+
+    async def _list_workflows(self, request: FakeRequest) -> Any:
+        workflows = [
+            w
+            for w in self.workflows.values()
+            if "type" not in request.query or w["type"] == request.query["type"]
+        ]
+        return _page(request, workflows)
+
+    async def _create_workflow(self, request: FakeRequest) -> Any:
+        body = request.json()
+        workflow = {
+            "id": _id(),
+            "group_id": self.group_id,
+            "name": body.get("name", "Untitled Workflow"),
+            "type": body.get("type", "flow"),
+            "definition": body.get("definition", {"nodes": [], "edges": []}),
+            "created_at": _now(),
+        }
+        if body.get("error_handler"):
+            workflow["error_handler"] = body["error_handler"]
+        self.workflows[workflow["id"]] = workflow
+        self.versions[workflow["id"]] = []
+        return workflow
+
+    async def _get_workflow(self, request: FakeRequest, workflow_id: str) -> Any:
+        return self._workflow(workflow_id)
+
+    async def _update_workflow(self, request: FakeRequest, workflow_id: str) -> Any:
+        workflow = self._workflow(workflow_id)
+        workflow.update(
+            {k: v for k, v in request.json().items() if k in ("name", "definition")}
+        )
+        return workflow
+
+    async def _delete_workflow(self, request: FakeRequest, workflow_id: str) -> Any:
+        self._workflow(workflow_id)
+        del self.workflows[workflow_id]
+        return {"success": True}
+
+    async def _list_versions(self, request: FakeRequest, workflow_id: str) -> Any:
+        self._workflow(workflow_id)
+        return self.versions[workflow_id]
+
+    async def _create_version(self, request: FakeRequest, workflow_id: str) -> Any:
+        self._workflow(workflow_id)
+        body = request.json()
+        version = {
+            "id": _id(),
+            "name": body["name"],
+            "description": body.get("description"),
+            "created_at": _now(),
+            "created_by": None,
+            "definition": body["definition"],
+        }
+        self.versions[workflow_id].append(version)
+        return version
+
+    async def _update_version(
+        self, request: FakeRequest, workflow_id: str, version_id: str
+    ) -> Any:
+        self._workflow(workflow_id)
+        for version in self.versions[workflow_id]:
+            if version["id"] == version_id:
+                version.update(request.json())
+                return version
+        raise NotFound
+
+    def _new_run(self, workflow_id: str, input_: dict, output: dict) -> dict:
+        run: dict[str, Any] = {
+            "id": _id(),
+            "group_id": self.group_id,
+            "workflow_id": workflow_id,
+            "input": input_,
+            "node_ids": None,
+            "status": "queued",
+            "progress": 0,
+            "progress_details": None,
+            "created_at": _now(),
+            "finished_at": None,
+            "output": None,
+            "workflow_definition": None,
+            "_started": time.monotonic(),
+            "_output": output,
+        }
+        self.runs[run["id"]] = run
+        return run
+
+    async def _list_runs(self, request: FakeRequest, workflow_id: str) -> Any:
+        runs = [
+            self._run_view(r)
+            for r in self.runs.values()
+            if r["workflow_id"] == workflow_id
+        ]
+        return _page(request, runs)
+
+    async def _create_run(self, request: FakeRequest, workflow_id: str) -> Any:
+        workflow = self._workflow(workflow_id)
+        input_ = request.json().get("input", {})
+        run = self._new_run(workflow_id, input_, {"output": input_})
+        run["workflow_definition"] = workflow["definition"]
+        return self._run_view(run)
+
+    async def _get_run(
+        self, request: FakeRequest, workflow_id: str, run_id: str
+    ) -> Any:
+        run = self.runs.get(run_id)
+        if run is None or run["workflow_id"] != workflow_id:
+            raise NotFound
+        return self._run_view(run)
+
+    # Knowledge bases
+
+    def _kb(self, kb_id: str) -> dict:
+        kb = self.knowledge_bases.get(kb_id)
+        if kb is None:
+            raise NotFound
+        return kb
+
+    def _document(self, kb_id: str, document_id: str) -> dict:
+        document = self.documents[self._kb(kb_id)["id"]].get(document_id)
+        if document is None:
+            raise NotFound
+        return document
+
+    async def _list_kbs(self, request: FakeRequest) -> Any:
+        return _page(
+            request, [self._kb_view(kb) for kb in self.knowledge_bases.values()]
+        )
+
+    async def _create_kb(self, request: FakeRequest) -> Any:
+        body = request.json()
+        kb = {
+            "id": _id(),
+            "group_id": self.group_id,
+            "name": body["name"],
+            "status": "created",
+            "description": body.get("description", ""),
+            "document_types": body.get("document_types", []),
+            "kb_type": body.get("kb_type", "entity"),
+            "settings_": body.get("settings_", {}),
+            "version": body.get("version", "v3"),
+            "created_at": _now(),
+            "updated_at": _now(),
+        }
+        self.knowledge_bases[kb["id"]] = kb
+        self.documents[kb["id"]] = {}
+        return self._kb_view(kb)
+
+    async def _get_kb(self, request: FakeRequest, kb_id: str) -> Any:
+        return self._kb_view(self._kb(kb_id))
+
+    async def _delete_kb(self, request: FakeRequest, kb_id: str) -> Any:
+        self._kb(kb_id)
+        del self.knowledge_bases[kb_id]
+        del self.documents[kb_id]
+        return {"success": True}
+
+    async def _list_kb_runs(self, request: FakeRequest, kb_id: str) -> Any:
+        self._kb(kb_id)
+        run_ids = request.query.get("run_ids")
+        runs = [
+            self._run_view(r)
+            for r in self.runs.values()
+            if r["workflow_id"] == kb_id
+            and (not run_ids or r["id"] in run_ids.split(","))
+        ]
+        if "status" in request.query:
+            runs = [r for r in runs if r["status"] == request.query["status"]]
+        return runs
+
+    def _add_document(
+        self, kb_id: str, name: str, prefix: str, status: str, content: bytes = b""
+    ) -> dict:
+        document: dict[str, Any] = {
+            "id": _id(),
+            "name": name,
+            "prefix": prefix,
+            "status": status,
+            "size": len(content),
+            "source_type": "document",
+            "created_at": _now(),
+            "updated_at": _now(),
+            "error": None,
+            "_started": time.monotonic(),
+            "_content": content.decode("utf-8", "replace"),
+        }
+        self.documents[kb_id][document["id"]] = document
+        return document
+
+    async def _upload_train(self, request: FakeRequest, kb_id: str) -> Any:
+        self._kb(kb_id)
+        prefix = request.query.get("prefix", "/")
+        run_ids = []
+        for _, filename, _, data in request.files():
+            document = self._add_document(kb_id, filename, prefix, "training", data)
+            run = self._new_run(kb_id, {"document_id": document["id"]}, {})
+            run["_started"] = document["_started"]
+            run_ids.append(run["id"])
+        return run_ids
+
+    async def _search_kb(self, request: FakeRequest, kb_id: str) -> Any:
+        kb = self._kb(kb_id)
+        terms = request.query.get("query", "").lower().split()
+        prefix = request.query.get("prefix", "/")
+        results = []
+        for document in self.documents[kb_id].values():
+            view = self._document_view(document)
+            if view["status"] != "trained" or not view["prefix"].startswith(prefix):
+                continue
+            content = document["_content"]
+            score = sum(content.lower().count(term) for term in terms)
+            if not score:
+                continue
+            results.append(
+                {
+                    "score": float(score),
+                    "content": content[:2048],
+                    "source": view["name"],
+                    "document_source": {
+                        "id": view["id"],
+                        "created_at": view["created_at"],
+                        "updated_at": view["updated_at"],
+                        "group_id": kb["group_id"],
+                        "kb_id": kb_id,
+                        "file_id": None,
+                        "name": view["name"],
+                        "status": view["status"],
+                        "doc_metadata": {},
+                        "prefix": view["prefix"],
+                        "m_source_type": "document",
+                    },
+                }
+            )
+        return sorted(results, key=lambda r: -r["score"])[:10]
+
+    async def _create_document(self, request: FakeRequest, kb_id: str) -> Any:
+        self._kb(kb_id)
+        body = request.json()
+        document = self._add_document(
+            kb_id, body["name"], body.get("prefix", "/"), body.get("status", "uploaded")
+        )
+        return self._document_view(document)
+
+    async def _list_documents(
+        self, request: FakeRequest, kb_id: str, status: str
+    ) -> Any:
+        self._kb(kb_id)
+        documents = [self._document_view(d) for d in self.documents[kb_id].values()]
+        return _page(request, [d for d in documents if d["status"] == status])
+
+    async def _get_document(
+        self, request: FakeRequest, kb_id: str, document_id: str
+    ) -> Any:
+        return self._document_view(self._document(kb_id, document_id))
+
+    async def _update_document(
+        self, request: FakeRequest, kb_id: str, document_id: str
+    ) -> Any:
+        document = self._document(kb_id, document_id)
+        document.update(request.json())
+        document["updated_at"] = _now()
+        return self._document_view(document)
+
+    async def _delete_document(
+        self, request: FakeRequest, kb_id: str, document_id: str
+    ) -> Any:
+        document = self._document(kb_id, document_id)
+        del self.documents[kb_id][document_id]
+        return self._document_view(document)
+
+    # Conversations
+
+    def _conversation(self, conversation_id: str) -> dict:
+        conversation = self.conversations.get(conversation_id)
+        if conversation is None:
+            raise NotFound
+        return conversation
+
+    def _conversation_view(self, conversation: dict) -> dict:
+        return {k: v for k, v in conversation.items() if not k.startswith("_")}
+
+    async def _list_conversations(self, request: FakeRequest) -> Any:
+        # Like the real backend, conversations without messages are not listed
+        conversations = [
+            self._conversation_view(c)
+            for c in self.conversations.values()
+            if c["messages"]
+        ]
+        return _page(request, conversations)
+
+    async def _create_conversation(self, request: FakeRequest) -> Any:
+        body = request.json()
+        settings = body.get("settings")
+        agent_id = request.query.get("assistant_id")
+        if agent_id is not None:
+            settings = self._agent(agent_id)["definition"]
+        if settings is None:
+            return Reply({"detail": "settings or assistant_id is required"}, 422)
+        conversation = {
+            "id": _id(),
+            "name": body["name"],
+            "created_at": _now(),
+            "last_updated_at": _now(),
+            "settings": settings,
+            "etag": uuid.uuid4().hex,
+            "messages": [],
+            "status": "idle",
+            "assistant_id": agent_id,
+            "_events": [],
+        }
+        self.conversations[conversation["id"]] = conversation
+        return self._conversation_view(conversation)
+
+    async def _get_conversation(
+        self, request: FakeRequest, conversation_id: str
+    ) -> Any:
+        return self._conversation_view(self._conversation(conversation_id))
+
+    async def _add_message(self, request: FakeRequest, conversation_id: str) -> Any:
+        conversation = self._conversation(conversation_id)
+        body = request.json()
+        content = body["content"]
+        reply = f"You said: {content}"
+        for file in body.get("files") or []:
+            # Like a model that read the attachment, quote it back
+            if file.get("b64_content"):
+                text = base64.b64decode(file["b64_content"]).decode(errors="replace")
+                reply += f" {file.get('name', 'file')} says: {text}"
+        parts = [{"role": "assistant", "type": "text", "content": reply}]
+        if body.get("tool"):
+            # Tool use shows up as a function message part, as on the real backend
+            parts.insert(
+                0, {"role": "function", "type": "tool_call", "content": body["tool"]}
+            )
+        for message_parts in (
+            [{"role": "user", "type": "text", "content": content}],
+            parts,
+        ):
+            conversation["messages"].append(
+                {"id": _id(), "created_at": _now(), "message_parts": message_parts}
+            )
+        conversation["_events"] = [
+            {"role": "user", "type": "message", "content": content},
+            *(
+                {"role": "assistant", "type": "message_part", "content": word + " "}
+                for word in reply.split()
+            ),
+            {"role": "assistant", "type": "conversation_end", "content": None},
+        ]
+        conversation["etag"] = uuid.uuid4().hex
+        conversation["last_updated_at"] = _now()
+        return self._conversation_view(conversation)
+
+    async def _update_conversation(
+        self, request: FakeRequest, conversation_id: str
+    ) -> Any:
+        conversation = self._conversation(conversation_id)
+        conversation.update({k: v for k, v in request.json().items() if v is not None})
+        return self._conversation_view(conversation)
+
+    async def _delete_conversation(
+        self, request: FakeRequest, conversation_id: str
+    ) -> Any:
+        self._conversation(conversation_id)
+        del self.conversations[conversation_id]
+        return {"success": True}
+
+    async def _events(self, request: FakeRequest, conversation_id: str) -> Any:
+        events = list(self._conversation(conversation_id)["_events"]) or [
+            {"role": "assistant", "type": "conversation_end", "content": None}
+        ]
+        interval = self.stream_interval
+
+        async def stream() -> AsyncIterator[bytes]:
+            for event in events:
+                if interval:
+                    await asyncio.sleep(interval)
+                yield f"data: {json.dumps(event)}\n\n".encode()
+
+        return Reply(stream=stream())
+
+    # Agents
+
+    def _agent(self, agent_id: str) -> dict:
+        agent = self.agents.get(agent_id)
+        if agent is None:
+            raise NotFound
+        return agent
+
+    async def _list_agents(self, request: FakeRequest) -> Any:
+        return _page(request, list(self.agents.values()))
+
+    async def _create_agent(self, request: FakeRequest) -> Any:
+        body = request.json()
+        agent = {
+            "id": _id(),
+            "name": body["name"],
+            "definition": body["definition"],
+            "draft_definition": None,
+        }
+        self.agents[agent["id"]] = agent
+        return agent
+
+    async def _get_agent(self, request: FakeRequest, agent_id: str) -> Any:
+        return self._agent(agent_id)
+
+    async def _update_agent(self, request: FakeRequest, agent_id: str) -> Any:
+        agent = self._agent(agent_id)
+        body = request.json()
+        if body.get("name") is not None:
+            agent["name"] = body["name"]
+        if body.get("definition") is not None:
+            key = (
+                "draft_definition"
+                if request.query.get("preview") == "true"
+                else "definition"
+            )
+            agent[key] = body["definition"]
+        return agent
+
+    async def _delete_agent(self, request: FakeRequest, agent_id: str) -> Any:
+        self._agent(agent_id)
+        del self.agents[agent_id]
+        return {"success": True}
+
+    async def _list_triggers(self, request: FakeRequest, agent_id: str) -> Any:
+        self._agent(agent_id)
+        return [t for t in self.triggers.values() if t["assistant_id"] == agent_id]
+
+    async def _create_trigger(
+        self, request: FakeRequest, agent_id: str, trigger_type: str
+    ) -> Any:
+        self._agent(agent_id)
+        trigger: dict[str, Any] = {
+            "id": _id(),
+            "group_id": self.group_id,
+            "definition": {"type": trigger_type, **request.json()},
+            "routing_key": uuid.uuid4().hex,
+            "assistant_id": agent_id,
+        }
+        self.triggers[trigger["id"]] = trigger
+        return trigger
+
+    async def _delete_trigger(self, request: FakeRequest, trigger_id: str) -> Any:
+        if self.triggers.pop(trigger_id, None) is None:
+            raise NotFound
+        return {"success": True}
+
+    # Files
+
+    async def _upload_file(self, request: FakeRequest) -> Any:
+        files = request.files()
+        if not files:
+            return Reply({"detail": "No file uploaded"}, 422)
+        _, filename, content_type, data = files[0]
+        file: dict[str, Any] = {
+            "id": _id(),
+            "uri": f"fake://files/{filename}",
+            "size": len(data),
+            "group_id": self.group_id,
+            "filename": filename,
+            "content_type": content_type,
+            "source_type": "Document",
+            "source_metadata": None,
+            "created_at": _now(),
+        }
+        self.files[file["id"]] = (file, data)
+        return file
+
+    async def _download_file(self, request: FakeRequest, file_id: str) -> Any:
+        if file_id not in self.files:
+            raise NotFound
+        file, data = self.files[file_id]
+        headers = {"Content-Type": file["content_type"], "Accept-Ranges": "bytes"}
+        match = re.fullmatch(r"bytes=(\d+)-(\d*)", request.headers.get("range", ""))
+        if match is None:
+            return Reply(data, headers=headers)
+        start = int(match.group(1))
+        end = min(int(match.group(2) or len(data) - 1), len(data) - 1)
+        if start >= len(data):
+            return Reply(b"", 416, {"Content-Range": f"bytes */{len(data)}"})
+        headers["Content-Range"] = f"bytes {start}-{end}/{len(data)}"
+        return Reply(data[start : end + 1], 206, headers)
+
+
+def _page(request: FakeRequest, items: list) -> dict:
+    page = int(request.query.get("page", 1))
+    size = int(request.query.get("size", request.query.get("page_size", 10)))
+    return {
+        "items": items[(page - 1) * size : page * size],
+        "total": len(items),
+        "page": page,
+        "size": size,
+    }
+
+
+def _encode_headers(headers: dict[str, str]) -> list[tuple[bytes, bytes]]:
+    return [(k.lower().encode(), v.encode()) for k, v in headers.items()]
+
+
+class _ThreadedASGITransport(httpx.BaseTransport):
+    """Runs the ASGI app on a private event loop for the synchronous client."""
+
+    def __init__(self, app: FakeBackend):
+        self._transport = httpx.ASGITransport(app=app)  # type: ignore[arg-type]
+        self._loop = asyncio.new_event_loop()
+        self._thread = threading.Thread(target=self._loop.run_forever, daemon=True)
+        self._thread.start()
+
+    async def _handle(self, request: httpx.Request) -> tuple[int, list, bytes]:
+        response = await self._transport.handle_async_request(request)
+        body = await response.aread()
+        return response.status_code, response.headers.raw, body
+
+    def handle_request(self, request: httpx.Request) -> httpx.Response:
+        request.read()
+        future = asyncio.run_coroutine_threadsafe(self._handle(request), self._loop)
+        status, headers, body = future.result()
+        return httpx.Response(status, headers=headers, content=body)
+
+    def close(self) -> None:
+        if self._loop.is_running():
+            self._loop.call_soon_threadsafe(self._loop.stop)
+            self._thread.join()
+            self._loop.close()
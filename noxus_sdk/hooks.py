@@ -0,0 +1,207 @@
+import logging
+import time
+from collections.abc import Callable, Iterator
+from contextlib import contextmanager, nullcontext
+from dataclasses import dataclass
+from typing import Any, ContextManager
+
+import httpx
+
+from noxus_sdk.endpoints import url_template
+
+logger = logging.getLogger(__name__)
+
+REQUEST = "request"
+RESPONSE = "response"
+RETRY = "retry"
+THROTTLE = "throttle"
+ERROR = "error"
+
+EVENTS = (REQUEST, RESPONSE, RETRY, THROTTLE, ERROR)
+
+
+@dataclass(slots=True)
+class RequestEvent:
+    """What a hook receives.
+
+    Timings are in seconds. ``queue_time`` covers pacing and waiting for a
+    concurrency slot, ``connect_time`` is set only when the attempt opened a
+    new connection, and ``server_time`` runs from the end of the request body
+    to the response headers. Both are None when the transport does not
+    report them.
+    """
+
+    event: str
+    method: str
+    url: str
+    template: str
+    attempt: int
+    status: int | None = None
+    request_bytes: int | None = None
+    response_bytes: int | None = None
+    queue_time: float | None = None
+    connect_time: float | None = None
+    server_time: float | None = None
+    elapsed: float = 0.0
+    delay: float | None = None
+    error: BaseException | None = None
+
+
+def _content_length(headers: httpx.Headers) -> int | None:
+    length = headers.get("content-length")
+    return int(length) if length and length.isdigit() else None
+
+
+class RequestTrace:
+    """Timestamps for one attempt, filled in from httpcore trace callbacks."""
+
+    def __init__(self, method: str, url: str, attempt: int):
+        self.method = method
+        self.url = url
+        self.attempt = attempt
+        self.started = time.monotonic()
+        self.dispatched: float | None = None
+        self.request_bytes: int | None = None
+        self.marks: dict[str, float] = {}
+
+    def dispatch(self, content: Any) -> None:
+        self.dispatched = time.monotonic()
+        if isinstance(content, bytes):
+            self.request_bytes = len(content)
+
+    def trace(self, name: str, info: dict) -> None:
+        # "http11.send_request_body.complete" -> "send_request_body.complete"
+        self.marks[name.split(".", 1)[1]] = time.monotonic()
+
+    async def atrace(self, name: str, info: dict) -> None:
+        self.trace(name, info)
+
+    def _span(self, start: str, *ends: str) -> float | None:
+        begin = self.marks.get(start)
+        for end in ends:
+            if begin is not None and end in self.marks:
+                return self.marks[end] - begin
+        return None
+
+    def event(
+        self,
+        event: str,
+        response: httpx.Response | None = None,
+        delay: float | None = None,
+        error: BaseException | None = None,
+    ) -> RequestEvent:
+        now = time.monotonic()
+        status = request_bytes = response_bytes = None
+        if response is not None:
+            status = response.status_code
+            request_bytes = self.request_bytes
+            if request_bytes is None:
+                request_bytes = _content_length(response.request.headers)
+            response_bytes = response.num_bytes_downloaded or _content_length(
+                response.headers
+            )
+        server_start = (
+            "send_request_body.complete"
+            if "send_request_body.complete" in self.marks
+            else "send_request_headers.complete"
+        )
+        return RequestEvent(
+            event=event,
+            method=self.method,
+            url=self.url,
+            template=url_template(self.url),
+            attempt=self.attempt,
+            status=status,
+            request_bytes=request_bytes,
+            response_bytes=response_bytes,
+            queue_time=(
+                self.dispatched - self.started if self.dispatched is not None else None
+            ),
+            connect_time=self._span(
+                "connect_tcp.started",
+                "start_tls.complete",
+                "connect_tcp.complete",
+            ),
+            server_time=self._span(server_start, "receive_response_headers.complete"),
+            elapsed=now - self.started,
+            delay=delay,
+            error=error,
+        )
+
+
+Hook = Callable[[RequestEvent], Any]
+
+
+class Hooks:
+    """Callbacks fired around every request made through the client.
+
+    Hooks are plain callables that run inline, in sync and async calls alike,
+    so they should return quickly. Exceptions raised by a hook are logged and
+    otherwise ignored. Connect and server timings come from httpcore trace
+    callbacks, which are skipped unless a hook registered with ``trace=True``
+    needs them.
+
+        @client.hooks.on("response")
+        def observe(event: RequestEvent) -> None:
+            histogram[event.template].append(event.elapsed)
+    """
+
+    def __init__(self) -> None:
+        self._hooks: dict[str, list[Hook]] = {event: [] for event in EVENTS}
+        self._traced: list[Hook] = []
+
+    def on(self, event: str, hook: Hook | None = None, trace: bool = True) -> Any:
+        if event not in self._hooks:
+            raise ValueError(f"Unknown hook event: {event} (possible: {list(EVENTS)})")
+        if hook is None:
+            return lambda fn: self.on(event, fn, trace)
+        self._hooks[event].append(hook)
+        if trace:
+            self._traced.append(hook)
+        return hook
+
+    def remove(self, event: str, hook: Hook) -> None:
+        self._hooks[event].remove(hook)
+        if hook in self._traced:
+            self._traced.remove(hook)
+
+    def __bool__(self) -> bool:
+        return any(self._hooks.values())
+
+    def emit(
+        self,
+        event: str,
+        trace: RequestTrace,
+        response: httpx.Response | None = None,
+        delay: float | None = None,
+        error: BaseException | None = None,
+    ) -> None:
+        hooks = self._hooks[event]
+        if not hooks:
+            return
+        payload = trace.event(event, response, delay, error)
+        for hook in hooks:
+            try:
+                hook(payload)
+            except Exception:
+                logger.exception("Error in %s hook %r", event, hook)
+
+    def extensions(self, trace: RequestTrace, is_async: bool = False) -> dict | None:
+        if not self._traced:
+            return None
+        return {"trace": trace.atrace if is_async else trace.trace}
+
+    def reporting(self, trace: RequestTrace) -> ContextManager[None]:
+        """Emit an ``error`` event for exceptions raised inside the block."""
+        if not self._hooks[ERROR]:
+            return nullcontext()
+        return self._reporting(trace)
+
+    @contextmanager
+    def _reporting(self, trace: RequestTrace) -> Iterator[None]:
+        try:
+            yield
+        except Exception as e:
+            response = e.response if isinstance(e, httpx.HTTPStatusError) else None
+            self.emit(ERROR, trace, response, error=e)
+            raise
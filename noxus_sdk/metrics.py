@@ -0,0 +1,194 @@
+import math
+import os
+import tempfile
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+
+from noxus_sdk.hooks import ERROR, RESPONSE, Hooks, RequestEvent
+
+QUANTILES = (0.5, 0.9, 0.99)
+
+
+class LatencyHistogram:
+    """A log-bucketed histogram with bounded relative error.
+
+    Values are grouped into buckets growing by ``precision`` (2% by default),
+    so quantiles are accurate to within that fraction and memory depends on
+    the range of values seen, not on how many were recorded.
+    """
+
+    def __init__(self, precision: float = 0.02, lowest: float = 1e-6):
+        self.lowest = lowest
+        self._log_base = math.log1p(precision)
+        self.buckets: dict[int, int] = {}
+        self.count = 0
+        self.total = 0.0
+        self.max = 0.0
+
+    def record(self, value: float) -> None:
+        index = int(math.log(max(value, self.lowest) / self.lowest) / self._log_base)
+        self.buckets[index] = self.buckets.get(index, 0) + 1
+        self.count += 1
+        self.total += value
+        if value > self.max:
+            self.max = value
+
+    def quantile(self, q: float) -> float:
+        if not self.count:
+            return 0.0
+        rank = q * self.count
+        seen = 0
+        for index in sorted(self.buckets):
+            seen += self.buckets[index]
+            if seen >= rank:
+                # Upper bound of the bucket, capped by the largest value seen
+                return min(
+                    self.max, self.lowest * math.exp((index + 1) * self._log_base)
+                )
+        return self.max
+
+
+class EndpointStats:
+    __slots__ = ("bytes_in", "bytes_out", "count", "errors", "latency", "throttled")
+
+    def __init__(self) -> None:
+        self.count = 0
+        self.errors = 0
+        self.throttled = 0
+        self.bytes_in = 0
+        self.bytes_out = 0
+        self.latency = LatencyHistogram()
+
+    def snapshot(self) -> dict:
+        latency = {f"p{round(q * 100)}": self.latency.quantile(q) for q in QUANTILES}
+        latency["max"] = self.latency.max
+        latency["mean"] = (
+            self.latency.total / self.latency.count if self.latency.count else 0.0
+        )
+        return {
+            "count": self.count,
+            "errors": self.errors,
+            "throttled": self.throttled,
+            "bytes_in": self.bytes_in,
+            "bytes_out": self.bytes_out,
+            "latency": latency,
+        }
+
+
+class Metrics:
+    """Per-endpoint request statistics, keyed by method and URL template.
+
+    Every attempt that gets a response is counted, with its latency, byte
+    counts and whether it was a 429. Calls that end in an exception (including
+    error statuses) are counted as errors.
+    """
+
+    def __init__(self) -> None:
+        self._lock = threading.Lock()
+        self._endpoints: dict[tuple[str, str], EndpointStats] = {}
+
+    def install(self, hooks: Hooks) -> None:
+        hooks.on(RESPONSE, self.record_response, trace=False)
+        hooks.on(ERROR, self.record_error, trace=False)
+
+    def _stats(self, event: RequestEvent) -> EndpointStats:
+        key = (event.method, event.template)
+        stats = self._endpoints.get(key)
+        if stats is None:
+            stats = self._endpoints[key] = EndpointStats()
+        return stats
+
+    def record_response(self, event: RequestEvent) -> None:
+        with self._lock:
+            stats = self._stats(event)
+            stats.count += 1
+            if event.status == 429:
+                stats.throttled += 1
+            stats.bytes_out += event.request_bytes or 0
+            stats.bytes_in += event.response_bytes or 0
+            stats.latency.record(event.elapsed)
+
+    def record_error(self, event: RequestEvent) -> None:
+        with self._lock:
+            self._stats(event).errors += 1
+
+    def snapshot(self) -> dict:
+        with self._lock:
+            return {
+                f"{method} {template}": stats.snapshot()
+                for (method, template), stats in sorted(self._endpoints.items())
+            }
+
+    def reset(self) -> None:
+        with self._lock:
+            self._endpoints.clear()
+
+    def prometheus(self, prefix: str = "noxus_sdk") -> str:
+        """The statistics in the Prometheus text exposition format."""
+        counters = (
+            ("requests_total", "count", "Responses received"),
+            ("errors_total", "errors", "Calls that raised an error"),
+            ("throttled_total", "throttled", "Responses with status 429"),
+            ("sent_bytes_total", "bytes_out", "Request body bytes sent"),
+            ("received_bytes_total", "bytes_in", "Response body bytes received"),
+        )
+        with self._lock:
+            endpoints = sorted(self._endpoints.items())
+            lines = []
+            for name, attr, help_ in counters:
+                lines.append(f"# HELP {prefix}_{name} {help_}")
+                lines.append(f"# TYPE {prefix}_{name} counter")
+                for (method, template), stats in endpoints:
+                    labels = _labels(method, template)
+                    lines.append(f"{prefix}_{name}{{{labels}}} {getattr(stats, attr)}")
+            name = f"{prefix}_request_duration_seconds"
+            lines.append(f"# HELP {name} Request latency")
+            lines.append(f"# TYPE {name} summary")
+            for (method, template), stats in endpoints:
+                labels = _labels(method, template)
+                for q in QUANTILES:
+                    value = stats.latency.quantile(q)
+                    lines.append(f'{name}{{{labels},quantile="{q}"}} {value}')
+                lines.append(f"{name}_sum{{{labels}}} {stats.latency.total}")
+                lines.append(f"{name}_count{{{labels}}} {stats.latency.count}")
+        return "\n".join(lines) + "\n"
+
+    def write_prometheus(self, path: str | Path) -> None:
+        """Atomically write the metrics to ``path``, e.g. for node_exporter's
+        textfile collector."""
+        path = Path(path)
+        fd, tmp = tempfile.mkstemp(dir=path.parent, prefix=f".{path.name}.")
+        with os.fdopen(fd, "w") as f:
+            f.write(self.prometheus())
+        os.replace(tmp, path)
+
+    def serve_prometheus(
+        self, port: int = 9464, host: str = "127.0.0.1"
+    ) -> ThreadingHTTPServer:
+        """Serve the metrics over HTTP from a daemon thread.
+
+        Call ``shutdown()`` on the returned server to stop it.
+        """
+        metrics = self
+
+        class Handler(BaseHTTPRequestHandler):
+            def do_GET(self) -> None:
+                body = metrics.prometheus().encode()
+                self.send_response(200)
+                self.send_header("Content-Type", "text/plain; version=0.0.4")
+                self.send_header("Content-Length", str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+            def log_message(self, *args) -> None:
+                pass
+
+        server = ThreadingHTTPServer((host, port), Handler)
+        threading.Thread(target=server.serve_forever, daemon=True).start()
+        return server
+
+
+def _labels(method: str, template: str) -> str:
+    template = template.replace("\\", "\\\\").replace('"', '\\"')
+    return f'method="{method}",endpoint="{template}"'
@@ -0,0 +1,186 @@
+import hashlib
+import os
+import tempfile
+import time
+from pathlib import Path
+from typing import TYPE_CHECKING, Any
+
+import httpx
+
+from noxus_sdk.codec import JsonCodec, default_codec
+
+if TYPE_CHECKING:
+    from noxus_sdk.workflows.workflow import NodeDefinition
+
+# Bumped when the file layout changes, so old files are ignored
+FORMAT = 1
+
+
+def default_cache_dir() -> Path:
+    if "NOXUS_CACHE_DIR" in os.environ:
+        return Path(os.environ["NOXUS_CACHE_DIR"])
+    base = os.environ.get("XDG_CACHE_HOME") or Path.home() / ".cache"
+    return Path(base) / "noxus_sdk"
+
+
+def cache_key(base_url: str, api_key: str | None = None) -> str:
+    # Workspaces on one backend can see different catalogs (plugins, flags)
+    scope = f"{base_url.rstrip('/')}\0{api_key or ''}"
+    return hashlib.sha256(scope.encode()).hexdigest()[:24]
+
+
+class CachedCatalog:
+    __slots__ = (
+        "_definitions",
+        "base_url",
+        "etag",
+        "fetched_at",
+        "key",
+        "nodes",
+        "ttl",
+    )
+
+    def __init__(
+        self,
+        base_url: str,
+        nodes: list[dict],
+        etag: str | None,
+        fetched_at: float,
+        ttl: float,
+        definitions: "list[NodeDefinition] | None" = None,
+        key: str | None = None,
+    ):
+        self.base_url = base_url
+        self.key = key or cache_key(base_url)
+        self.nodes = nodes
+        self.etag = etag
+        self.fetched_at = fetched_at
+        self.ttl = ttl
+        self._definitions = definitions
+
+    def is_fresh(self) -> bool:
+        return time.time() - self.fetched_at < self.ttl
+
+    @property
+    def definitions(self) -> "list[NodeDefinition]":
+        if self._definitions is None:
+            from noxus_sdk.workflows.workflow import node_definitions
+
+            # Validated before they were written, so built without validation
+            self._definitions = node_definitions(self.nodes, validate=False)
+        return self._definitions
+
+
+class NodeCatalogCache:
+    """The ``/v1/nodes`` catalog kept on disk, shared by clients and processes.
+
+    There is one file per base URL and API key. A catalog younger than ``ttl`` seconds is
+    used without a request. An older one is revalidated with
+    ``If-None-Match`` when the server sent an ``ETag``, and refetched
+    otherwise. Catalogs are validated once, when fetched, and loaded from the
+    file without running Pydantic validation again. Files are replaced
+    atomically, so forked workers can share a directory.
+
+        client = Client(api_key, node_cache=NodeCatalogCache(ttl=600))
+    """
+
+    def __init__(
+        self,
+        directory: str | Path | None = None,
+        ttl: float = 3600.0,
+        json_codec: JsonCodec | None = None,
+    ):
+        self.directory = Path(directory) if directory else default_cache_dir()
+        self.ttl = ttl
+        self.json_codec = json_codec or default_codec()
+
+    def path(self, base_url: str, api_key: str | None = None) -> Path:
+        return self._path(cache_key(base_url, api_key))
+
+    def _path(self, key: str) -> Path:
+        return self.directory / f"nodes-{key}.json"
+
+    def load(self, base_url: str, api_key: str | None = None) -> CachedCatalog | None:
+        key = cache_key(base_url, api_key)
+        try:
+            data = self.json_codec.loads(self._path(key).read_bytes())
+            if data["format"] != FORMAT or data["base_url"] != base_url.rstrip("/"):
+                return None
+            return CachedCatalog(
+                base_url,
+                data["nodes"],
+                data.get("etag"),
+                float(data["fetched_at"]),
+                self.ttl,
+                key=key,
+            )
+        except (OSError, ValueError, KeyError, TypeError):
+            # Unreadable, truncated or from another version: fetch again
+            return None
+
+    def conditional_headers(self, entry: CachedCatalog | None) -> dict | None:
+        if entry is None or not entry.etag:
+            return None
+        return {"If-None-Match": entry.etag}
+
+    def update(
+        self,
+        base_url: str,
+        response: httpx.Response,
+        entry: CachedCatalog | None,
+        api_key: str | None = None,
+    ) -> CachedCatalog:
+        """Store the catalog from a ``/v1/nodes`` response, or on a 304 mark
+        ``entry`` as revalidated."""
+        if response.status_code == 304 and entry is not None:
+            entry.fetched_at = time.time()
+            self._write(entry)
+            return entry
+        from noxus_sdk.workflows.workflow import node_definitions
+
+        nodes = self.json_codec.loads(response.content)
+        entry = CachedCatalog(
+            base_url,
+            nodes,
+            response.headers.get("etag"),
+            time.time(),
+            self.ttl,
+            node_definitions(nodes),
+            cache_key(base_url, api_key),
+        )
+        self._write(entry)
+        return entry
+
+    def _write(self, entry: CachedCatalog) -> None:
+        path = self._path(entry.key)
+        data: dict[str, Any] = {
+            "format": FORMAT,
+            "base_url": entry.base_url.rstrip("/"),
+            "etag": entry.etag,
+            "fetched_at": entry.fetched_at,
+            "nodes": entry.nodes,
+        }
+        try:
+            path.parent.mkdir(parents=True, exist_ok=True)
+            fd, tmp = tempfile.mkstemp(dir=path.parent, prefix=f".{path.name}.")
+        except OSError:
+            # A read-only or full disk only costs the next process a fetch
+            return
+        try:
+            with os.fdopen(fd, "wb") as f:
+                f.write(self.json_codec.dumps(data))
+            os.replace(tmp, path)
+        except OSError:
+            pass
+        finally:
+            # Gone after a successful replace, left behind by a failed one
+            Path(tmp).unlink(missing_ok=True)
+
+    def clear(self, base_url: str | None = None, api_key: str | None = None) -> None:
+        paths = (
+            [self.path(base_url, api_key)]
+            if base_url
+            else self.directory.glob("nodes-*.json")
+        )
+        for path in paths:
+            path.unlink(missing_ok=True)
@@ -0,0 +1,238 @@
+import asyncio
+import contextvars
+import itertools
+import time
+from collections import deque
+from collections.abc import AsyncIterator, Awaitable, Callable, Iterator
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import Any
+
+import httpx
+
+# Fetches one page: (page, size) -> response body
+PageFetcher = Callable[[int, int], Any]
+AsyncPageFetcher = Callable[[int, int], Awaitable[Any]]
+
+
+class PageCursor:
+    """Position and page size of a scan over a page-numbered list endpoint.
+
+    Pages are addressed as ``page`` and ``size``, so the cursor only changes
+    the size when the items read so far are a whole number of pages of the
+    new size. Sizes grow while pages come back in under a quarter of
+    ``target_latency`` and shrink when a page takes longer than it.
+
+    The scan ends on an empty or short page, or once ``total`` items (when
+    the response has it) have been read. When the server returns a smaller
+    ``size`` than was asked for, the smaller size becomes the maximum and
+    the items already read are skipped. When the server rejects a grown
+    size with a 4xx, the last size it accepted becomes the maximum and the
+    page is requested again.
+    """
+
+    def __init__(
+        self,
+        page_size: int = 100,
+        max_page_size: int = 1000,
+        min_page_size: int = 10,
+        target_latency: float = 1.0,
+        adaptive: bool = True,
+    ):
+        self.size = page_size
+        self.max_size = max(page_size, max_page_size)
+        self.min_size = min(page_size, min_page_size)
+        self.target_latency = target_latency
+        self.adaptive = adaptive
+        self.offset = 0
+        self.total: int | None = None
+        self.done = False
+        # Size of the last page the server answered, to fall back to
+        self.accepted: int | None = None
+
+    def next_page(self) -> tuple[int, int]:
+        return self.offset // self.size + 1, self.size
+
+    def advance(
+        self, page: int, size: int, body: Any, elapsed: float = 0.0
+    ) -> list[dict]:
+        """Record the response to ``page`` and return the items not read yet."""
+        if isinstance(body, list):
+            # Not paginated: everything came at once
+            self.done = True
+            return body
+        items = body.get("items") or []
+        served = body.get("size")
+        if isinstance(served, int) and 0 < served < size:
+            size = self.size = self.max_size = served
+            self.min_size = min(self.min_size, served)
+        self.accepted = size
+        if isinstance(body.get("total"), int):
+            self.total = body["total"]
+        start = (page - 1) * size
+        short = len(items) < size
+        self.offset, items = start + len(items), items[self.offset - start :]
+        if short or (self.total is not None and self.offset >= self.total):
+            self.done = True
+        elif self.adaptive:
+            self._resize(elapsed)
+        return items
+
+    def reject(self, size: int, error: Exception) -> bool:
+        """Fall back to the last accepted size after ``size`` was refused.
+
+        Returns whether the page should be requested again.
+        """
+        if not (
+            isinstance(error, httpx.HTTPStatusError)
+            and 400 <= error.response.status_code < 500
+            and self.accepted is not None
+            and size > self.accepted
+        ):
+            return False
+        self.size = self.max_size = self.accepted
+        while self.offset % self.size:
+            self.size -= 1
+        return True
+
+    def _resize(self, elapsed: float) -> None:
+        if elapsed > self.target_latency and self.size > self.min_size:
+            self.size = max(self.min_size, self.size // 2)
+            while self.offset % self.size:
+                self.size -= 1
+        elif elapsed < self.target_latency / 4:
+            grown = min(self.max_size, self.size * 2)
+            if grown > self.size and self.offset % grown == 0:
+                self.size = grown
+
+
+def _timed(fetch: PageFetcher, page: int, size: int) -> tuple[Any, float]:
+    start = time.perf_counter()
+    body = fetch(page, size)
+    return body, time.perf_counter() - start
+
+
+async def _atimed(fetch: AsyncPageFetcher, page: int, size: int) -> tuple[Any, float]:
+    start = time.perf_counter()
+    body = await fetch(page, size)
+    return body, time.perf_counter() - start
+
+
+def iter_pages(
+    fetch: PageFetcher, cursor: PageCursor, prefetch: bool = True
+) -> Iterator[list[dict]]:
+    """Yield the items of each page, fetching the next page on a worker
+    thread while the caller handles the current one."""
+    executor = ThreadPoolExecutor(1) if prefetch else None
+    pending: Future | None = None
+    try:
+        while not cursor.done:
+            page, size = cursor.next_page()
+            try:
+                if pending is None:
+                    body, elapsed = _timed(fetch, page, size)
+                else:
+                    body, elapsed = pending.result()
+                    pending = None
+            except Exception as e:
+                pending = None
+                if cursor.reject(size, e):
+                    continue
+                raise
+            items = cursor.advance(page, size, body, elapsed)
+            if executor is not None and not cursor.done:
+                page, size = cursor.next_page()
+                # Runs with this context, so deadlines and tracing carry over
+                context = contextvars.copy_context()
+                pending = executor.submit(context.run, _timed, fetch, page, size)
+            if items:
+                yield items
+    finally:
+        if pending is not None:
+            pending.cancel()
+        if executor is not None:
+            executor.shutdown(wait=False)
+
+
+async def aiter_pages(
+    fetch: AsyncPageFetcher, cursor: PageCursor, prefetch: bool = True
+) -> AsyncIterator[list[dict]]:
+    """Async version of ``iter_pages``; the next page is fetched in a task."""
+    pending: asyncio.Task | None = None
+    try:
+        while not cursor.done:
+            page, size = cursor.next_page()
+            try:
+                if pending is None:
+                    body, elapsed = await _atimed(fetch, page, size)
+                else:
+                    body, elapsed = await pending
+                    pending = None
+            except Exception as e:
+                pending = None
+                if cursor.reject(size, e):
+                    continue
+                raise
+            items = cursor.advance(page, size, body, elapsed)
+            if prefetch and not cursor.done:
+                page, size = cursor.next_page()
+                pending = asyncio.ensure_future(_atimed(fetch, page, size))
+            if items:
+                yield items
+    finally:
+        if pending is not None:
+            pending.cancel()
+
+
+async def aiter_pages_concurrently(
+    fetch: AsyncPageFetcher,
+    cursor: PageCursor,
+    concurrency: int,
+    ordered: bool = True,
+) -> AsyncIterator[list[dict]]:
+    """Like ``aiter_pages``, but once the first page gives the total, the
+    remaining pages are requested up to ``concurrency`` at a time.
+
+    With ``ordered`` pages are yielded in page order; otherwise as they
+    arrive. The page count is fixed by the first total, so items added
+    during the scan may be missed. Without a total, pages are read one
+    after another.
+    """
+    page, size = cursor.next_page()
+    body, elapsed = await _atimed(fetch, page, size)
+    items = cursor.advance(page, size, body, elapsed)
+    if items:
+        yield items
+    if cursor.done:
+        return
+    if cursor.total is None:
+        async for items in aiter_pages(fetch, cursor):
+            yield items
+        return
+
+    size = cursor.size
+    pages = iter(range(cursor.offset // size + 1, -(-cursor.total // size) + 1))
+
+    def start(page: int) -> asyncio.Future:
+        return asyncio.ensure_future(fetch(page, size))
+
+    window = deque(start(page) for page in itertools.islice(pages, concurrency))
+    try:
+        while window:
+            if ordered:
+                task = window.popleft()
+                body = await task
+            else:
+                done, _ = await asyncio.wait(
+                    window, return_when=asyncio.FIRST_COMPLETED
+                )
+                task = done.pop()
+                window.remove(task)
+                body = task.result()
+            following = next(pages, None)
+            if following is not None:
+                window.append(start(following))
+            if body.get("items"):
+                yield body["items"]
+    finally:
+        for task in window:
+            task.cancel()
@@ -1,4 +1,35 @@
-from .assistants import *
-from .conversations import *
-from .knowledge_bases import *
-from .workflows import *
+import importlib
+import importlib.util
+from typing import TYPE_CHECKING, Any
+
+if TYPE_CHECKING:
+    from .assistants import *
+    from .conversations import *
+    from .knowledge_bases import *
+    from .workflows import *
+
+# Imported on first attribute access, so that importing one resource module
+# (e.g. ``noxus_sdk.resources.runs``) does not load every model
+_MODULES = ("assistants", "conversations", "knowledge_bases", "workflows")
+
+
+def _public_names(module: Any) -> list[str]:
+    names = getattr(module, "__all__", None)
+    if names is None:
+        names = [name for name in vars(module) if not name.startswith("_")]
+    return list(names)
+
+
+def __getattr__(name: str) -> Any:
+    if not name.startswith("_") and importlib.util.find_spec(f"{__name__}.{name}"):
+        return importlib.import_module(f"{__name__}.{name}")
+    modules = [importlib.import_module(f"{__name__}.{m}") for m in _MODULES]
+    if name == "__all__":
+        return list(dict.fromkeys(n for m in modules for n in _public_names(m)))
+    # Later modules win, as with the star imports this replaces
+    for module in reversed(modules):
+        if name in _public_names(module):
+            value = getattr(module, name)
+            globals()[name] = value
+            return value
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
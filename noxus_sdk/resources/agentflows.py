@@ -1,3 +1,5 @@
+from collections.abc import AsyncIterator, Iterator
+
 from pydantic import ConfigDict
 
 from noxus_sdk.resources.base import BaseService
@@ -31,6 +33,33 @@ class AgentFlowService(BaseService[AgentFlowDefinition]):
             for data in workflows_data
         ]
 
+    def iter_all(self, page_size: int = 100) -> Iterator[AgentFlowDefinition]:
+        for page in self.client.iter_pages(
+            "/v1/workflows", params={"type": "agent_flow"}, page_size=page_size
+        ):
+            for data in page:
+                yield AgentFlowDefinition.model_validate(
+                    {"client": self.client, **data}
+                )
+
+    async def aiter_all(
+        self,
+        page_size: int = 100,
+        concurrency: int = 1,
+        ordered: bool = True,
+    ) -> AsyncIterator[AgentFlowDefinition]:
+        async for page in self.client.aiter_pages(
+            "/v1/workflows",
+            params={"type": "agent_flow"},
+            page_size=page_size,
+            concurrency=concurrency,
+            ordered=ordered,
+        ):
+            for data in page:
+                yield AgentFlowDefinition.model_validate(
+                    {"client": self.client, **data}
+                )
+
     def delete(self, workflow_id: str):
         self.client.delete(f"/v1/workflows/{workflow_id}")
 
@@ -1,10 +1,11 @@
+from collections.abc import AsyncIterator, Iterator
 from typing import TypeAlias
 from uuid import UUID
 import enum
 
-from pydantic import BaseModel, ConfigDict, Field
+from pydantic import ConfigDict, Field
 
-from noxus_sdk.resources.base import BaseResource, BaseService
+from noxus_sdk.resources.base import ApiModel, BaseResource, BaseService
 from noxus_sdk.resources.conversations import (
     ConversationSettings,
     KnowledgeBaseQaTool,
@@ -22,7 +23,7 @@ class TriggerType(str, enum.Enum):
     TEAMS = "teams"
 
 
-class TriggerData(BaseModel):
+class TriggerData(ApiModel):
     trigger_type: TriggerType = Field(exclude=True)
     team_id: str
     channel: str | None = None
@@ -96,6 +97,23 @@ class AgentService(BaseService[Agent]):
         results = self.client.pget("/v1/agents")
         return [Agent(client=self.client, **result) for result in results]
 
+    def iter_all(self, page_size: int = 100) -> Iterator[Agent]:
+        for page in self.client.iter_pages("/v1/agents", page_size=page_size):
+            for result in page:
+                yield Agent(client=self.client, **result)
+
+    async def aiter_all(
+        self,
+        page_size: int = 100,
+        concurrency: int = 1,
+        ordered: bool = True,
+    ) -> AsyncIterator[Agent]:
+        async for page in self.client.aiter_pages(
+            "/v1/agents", page_size=page_size, concurrency=concurrency, ordered=ordered
+        ):
+            for result in page:
+                yield Agent(client=self.client, **result)
+
     def create(self, name: str, settings: AgentSettings) -> Agent:
         result = self.client.post(
             "/v1/agents", {"name": name, "definition": settings.model_dump()}
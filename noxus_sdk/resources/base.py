@@ -6,7 +6,13 @@ from noxus_sdk.client import Client
 T = TypeVar("T")
 
 
-class BaseResource(BaseModel):
+class ApiModel(BaseModel):
+    """Base for the API models; validators are built on first use, not on import."""
+
+    model_config = ConfigDict(defer_build=True)
+
+
+class BaseResource(ApiModel):
     model_config = ConfigDict(arbitrary_types_allowed=True)
     client: Client = Field(..., exclude=True)
 
@@ -7,7 +7,6 @@ from uuid import UUID, uuid4
 
 from pydantic import (
     AliasChoices,
-    BaseModel,
     ConfigDict,
     Discriminator,
     Field,
@@ -15,13 +14,14 @@ from pydantic import (
     model_validator,
 )
 
-from noxus_sdk.resources.base import BaseResource, BaseService
+from noxus_sdk.deadlines import Deadline, current_deadline, deadline_scope, earliest
+from noxus_sdk.resources.base import ApiModel, BaseResource, BaseService
 
 if TYPE_CHECKING:
     from collections.abc import AsyncIterator, Iterator
 
 
-class ConversationTool(BaseModel):
+class ConversationTool(ApiModel):
     type: str
     enabled: bool = True
     extra_instructions: str | None = None
@@ -83,7 +83,7 @@ AnyToolSettings = Annotated[
 ]
 
 
-class ConversationSettings(BaseModel):
+class ConversationSettings(ApiModel):
     model: list[str] = Field(validation_alias=AliasChoices("model", "model_selection"))
     temperature: float
     max_tokens: int = 64000
@@ -103,7 +103,7 @@ class ConversationSettings(BaseModel):
         return data
 
 
-class ConversationFile(BaseModel):
+class ConversationFile(ApiModel):
     status: Literal["success"] = "success"
     name: str
     b64_content: str | None = None
@@ -119,7 +119,7 @@ class ConversationFile(BaseModel):
         return self
 
 
-class MessageRequest(BaseModel):
+class MessageRequest(ApiModel):
     content: str
     tool: Literal["web_research", "kb_qa", "workflow"] | str | None = None
     kb_id: str | None = None
@@ -128,7 +128,7 @@ class MessageRequest(BaseModel):
     model_selection: list[str] | None = None
 
 
-class Message(BaseModel):
+class Message(ApiModel):
     id: UUID
     created_at: datetime
     message_parts: list[dict]
@@ -183,35 +183,69 @@ class Conversation(BaseResource):
         self._update_w_response(response)
         return self
 
-    def iter_messages(self) -> Iterator[MessageEvent]:
+    def iter_messages(self, timeout: float | None = None) -> Iterator[MessageEvent]:
+        deadline = earliest(
+            current_deadline(), Deadline(timeout) if timeout is not None else None
+        )
         resp = self.client.event_stream(
             f"/v1/conversations/{self.id}/events"
-            + ("?etag=" + self.etag if self.etag else "")
+            + ("?etag=" + self.etag if self.etag else ""),
+            deadline=deadline,
+        )
+        # The span is not made current across yields, only around refreshes
+        span = self.client.start_span(
+            "Conversation.iter_messages", {"conversation.id": str(self.id)}
         )
-        for event in resp:
-            message = MessageEvent.model_validate_json(event.data)
-            if message.role == "user":
-                continue
-            if message.type == "conversation_end":
+        try:
+            for event in resp:
+                message = MessageEvent.model_validate_json(event.data)
+                span.add_event("message", {"role": message.role, "type": message.type})
+                if message.role == "user":
+                    continue
+                if message.type == "conversation_end":
+                    yield message
+                    break
                 yield message
-                break
-            yield message
-            self.refresh()
-
-    async def aiter_messages(self) -> AsyncIterator[MessageEvent]:
+                with deadline_scope(deadline), self.client.use_span(span):
+                    self.refresh()
+        except Exception as e:
+            span.record_exception(e)
+            raise
+        finally:
+            span.end()
+
+    async def aiter_messages(
+        self, timeout: float | None = None
+    ) -> AsyncIterator[MessageEvent]:
+        deadline = earliest(
+            current_deadline(), Deadline(timeout) if timeout is not None else None
+        )
         resp = self.client.aevent_stream(
             f"/v1/conversations/{self.id}/events"
-            + ("?etag=" + self.etag if self.etag else "")
+            + ("?etag=" + self.etag if self.etag else ""),
+            deadline=deadline,
+        )
+        # The span is not made current across yields, only around refreshes
+        span = self.client.start_span(
+            "Conversation.iter_messages", {"conversation.id": str(self.id)}
         )
-        async for event in resp:
-            message = MessageEvent.model_validate_json(event.data)
-            if message.role == "user":
-                continue
-            if message.type == "conversation_end":
+        try:
+            async for event in resp:
+                message = MessageEvent.model_validate_json(event.data)
+                span.add_event("message", {"role": message.role, "type": message.type})
+                if message.role == "user":
+                    continue
+                if message.type == "conversation_end":
+                    yield message
+                    break
                 yield message
-                break
-            yield message
-            await self.arefresh()
+                with deadline_scope(deadline), self.client.use_span(span):
+                    await self.arefresh()
+        except Exception as e:
+            span.record_exception(e)
+            raise
+        finally:
+            span.end()
 
     def add_message(self, message: MessageRequest) -> Message:
         response = self.client.post(
@@ -227,7 +261,7 @@ class Conversation(BaseResource):
         return Message.model_validate(self.messages[-1])
 
 
-class MessageEvent(BaseModel):
+class MessageEvent(ApiModel):
     role: str
     type: str
     content: str | None = None
@@ -258,6 +292,26 @@ class ConversationService(BaseService[Conversation]):
             for conversation in conversations
         ]
 
+    def iter_all(self, page_size: int = 100) -> Iterator[Conversation]:
+        for page in self.client.iter_pages("/v1/conversations", page_size=page_size):
+            for conversation in page:
+                yield Conversation(client=self.client, **conversation)
+
+    async def aiter_all(
+        self,
+        page_size: int = 100,
+        concurrency: int = 1,
+        ordered: bool = True,
+    ) -> AsyncIterator[Conversation]:
+        async for page in self.client.aiter_pages(
+            "/v1/conversations",
+            page_size=page_size,
+            concurrency=concurrency,
+            ordered=ordered,
+        ):
+            for conversation in page:
+                yield Conversation(client=self.client, **conversation)
+
     def create(
         self,
         name: str,
@@ -1,10 +1,23 @@
+import asyncio
+import contextvars
+import threading
+from collections.abc import AsyncIterator, Iterator
+from concurrent.futures import FIRST_EXCEPTION, ThreadPoolExecutor, wait
+from pathlib import Path
 from uuid import UUID
 from enum import Enum
-from pydantic import ConfigDict, BaseModel
+
+import aiofiles
+import httpx
+from pydantic import ConfigDict
 from datetime import datetime
 
-from noxus_sdk.resources.base import BaseService
-from typing import BinaryIO
+from noxus_sdk.concurrency import gather_or_cancel
+from noxus_sdk.resources.base import ApiModel, BaseService
+from noxus_sdk.uploads import MultipartUpload, UploadSource
+
+DOWNLOAD_CHUNK_SIZE = 64 * 1024
+DOWNLOAD_PART_SIZE = 8 * 1024 * 1024
 
 
 class SourceType(str, Enum):
@@ -29,7 +42,7 @@ class SourceType(str, Enum):
         raise ValueError(f"No enum member with value {value} in {cls}")
 
 
-class File(BaseModel):
+class File(ApiModel):
     id: UUID
     uri: str
     size: float
@@ -45,12 +58,16 @@ class File(BaseModel):
 
 
 class FileService(BaseService[File]):
-    def save(self, fd: BinaryIO) -> File:
-        w = self.client.post(f"/v1/file", files={"file": fd})
+    def save(self, fd: UploadSource) -> File:
+        w = self.client.post(
+            f"/v1/file", files=MultipartUpload.from_files("file", [fd])
+        )
         return File.model_validate(w)
 
-    async def asave(self, fd: BinaryIO) -> File:
-        w = await self.client.apost(f"/v1/file", files={"file": fd})
+    async def asave(self, fd: UploadSource) -> File:
+        w = await self.client.apost(
+            f"/v1/file", files=MultipartUpload.from_files("file", [fd])
+        )
         return File.model_validate(w)
 
     def get(self, file_id: str) -> bytes:
@@ -60,3 +77,178 @@ class FileService(BaseService[File]):
     async def aget(self, file_id: str) -> bytes:
         w = await self.client._arequest("GET", f"/v1/file/{file_id}")  # noqa
         return w.content
+
+    def iter_bytes(
+        self, file_id: str, chunk_size: int = DOWNLOAD_CHUNK_SIZE
+    ) -> Iterator[bytes]:
+        with self.client.stream("GET", f"/v1/file/{file_id}") as response:
+            yield from response.iter_bytes(chunk_size)
+
+    async def aiter_bytes(
+        self, file_id: str, chunk_size: int = DOWNLOAD_CHUNK_SIZE
+    ) -> AsyncIterator[bytes]:
+        async with self.client.astream("GET", f"/v1/file/{file_id}") as response:
+            async for chunk in response.aiter_bytes(chunk_size):
+                yield chunk
+
+    def download_to(
+        self,
+        file_id: str,
+        path: str | Path,
+        parallel: int = 1,
+        part_size: int = DOWNLOAD_PART_SIZE,
+    ) -> Path:
+        """Stream a file to disk.
+
+        With ``parallel > 1`` the file is fetched as HTTP range requests of
+        ``part_size`` bytes, ``parallel`` at a time, each written in place into
+        a file preallocated to the final size. Servers that ignore ``Range``
+        fall back to a single streamed download. If any part fails, the other
+        parts are stopped and the incomplete file is removed.
+        """
+        path = Path(path)
+        url = f"/v1/file/{file_id}"
+        headers = _range_headers(0, part_size - 1) if parallel > 1 else None
+        try:
+            with self.client.stream("GET", url, headers=headers) as response:
+                total = _range_total(response)
+                with _RemovedOnError(path), open(path, "wb") as f:
+                    if total is not None:
+                        f.truncate(total)
+                    for chunk in response.iter_bytes(DOWNLOAD_CHUNK_SIZE):
+                        f.write(chunk)
+        except httpx.HTTPStatusError as e:
+            if not _is_empty_file(e.response):
+                raise
+            path.write_bytes(b"")
+            return path
+        if total is None or total <= part_size:
+            return path
+        stop = threading.Event()
+
+        def fetch(start: int) -> None:
+            end = min(start + part_size, total) - 1
+            with (
+                self.client.stream(
+                    "GET", url, headers=_range_headers(start, end)
+                ) as part,
+                open(path, "r+b") as f,
+            ):
+                _check_range(part, start)
+                f.seek(start)
+                for chunk in part.iter_bytes(DOWNLOAD_CHUNK_SIZE):
+                    if stop.is_set():
+                        return
+                    f.write(chunk)
+
+        # Each worker runs in a copy of the caller's context so that an active
+        # ``deadline_scope`` bounds the parts as well
+        with _RemovedOnError(path), ThreadPoolExecutor(parallel) as pool:
+            futures = [
+                pool.submit(contextvars.copy_context().run, fetch, start)
+                for start in range(part_size, total, part_size)
+            ]
+            try:
+                done, _ = wait(futures, return_when=FIRST_EXCEPTION)
+                for future in done:
+                    future.result()
+            except BaseException:
+                stop.set()
+                for future in futures:
+                    future.cancel()
+                raise
+        return path
+
+    async def adownload_to(
+        self,
+        file_id: str,
+        path: str | Path,
+        parallel: int = 1,
+        part_size: int = DOWNLOAD_PART_SIZE,
+    ) -> Path:
+        path = Path(path)
+        url = f"/v1/file/{file_id}"
+        headers = _range_headers(0, part_size - 1) if parallel > 1 else None
+        try:
+            async with self.client.astream("GET", url, headers=headers) as response:
+                total = _range_total(response)
+                with _RemovedOnError(path):
+                    async with aiofiles.open(path, "wb") as f:
+                        if total is not None:
+                            await f.truncate(total)
+                        async for chunk in response.aiter_bytes(DOWNLOAD_CHUNK_SIZE):
+                            await f.write(chunk)
+        except httpx.HTTPStatusError as e:
+            if not _is_empty_file(e.response):
+                raise
+            async with aiofiles.open(path, "wb"):
+                return path
+        if total is None or total <= part_size:
+            return path
+
+        semaphore = asyncio.Semaphore(parallel)
+
+        async def fetch(start: int) -> None:
+            end = min(start + part_size, total) - 1
+            async with (
+                semaphore,
+                self.client.astream(
+                    "GET", url, headers=_range_headers(start, end)
+                ) as part,
+                aiofiles.open(path, "r+b") as f,
+            ):
+                _check_range(part, start)
+                await f.seek(start)
+                async for chunk in part.aiter_bytes(DOWNLOAD_CHUNK_SIZE):
+                    await f.write(chunk)
+
+        with _RemovedOnError(path):
+            await gather_or_cancel(
+                *(fetch(s) for s in range(part_size, total, part_size))
+            )
+        return path
+
+
+class _RemovedOnError:
+    """Deletes a partly written download when it fails."""
+
+    def __init__(self, path: Path):
+        self.path = path
+
+    def __enter__(self) -> None:
+        pass
+
+    def __exit__(self, exc_type: type[BaseException] | None, *exc: object) -> None:
+        if exc_type is not None:
+            self.path.unlink(missing_ok=True)
+
+
+def _range_headers(start: int, end: int) -> dict[str, str]:
+    # Offsets must refer to the file itself, not to a compressed encoding of it
+    return {"Range": f"bytes={start}-{end}", "Accept-Encoding": "identity"}
+
+
+def _is_empty_file(response: httpx.Response) -> bool:
+    """A 416 for the first range of a zero-byte file."""
+    return (
+        response.status_code == 416
+        and response.headers.get("content-range", "").strip() == "bytes */0"
+    )
+
+
+def _range_total(response: httpx.Response) -> int | None:
+    """Full size of a ranged (206) response, or None if the range was ignored."""
+    if response.status_code != 206:
+        return None
+    content_range = response.headers.get("content-range", "")
+    _, _, total = content_range.rpartition("/")
+    return int(total) if total.isdigit() else None
+
+
+def _check_range(response: httpx.Response, start: int) -> None:
+    if response.status_code != 206 or not response.headers.get(
+        "content-range", ""
+    ).startswith(f"bytes {start}-"):
+        raise ValueError(
+            f"Server did not honour the range request starting at byte {start}"
+        )
@@ -1,16 +1,12 @@
 import builtins
-from pathlib import Path
-from typing import TYPE_CHECKING, Any, Literal, TypeAlias
+from collections.abc import AsyncIterator, Iterator
+from typing import Any, Literal, TypeAlias
 
-import aiofiles
-from pydantic import BaseModel, ConfigDict, Field
+from pydantic import ConfigDict, Field
 
-from noxus_sdk.resources.base import BaseResource, BaseService
+from noxus_sdk.resources.base import ApiModel, BaseResource, BaseService
 from noxus_sdk.resources.runs import Run
-
-if TYPE_CHECKING:
-    from noxus_sdk.client import HttpxFile
-
+from noxus_sdk.uploads import MultipartUpload, UploadSource
 
 RunStatus = Literal["queued", "running", "failed", "completed", "stopped"]
 DocumentStatus = Literal["trained", "training", "error", "uploaded", "folder"]
@@ -22,7 +18,7 @@ SourceType = Literal[
 RunID: TypeAlias = str
 
 
-class File(BaseModel):
+class File(ApiModel):
     name: str
     size: int
     content_type: str
@@ -30,27 +26,27 @@ class File(BaseModel):
     uri: str
 
 
-class GoogleFile(BaseModel):
+class GoogleFile(ApiModel):
     id: str
     name: str
     mime_type: str
     size: int
 
 
-class OneDriveFile(BaseModel):
+class OneDriveFile(ApiModel):
     id: str
     name: str
     size: int
     web_url: str
 
 
-class WebsiteWithDepth(BaseModel):
+class WebsiteWithDepth(ApiModel):
     url: str
     depth: int = 1
 
 
 # Base document source config
-class BaseDocumentSourceConfig(BaseModel):
+class BaseDocumentSourceConfig(ApiModel):
     pass
 
 
@@ -67,21 +63,21 @@ class UploadFileConfig(BaseDocumentSourceConfig):
 
 
 # Document source with discriminated union
-class DocumentSourceConfig(BaseModel):
+class DocumentSourceConfig(ApiModel):
     files: builtins.list[File]
 
 
-class DocumentSource(BaseModel):
+class DocumentSource(ApiModel):
     config: DocumentSourceConfig
     source_type: Literal["document"] = "document"
     subtype: str | None = None
 
 
-class Source(BaseModel):
+class Source(ApiModel):
     source: DocumentSource
 
 
-class KnowledgeBaseIngestion(BaseModel):
+class KnowledgeBaseIngestion(ApiModel):
     batch_size: int
     default_chunk_size: int
     default_chunk_overlap: int
@@ -89,7 +85,7 @@ class KnowledgeBaseIngestion(BaseModel):
     enrich_pre_made_qa: bool
 
 
-class KnowledgeBaseRetrieval(BaseModel):
+class KnowledgeBaseRetrieval(ApiModel):
     type: Literal[
         "full_text_search", "semantic_search", "hybrid_search", "hybrid_reranking"
     ] = "hybrid_reranking"
@@ -97,16 +93,16 @@ class KnowledgeBaseRetrieval(BaseModel):
     reranker_settings: dict
 
 
-class KnowledgeBaseHybridSettings(BaseModel):
+class KnowledgeBaseHybridSettings(ApiModel):
     fts_weight: float
 
 
-class KnowledgeBaseSettings(BaseModel):
+class KnowledgeBaseSettings(ApiModel):
     ingestion: KnowledgeBaseIngestion
     retrieval: KnowledgeBaseRetrieval
 
 
-class KBConfigV3(BaseModel):
+class KBConfigV3(ApiModel):
     embedding_model: list[str] = Field(
         default=["vertexai/text-multilingual-embedding-002"],
         min_length=1,
@@ -116,7 +112,7 @@ class KBConfigV3(BaseModel):
     csv_row_as_document: bool = True
 
 
-class KnowledgeBaseDocument(BaseModel):
+class KnowledgeBaseDocument(ApiModel):
     id: str
     name: str
     prefix: str
@@ -128,7 +124,7 @@ class KnowledgeBaseDocument(BaseModel):
     error: dict | None = None
 
 
-class DocumentResult(BaseModel):
+class DocumentResult(ApiModel):
     id: str
     created_at: str
     updated_at: str
@@ -146,21 +142,21 @@ class DocumentResult(BaseModel):
     m_source_metadata: dict | None = None
 
 
-class SearchResult(BaseModel):
+class SearchResult(ApiModel):
     score: float
     content: str
     source: str | None = None
     document_source: DocumentResult
 
 
-class CreateDocument(BaseModel):
+class CreateDocument(ApiModel):
     name: str
     prefix: str = "/"
     status: str = "uploaded"
     # source_type: str = "document"
 
 
-class UpdateDocument(BaseModel):
+class UpdateDocument(ApiModel):
     prefix: str | None = None
     status: DocumentStatus | None = None
 
@@ -266,31 +262,20 @@ class KnowledgeBase(BaseResource):
         return KnowledgeBaseDocument(**response)
 
     def upload_document(
-        self, files: builtins.list[str | Path], prefix: str = "/"
+        self, files: builtins.list[UploadSource], prefix: str = "/"
     ) -> builtins.list[RunID]:
-        files_list: builtins.list[HttpxFile] = []
-        for file in files:
-            with open(str(file), "rb") as f:
-                files_list.append(("files", (Path(file).name, f.read(), None)))
-
         return self.client.post(
             f"/v1/knowledge-bases/{self.id}/upload_train",
-            files=files_list,
+            files=MultipartUpload.from_files("files", files),
             params={"prefix": prefix},
         )
 
     async def aupload_document(
-        self, files: builtins.list[str | Path], prefix: str = "/"
+        self, files: builtins.list[UploadSource], prefix: str = "/"
     ) -> builtins.list[RunID]:
-        files_list: builtins.list[HttpxFile] = []
-        for file in files:
-            async with aiofiles.open(str(file), "rb") as f:
-                content = await f.read()
-                files_list.append(("files", (Path(file).name, content, None)))
-
         return await self.client.apost(
             f"/v1/knowledge-bases/{self.id}/upload_train",
-            files=files_list,
+            files=MultipartUpload.from_files("files", files),
             params={"prefix": prefix},
         )
 
@@ -366,6 +351,22 @@ class KnowledgeBase(BaseResource):
         )
         return [KnowledgeBaseDocument(**doc) for doc in response["items"]]
 
+    def iter_documents(
+        self, status: DocumentStatus, page_size: int = 100
+    ) -> Iterator[KnowledgeBaseDocument]:
+        return self.client.knowledge_bases.iter_documents(self.id, status, page_size)
+
+    def aiter_documents(
+        self,
+        status: DocumentStatus,
+        page_size: int = 100,
+        concurrency: int = 1,
+        ordered: bool = True,
+    ) -> AsyncIterator[KnowledgeBaseDocument]:
+        return self.client.knowledge_bases.aiter_documents(
+            self.id, status, page_size, concurrency, ordered
+        )
+
 
 class KnowledgeBaseService(BaseService[KnowledgeBase]):
     def list(self, page: int = 1, page_size: int = 10) -> builtins.list[KnowledgeBase]:
@@ -394,6 +395,26 @@ class KnowledgeBaseService(BaseService[KnowledgeBase]):
             for knowledge_base in knowledge_bases
         ]
 
+    def iter_all(self, page_size: int = 100) -> Iterator[KnowledgeBase]:
+        for page in self.client.iter_pages("/v1/knowledge-bases", page_size=page_size):
+            for knowledge_base in page:
+                yield KnowledgeBase(client=self.client, **knowledge_base)
+
+    async def aiter_all(
+        self,
+        page_size: int = 100,
+        concurrency: int = 1,
+        ordered: bool = True,
+    ) -> AsyncIterator[KnowledgeBase]:
+        async for page in self.client.aiter_pages(
+            "/v1/knowledge-bases",
+            page_size=page_size,
+            concurrency=concurrency,
+            ordered=ordered,
+        ):
+            for knowledge_base in page:
+                yield KnowledgeBase(client=self.client, **knowledge_base)
+
     def get(self, knowledge_base_id: str) -> KnowledgeBase:
         knowledge_base = self.client.get(f"/v1/knowledge-bases/{knowledge_base_id}")
         return KnowledgeBase(client=self.client, **knowledge_base)
@@ -573,6 +594,35 @@ class KnowledgeBaseService(BaseService[KnowledgeBase]):
         )
         return [KnowledgeBaseDocument(**doc) for doc in response]
 
+    def iter_documents(
+        self, knowledge_base_id: str, status: DocumentStatus, page_size: int = 100
+    ) -> Iterator[KnowledgeBaseDocument]:
+        for page in self.client.iter_pages(
+            f"/v1/knowledge-bases/{knowledge_base_id}/documents/{status}",
+            params={"status": status},
+            page_size=page_size,
+        ):
+            for doc in page:
+                yield KnowledgeBaseDocument(**doc)
+
+    async def aiter_documents(
+        self,
+        knowledge_base_id: str,
+        status: DocumentStatus,
+        page_size: int = 100,
+        concurrency: int = 1,
+        ordered: bool = True,
+    ) -> AsyncIterator[KnowledgeBaseDocument]:
+        async for page in self.client.aiter_pages(
+            f"/v1/knowledge-bases/{knowledge_base_id}/documents/{status}",
+            params={"status": status},
+            page_size=page_size,
+            concurrency=concurrency,
+            ordered=ordered,
+        ):
+            for doc in page:
+                yield KnowledgeBaseDocument(**doc)
+
     def create_document(
         self, knowledge_base_id: str, document: CreateDocument
     ) -> KnowledgeBaseDocument:
@@ -612,34 +662,23 @@ class KnowledgeBaseService(BaseService[KnowledgeBase]):
     def upload_document(
         self,
         knowledge_base_id: str,
-        files: builtins.list[str | Path],
+        files: builtins.list[UploadSource],
         prefix: str = "/",
     ) -> builtins.list[RunID]:
-        files_list: builtins.list[HttpxFile] = []
-        for file in files:
-            with open(str(file), "rb") as f:
-                files_list.append(("files", (Path(file).name, f.read(), None)))
-
         return self.client.post(
             f"/v1/knowledge-bases/{knowledge_base_id}/upload_train",
-            files=files_list,
+            files=MultipartUpload.from_files("files", files),
             params={"prefix": prefix},
         )
 
     async def aupload_document(
         self,
         knowledge_base_id: str,
-        files: builtins.list[str | Path],
+        files: builtins.list[UploadSource],
         prefix: str = "/",
     ) -> builtins.list[RunID]:
-        files_list: builtins.list[HttpxFile] = []
-        for file in files:
-            async with aiofiles.open(str(file), "rb") as f:
-                content = await f.read()
-                files_list.append(("files", (Path(file).name, content, None)))
-
         return await self.client.apost(
             f"/v1/knowledge-bases/{knowledge_base_id}/upload_train",
-            files=files_list,
+            files=MultipartUpload.from_files("files", files),
             params={"prefix": prefix},
         )
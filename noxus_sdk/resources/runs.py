@@ -1,9 +1,11 @@
 import asyncio
 import builtins
 import time
+from collections.abc import AsyncIterator, Iterator
 
 from pydantic import BaseModel, ConfigDict
 
+from noxus_sdk.deadlines import deadline_scope
 from noxus_sdk.resources.base import BaseResource, BaseService
 
 
@@ -43,10 +45,27 @@ class Run(BaseResource):
                 setattr(self, key, value)
         return self
 
-    def wait(self, interval: int = 5, output_only: bool = False):
-        while self.status not in ["failed", "completed", "awaiting_human_feedback"]:
-            time.sleep(interval)
-            self.refresh()
+    def wait(
+        self, interval: int = 5, output_only: bool = False, timeout: float | None = None
+    ):
+        with (
+            deadline_scope(timeout) as deadline,
+            self.client.span("Run.wait", {"run.id": self.id}) as span,
+        ):
+            polls = 0
+            while self.status not in ["failed", "completed", "awaiting_human_feedback"]:
+                with self.client.span("Run.wait.poll", {"poll.iteration": polls}):
+                    time.sleep(
+                        interval
+                        if deadline is None
+                        else min(interval, deadline.remaining())
+                    )
+                    if deadline is not None:
+                        deadline.check()
+                    self.refresh()
+                polls += 1
+            span.set_attribute("run.status", self.status)
+            span.set_attribute("poll.count", polls)
 
         if self.status == "failed":
             raise RunFailure(self.status)
@@ -55,10 +74,27 @@ class Run(BaseResource):
             return self.output
         return self
 
-    async def a_wait(self, interval: int = 5, output_only: bool = False):
-        while self.status not in ["failed", "completed", "awaiting_human_feedback"]:
-            await asyncio.sleep(interval)
-            await self.arefresh()
+    async def a_wait(
+        self, interval: int = 5, output_only: bool = False, timeout: float | None = None
+    ):
+        with (
+            deadline_scope(timeout) as deadline,
+            self.client.span("Run.wait", {"run.id": self.id}) as span,
+        ):
+            polls = 0
+            while self.status not in ["failed", "completed", "awaiting_human_feedback"]:
+                with self.client.span("Run.wait.poll", {"poll.iteration": polls}):
+                    await asyncio.sleep(
+                        interval
+                        if deadline is None
+                        else min(interval, deadline.remaining())
+                    )
+                    if deadline is not None:
+                        deadline.check()
+                    await self.arefresh()
+                polls += 1
+            span.set_attribute("run.status", self.status)
+            span.set_attribute("poll.count", polls)
 
         if self.status == "failed":
             raise RunFailure(self.status)
@@ -87,6 +123,29 @@ class RunService(BaseService[Run]):
         )
         return [Run(client=self.client, **run) for run in response]
 
+    def iter_all(self, workflow_id: str, page_size: int = 100) -> Iterator[Run]:
+        for page in self.client.iter_pages(
+            f"/v1/workflows/{workflow_id}/runs", page_size=page_size
+        ):
+            for run in page:
+                yield Run(client=self.client, **run)
+
+    async def aiter_all(
+        self,
+        workflow_id: str,
+        page_size: int = 100,
+        concurrency: int = 1,
+        ordered: bool = True,
+    ) -> AsyncIterator[Run]:
+        async for page in self.client.aiter_pages(
+            f"/v1/workflows/{workflow_id}/runs",
+            page_size=page_size,
+            concurrency=concurrency,
+            ordered=ordered,
+        ):
+            for run in page:
+                yield Run(client=self.client, **run)
+
     async def alist(
         self, workflow_id: str, page: int = 1, page_size: int = 10
     ) -> builtins.list[Run]:
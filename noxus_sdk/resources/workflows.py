@@ -1,3 +1,4 @@
+from collections.abc import AsyncIterator, Iterator
 from datetime import datetime
 from uuid import UUID
 from builtins import list as List  # noqa
@@ -43,6 +44,29 @@ class WorkflowService(BaseService[WorkflowDefinition]):
             for data in workflows_data
         ]
 
+    def iter_all(self, page_size: int = 100) -> Iterator[WorkflowDefinition]:
+        for page in self.client.iter_pages(
+            "/v1/workflows", params={"type": "flow"}, page_size=page_size
+        ):
+            for data in page:
+                yield WorkflowDefinition.model_validate({"client": self.client, **data})
+
+    async def aiter_all(
+        self,
+        page_size: int = 100,
+        concurrency: int = 1,
+        ordered: bool = True,
+    ) -> AsyncIterator[WorkflowDefinition]:
+        async for page in self.client.aiter_pages(
+            "/v1/workflows",
+            params={"type": "flow"},
+            page_size=page_size,
+            concurrency=concurrency,
+            ordered=ordered,
+        ):
+            for data in page:
+                yield WorkflowDefinition.model_validate({"client": self.client, **data})
+
     def delete(self, workflow_id: str):
         self.client.delete(f"/v1/workflows/{workflow_id}")
 
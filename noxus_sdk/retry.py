@@ -0,0 +1,166 @@
+import random
+import threading
+import time
+from email.utils import parsedate_to_datetime
+
+import httpx
+
+REMAINING_HEADERS = ("ratelimit-remaining", "x-ratelimit-remaining")
+RESET_HEADERS = ("ratelimit-reset", "x-ratelimit-reset")
+
+
+def _header_float(response: httpx.Response, names: tuple[str, ...]) -> float | None:
+    for name in names:
+        value = response.headers.get(name)
+        if value is None:
+            continue
+        try:
+            return float(value)
+        except ValueError:
+            continue
+    return None
+
+
+def parse_retry_after(response: httpx.Response) -> float | None:
+    """Seconds to wait according to ``Retry-After`` (delta-seconds or HTTP date)."""
+    value = response.headers.get("retry-after")
+    if value is None:
+        return None
+    try:
+        return max(0.0, float(value))
+    except ValueError:
+        pass
+    try:
+        return max(0.0, parsedate_to_datetime(value).timestamp() - time.time())
+    except (TypeError, ValueError):
+        return None
+
+
+def parse_reset(response: httpx.Response) -> float | None:
+    """Seconds until the rate limit window resets.
+
+    Accepts both delta-seconds and epoch timestamps, which is how the
+    ``X-RateLimit-Reset`` header is commonly sent.
+    """
+    reset = _header_float(response, RESET_HEADERS)
+    if reset is None:
+        return None
+    if reset > 1_000_000_000:
+        reset -= time.time()
+    return max(0.0, reset)
+
+
+class ThrottleStats:
+    """Counters for time spent waiting on the backend rate limiter."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.throttled_requests = 0
+        self.throttle_responses = 0
+        self.paced_requests = 0
+        self.total_wait = 0.0
+
+    def record_throttle(self, delay: float, first: bool) -> None:
+        with self._lock:
+            self.throttle_responses += 1
+            if first:
+                self.throttled_requests += 1
+            self.total_wait += delay
+
+    def record_pacing(self, delay: float) -> None:
+        with self._lock:
+            self.paced_requests += 1
+            self.total_wait += delay
+
+    def snapshot(self) -> dict:
+        with self._lock:
+            return {
+                "throttled_requests": self.throttled_requests,
+                "throttle_responses": self.throttle_responses,
+                "paced_requests": self.paced_requests,
+                "total_wait": self.total_wait,
+            }
+
+    def reset(self) -> None:
+        with self._lock:
+            self.throttled_requests = 0
+            self.throttle_responses = 0
+            self.paced_requests = 0
+            self.total_wait = 0.0
+
+
+class RetryPolicy:
+    """Decides how long to wait after a 429 and when to give up.
+
+    Delays grow exponentially from ``base_delay`` up to ``max_delay`` with full
+    jitter. A ``Retry-After`` (or rate-limit reset) header sets a floor on the
+    delay, plus up to ``jitter`` of it so workers do not wake in lockstep; pacing
+    delays get the same jitter. Retrying stops once ``max_retries`` attempts or
+    ``max_total_delay`` seconds of waiting have been spent, or straight away
+    when the server asks for a longer wait than the budget has left, after
+    which the 429 is raised as ``httpx.HTTPStatusError``.
+
+    Once a response reports fewer than ``pace_below`` requests left in the
+    rate-limit window, the remaining ones are spread evenly until it resets
+    instead of being spent at once and answered with 429s.
+
+    Subclass and override :meth:`retry_delay` / :meth:`pacing_delay` to plug in
+    a different strategy.
+    """
+
+    retry_statuses: frozenset[int] = frozenset({429})
+
+    def __init__(
+        self,
+        max_retries: int | None = None,
+        max_total_delay: float | None = 300.0,
+        base_delay: float = 0.5,
+        max_delay: float = 30.0,
+        jitter: float = 0.1,
+        pace_below: int = 10,
+    ):
+        self.max_retries = max_retries
+        self.max_total_delay = max_total_delay
+        self.base_delay = base_delay
+        self.max_delay = max_delay
+        self.jitter = jitter
+        self.pace_below = pace_below
+
+    def should_retry(self, response: httpx.Response) -> bool:
+        return response.status_code in self.retry_statuses
+
+    def backoff(self, attempt: int) -> float:
+        return random.uniform(0, min(self.max_delay, self.base_delay * 2**attempt))
+
+    def retry_delay(
+        self, response: httpx.Response, attempt: int, waited: float
+    ) -> float | None:
+        """Seconds to sleep before retry number ``attempt`` (0-based), or None."""
+        if self.max_retries is not None and attempt >= self.max_retries:
+            return None
+        retry_after = parse_retry_after(response)
+        if retry_after is None:
+            retry_after = parse_reset(response)
+        delay = self.backoff(attempt)
+        if retry_after is not None:
+            delay = max(
+                delay, retry_after + random.uniform(0, retry_after * self.jitter)
+            )
+        if self.max_total_delay is not None:
+            left = self.max_total_delay - waited
+            if left <= 0 or (retry_after is not None and retry_after > left):
+                # Retrying any sooner would only be throttled again
+                return None
+            delay = min(delay, left)
+        return delay
+
+    def pacing_delay(self, response: httpx.Response) -> float:
+        """Seconds to hold off the next request when the quota is nearly spent."""
+        remaining = _header_float(response, REMAINING_HEADERS)
+        if remaining is None or remaining >= self.pace_below:
+            return 0.0
+        reset = parse_reset(response)
+        if reset is None:
+            return 0.0
+        delay = min(self.max_delay, reset / (max(remaining, 0) + 1))
+        return delay + random.uniform(0, delay * self.jitter)
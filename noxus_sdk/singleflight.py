@@ -0,0 +1,70 @@
+import asyncio
+import threading
+from collections.abc import Awaitable, Callable, Hashable
+from typing import Any, Generic, TypeVar
+
+T = TypeVar("T")
+
+
+class _Call:
+    __slots__ = ("done", "error", "result")
+
+    def __init__(self) -> None:
+        self.done = threading.Event()
+        self.result: Any = None
+        self.error: BaseException | None = None
+
+
+class SingleFlight(Generic[T]):
+    """Collapses concurrent calls with the same key into one execution.
+
+    The first caller for a key runs the function; every caller that arrives
+    while it is still running gets the same result (or exception). Threads and
+    coroutines are tracked separately, coroutines per event loop.
+    """
+
+    def __init__(self) -> None:
+        self._lock = threading.Lock()
+        self._calls: dict[Hashable, _Call] = {}
+        self._tasks: dict[Hashable, asyncio.Task] = {}
+        self.deduplicated = 0
+
+    def do(self, key: Hashable, fn: Callable[[], T]) -> T:
+        with self._lock:
+            call = self._calls.get(key)
+            leader = call is None
+            if call is None:
+                call = self._calls[key] = _Call()
+            else:
+                self.deduplicated += 1
+        if not leader:
+            call.done.wait()
+            if call.error is not None:
+                raise call.error
+            return call.result
+        try:
+            call.result = fn()
+            return call.result
+        except BaseException as e:
+            call.error = e
+            raise
+        finally:
+            with self._lock:
+                del self._calls[key]
+            call.done.set()
+
+    async def ado(self, key: Hashable, fn: Callable[[], Awaitable[T]]) -> T:
+        loop_key = (id(asyncio.get_running_loop()), key)
+        with self._lock:
+            task = self._tasks.get(loop_key)
+            if task is not None:
+                self.deduplicated += 1
+            else:
+                task = self._tasks[loop_key] = asyncio.ensure_future(fn())
+                task.add_done_callback(lambda _: self._forget(loop_key))
+        # Shielded so that one caller giving up does not cancel the others
+        return await asyncio.shield(task)
+
+    def _forget(self, loop_key: Hashable) -> None:
+        with self._lock:
+            self._tasks.pop(loop_key, None)
@@ -0,0 +1,200 @@
+import json
+import os
+import threading
+import time
+from collections import deque
+from collections.abc import Iterator
+from contextlib import contextmanager
+from contextvars import ContextVar
+from pathlib import Path
+from typing import Any
+
+OK = "OK"
+ERROR = "ERROR"
+UNSET = "UNSET"
+
+
+class Span:
+    """A timed operation, modelled on the OpenTelemetry span."""
+
+    def __init__(
+        self,
+        tracer: "Tracer",
+        name: str,
+        trace_id: str,
+        parent_id: str | None = None,
+        attributes: dict[str, Any] | None = None,
+    ):
+        self.tracer = tracer
+        self.name = name
+        self.trace_id = trace_id
+        self.span_id = os.urandom(8).hex()
+        self.parent_id = parent_id
+        self.attributes: dict[str, Any] = dict(attributes or {})
+        self.events: list[dict[str, Any]] = []
+        self.status = UNSET
+        self.status_description: str | None = None
+        self.start_time = time.time_ns()
+        self.end_time: int | None = None
+
+    def set_attribute(self, key: str, value: Any) -> None:
+        self.attributes[key] = value
+
+    def add_event(self, name: str, attributes: dict[str, Any] | None = None) -> None:
+        self.events.append(
+            {"name": name, "time": time.time_ns(), "attributes": attributes or {}}
+        )
+
+    def set_status(self, status: str, description: str | None = None) -> None:
+        self.status = status
+        self.status_description = description
+
+    def record_exception(self, exc: BaseException) -> None:
+        self.add_event(
+            "exception",
+            {"exception.type": type(exc).__name__, "exception.message": str(exc)},
+        )
+        self.set_status(ERROR, str(exc))
+
+    @property
+    def duration(self) -> float | None:
+        if self.end_time is None:
+            return None
+        return (self.end_time - self.start_time) / 1e9
+
+    def end(self) -> None:
+        if self.end_time is not None:
+            return
+        self.end_time = time.time_ns()
+        self.tracer.exporter.export(self)
+
+    def to_dict(self) -> dict[str, Any]:
+        return {
+            "name": self.name,
+            "trace_id": self.trace_id,
+            "span_id": self.span_id,
+            "parent_span_id": self.parent_id,
+            "start_time_unix_nano": self.start_time,
+            "end_time_unix_nano": self.end_time,
+            "attributes": self.attributes,
+            "events": self.events,
+            "status": {"code": self.status, "description": self.status_description},
+        }
+
+
+class _NoopSpan:
+    def set_attribute(self, key: str, value: Any) -> None:
+        pass
+
+    def add_event(self, name: str, attributes: dict[str, Any] | None = None) -> None:
+        pass
+
+    def set_status(self, status: str, description: str | None = None) -> None:
+        pass
+
+    def record_exception(self, exc: BaseException) -> None:
+        pass
+
+    def end(self) -> None:
+        pass
+
+
+NOOP_SPAN: Any = _NoopSpan()
+
+
+class SpanExporter:
+    """Receives every span when it ends. Subclass to send spans elsewhere."""
+
+    def export(self, span: Span) -> None:
+        raise NotImplementedError
+
+    def shutdown(self) -> None:
+        pass
+
+
+class InMemorySpanExporter(SpanExporter):
+    """Keeps the last ``max_spans`` finished spans."""
+
+    def __init__(self, max_spans: int = 10_000):
+        self._spans: deque[Span] = deque(maxlen=max_spans)
+
+    def export(self, span: Span) -> None:
+        self._spans.append(span)
+
+    def get_finished_spans(self) -> list[Span]:
+        return list(self._spans)
+
+    def clear(self) -> None:
+        self._spans.clear()
+
+
+class JsonlSpanExporter(SpanExporter):
+    """Appends each finished span to a file as one JSON object per line."""
+
+    def __init__(self, path: str | Path):
+        self.path = Path(path)
+        self._lock = threading.Lock()
+        self._file = open(self.path, "a", encoding="utf-8")
+
+    def export(self, span: Span) -> None:
+        line = json.dumps(span.to_dict(), default=str)
+        with self._lock:
+            self._file.write(line + "\n")
+            self._file.flush()
+
+    def shutdown(self) -> None:
+        with self._lock:
+            self._file.close()
+
+
+_current_span: ContextVar[Span | None] = ContextVar("noxus_span", default=None)
+
+
+def current_span() -> Span | None:
+    return _current_span.get()
+
+
+class Tracer:
+    """Creates spans for SDK operations, HTTP attempts and polling loops.
+
+    Pass one to ``Client(tracer=...)``. Spans nest through a context variable,
+    so calls made inside ``tracer.start_as_current_span(...)`` become its
+    children.
+
+        tracer = Tracer(JsonlSpanExporter("spans.jsonl"))
+        client = Client(api_key, tracer=tracer)
+    """
+
+    def __init__(self, exporter: SpanExporter | None = None):
+        self.exporter = exporter or InMemorySpanExporter()
+
+    def start_span(
+        self,
+        name: str,
+        attributes: dict[str, Any] | None = None,
+        parent: Span | None = None,
+    ) -> Span:
+        parent = parent or _current_span.get()
+        if parent is None:
+            return Span(self, name, os.urandom(16).hex(), None, attributes)
+        return Span(self, name, parent.trace_id, parent.span_id, attributes)
+
+    @contextmanager
+    def use_span(self, span: Span, end_on_exit: bool = False) -> Iterator[Span]:
+        token = _current_span.set(span)
+        try:
+            yield span
+        except BaseException as e:
+            span.record_exception(e)
+            raise
+        finally:
+            _current_span.reset(token)
+            if end_on_exit:
+                span.end()
+
+    @contextmanager
+    def start_as_current_span(
+        self, name: str, attributes: dict[str, Any] | None = None
+    ) -> Iterator[Span]:
+        with self.use_span(self.start_span(name, attributes), end_on_exit=True) as s:
+            yield s
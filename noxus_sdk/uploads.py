@@ -0,0 +1,215 @@
+import asyncio
+import io
+import mimetypes
+import os
+import uuid
+from collections.abc import AsyncIterator, Iterator
+from pathlib import Path
+from typing import Any, BinaryIO
+
+import aiofiles
+
+CHUNK_SIZE = 64 * 1024
+
+UploadSource = str | Path | BinaryIO | Any
+
+_FORM_ESCAPES = {ord('"'): "%22", ord("\\"): "\\\\"}
+_FORM_ESCAPES.update({c: f"%{c:02X}" for c in range(0x20) if c != 0x1B})
+
+
+def _is_async_file(source: Any) -> bool:
+    return asyncio.iscoroutinefunction(getattr(source, "read", None))
+
+
+class UploadReplayError(Exception):
+    """Raised when a retried upload cannot rewind one of its file objects."""
+
+
+class UploadPart:
+    def __init__(
+        self,
+        field: str,
+        source: UploadSource,
+        filename: str | None = None,
+        content_type: str | None = None,
+    ):
+        self.field = field
+        if isinstance(source, bytes | bytearray | memoryview):
+            source = io.BytesIO(source)
+        self.source: Any = source
+        if filename is None:
+            name = (
+                source
+                if isinstance(source, str | Path)
+                else getattr(source, "name", None)
+            )
+            filename = Path(str(name)).name if name else "upload"
+        self.filename = filename
+        self.content_type = (
+            content_type
+            or mimetypes.guess_type(filename)[0]
+            or "application/octet-stream"
+        )
+        # File objects are rewound to where they started on every replay.
+        # Async files report their position on first use.
+        self._start: int | None = None
+        self._read = False
+        if not isinstance(source, str | Path) and not _is_async_file(source):
+            try:
+                self._start = source.tell()
+            except (AttributeError, OSError):
+                self._start = None
+
+    def replayable(self) -> bool:
+        if isinstance(self.source, str | Path) or not self._read:
+            return True
+        return self._start is not None
+
+    def _check_replay(self) -> None:
+        if not self.replayable():
+            raise UploadReplayError(
+                f"Cannot rewind {self.filename!r} to send the upload again"
+            )
+
+    def header(self, boundary: str) -> bytes:
+        field = self.field.translate(_FORM_ESCAPES)
+        filename = self.filename.translate(_FORM_ESCAPES)
+        return (
+            f"--{boundary}\r\n"
+            f'Content-Disposition: form-data; name="{field}"; filename="{filename}"\r\n'
+            f"Content-Type: {self.content_type}\r\n\r\n"
+        ).encode()
+
+    def size(self) -> int | None:
+        if isinstance(self.source, str | Path):
+            return os.path.getsize(self.source)
+        if self._start is None:
+            return None
+        try:
+            return os.fstat(self.source.fileno()).st_size - self._start
+        except (AttributeError, OSError, ValueError):
+            pass
+        try:
+            end = self.source.seek(0, os.SEEK_END)
+            self.source.seek(self._start)
+            return end - self._start
+        except (AttributeError, OSError):
+            return None
+
+    def iter_chunks(self, chunk_size: int) -> Iterator[bytes]:
+        if isinstance(self.source, str | Path):
+            with open(self.source, "rb") as f:
+                while chunk := f.read(chunk_size):
+                    yield chunk
+            return
+        self._check_replay()
+        if self._start is not None:
+            self.source.seek(self._start)
+        self._read = True
+        while chunk := self.source.read(chunk_size):
+            yield chunk
+
+    async def aiter_chunks(self, chunk_size: int) -> AsyncIterator[bytes]:
+        if isinstance(self.source, str | Path):
+            async with aiofiles.open(self.source, "rb") as f:
+                while chunk := await f.read(chunk_size):
+                    yield chunk
+            return
+        self._check_replay()
+        if _is_async_file(self.source):
+            if not self._read:
+                try:
+                    self._start = await self.source.tell()
+                except (AttributeError, OSError, ValueError):
+                    self._start = None
+            else:
+                await self.source.seek(self._start)
+            self._read = True
+            while chunk := await self.source.read(chunk_size):
+                yield chunk
+            return
+        if self._start is not None:
+            self.source.seek(self._start)
+        self._read = True
+        while chunk := await asyncio.to_thread(self.source.read, chunk_size):
+            yield chunk
+
+
+class _SyncStream:
+    def __init__(self, upload: "MultipartUpload"):
+        self.upload = upload
+
+    def __iter__(self) -> Iterator[bytes]:
+        return self.upload.iter_bytes()
+
+
+class _AsyncStream:
+    def __init__(self, upload: "MultipartUpload"):
+        self.upload = upload
+
+    def __aiter__(self) -> AsyncIterator[bytes]:
+        return self.upload.aiter_bytes()
+
+
+class MultipartUpload:
+    """A ``multipart/form-data`` body streamed from files in bounded chunks.
+
+    Parts can be paths, binary file objects or async file objects (such as
+    those returned by ``aiofiles.open``). Only ``chunk_size`` bytes of file data
+    are held in memory at a time, and the body can be replayed (files are
+    reopened or rewound) when a request is retried after a 429. A request
+    whose files cannot be rewound is not retried.
+    """
+
+    def __init__(self, parts: list[UploadPart], chunk_size: int = CHUNK_SIZE):
+        self.parts = parts
+        self.chunk_size = chunk_size
+        self.boundary = uuid.uuid4().hex
+        self._trailer = f"--{self.boundary}--\r\n".encode()
+
+    @classmethod
+    def from_files(
+        cls, field: str, sources: list[UploadSource], chunk_size: int = CHUNK_SIZE
+    ) -> "MultipartUpload":
+        return cls([UploadPart(field, source) for source in sources], chunk_size)
+
+    def replayable(self) -> bool:
+        """Whether the body can be sent again, e.g. after a 429."""
+        return all(part.replayable() for part in self.parts)
+
+    def content_length(self) -> int | None:
+        total = len(self._trailer)
+        for part in self.parts:
+            size = part.size()
+            if size is None:
+                return None
+            total += len(part.header(self.boundary)) + size + 2
+        return total
+
+    def headers(self) -> dict[str, str]:
+        headers = {"Content-Type": f"multipart/form-data; boundary={self.boundary}"}
+        length = self.content_length()
+        if length is not None:
+            headers["Content-Length"] = str(length)
+        return headers
+
+    def iter_bytes(self) -> Iterator[bytes]:
+        for part in self.parts:
+            yield part.header(self.boundary)
+            yield from part.iter_chunks(self.chunk_size)
+            yield b"\r\n"
+        yield self._trailer
+
+    async def aiter_bytes(self) -> AsyncIterator[bytes]:
+        for part in self.parts:
+            yield part.header(self.boundary)
+            async for chunk in part.aiter_chunks(self.chunk_size):
+                yield chunk
+            yield b"\r\n"
+        yield self._trailer
+
+    def stream(self) -> _SyncStream:
+        return _SyncStream(self)
+
+    def astream(self) -> _AsyncStream:
+        return _AsyncStream(self)
@@ -1,6 +1,7 @@
 from noxus_sdk.workflows.workflow import (
     WorkflowDefinition,
     load_node_types,
+    NodeRegistry,
     ConfigError,
 )
 from noxus_sdk.workflows.agentflow import AgentFlowDefinition
@@ -1,5 +1,10 @@
+import contextlib
+import copy
 import enum
+import functools
 import uuid
+from collections.abc import Iterable, Iterator, Mapping
+from contextvars import ContextVar
 from typing import TYPE_CHECKING, Any
 
 from pydantic import BaseModel, Field, TypeAdapter, model_validator
@@ -88,6 +93,8 @@ class DataType(str, enum.Enum):
 
 
 class ConfigDefinition(BaseModel):
+    model_config = ConfigDict(defer_build=True)
+
     type: DataType
     description: str | None
     visible: bool
@@ -109,6 +116,8 @@ class ConfigDefinition(BaseModel):
 
 
 class NodeDefinition(BaseModel):
+    model_config = ConfigDict(defer_build=True)
+
     type: str
     title: str
     description: str
@@ -121,16 +130,91 @@ class NodeDefinition(BaseModel):
     config_endpoint: str | None
 
 
-NODE_TYPES: dict[str, NodeDefinition] = {}
+class NodeRegistry(Mapping[str, NodeDefinition]):
+    """Node definitions of one catalog, indexed by type.
+
+    Registries are never modified: a refresh builds a new one and swaps the
+    reference, so a concurrent reader sees either the old or the new catalog.
+    Only the module-level ``NODE_TYPES`` has its index swapped in place.
+    """
+
+    __slots__ = ("_types",)
+
+    def __init__(self, definitions: Iterable[NodeDefinition] = ()):
+        self._types = {node.type: node for node in definitions}
+
+    def __getitem__(self, node_type: str) -> NodeDefinition:
+        return self._types[node_type]
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(self._types)
+
+    def __len__(self) -> int:
+        return len(self._types)
+
+    def __repr__(self) -> str:
+        return f"{self.__class__.__name__}({len(self)} node types)"
+
+
+# Catalog of the last client that loaded one, for workflows without a client
+NODE_TYPES = NodeRegistry()
+
+# Registry of the client whose workflow is being validated
+_active_node_types: ContextVar[NodeRegistry | None] = ContextVar(
+    "noxus_node_types", default=None
+)
+
+
+def client_node_types(client: Client | None) -> NodeRegistry:
+    node_types = getattr(client, "node_types", None)
+    return node_types if node_types is not None else NODE_TYPES
+
 
+@contextlib.contextmanager
+def _using_node_types(client: Client | None):
+    token = _active_node_types.set(client_node_types(client))
+    try:
+        yield
+    finally:
+        _active_node_types.reset(token)
 
-def load_node_types(nodes_: list[dict]):
-    NODE_TYPES.clear()
-    nodes: list[NodeDefinition] = TypeAdapter(list[NodeDefinition]).validate_python(
-        nodes_
-    )
-    for node in nodes:
-        NODE_TYPES[node.type] = node
+
+@functools.cache
+def _node_list_adapter() -> TypeAdapter[list[NodeDefinition]]:
+    # Built once: with deferred model schemas a fresh adapter rebuilds them
+    return TypeAdapter(list[NodeDefinition])
+
+
+def node_definitions(nodes: list[dict], validate: bool = True) -> list[NodeDefinition]:
+    if validate:
+        return _node_list_adapter().validate_python(nodes)
+    # For catalogs that were validated when fetched (see ``NodeCatalogCache``)
+    return [
+        NodeDefinition.model_construct(
+            **{
+                **node,
+                "config": {
+                    key: ConfigDefinition.model_construct(
+                        **{**config, "type": DataType(config["type"])}
+                    )
+                    for key, config in node["config"].items()
+                },
+            }
+        )
+        for node in nodes
+    ]
+
+
+def load_node_types(
+    nodes_: list[dict], definitions: list[NodeDefinition] | None = None
+) -> NodeRegistry:
+    """Build a registry for ``nodes_`` and make it the catalog of ``NODE_TYPES``."""
+    if definitions is None:
+        definitions = node_definitions(nodes_)
+    node_types = NodeRegistry(definitions)
+    # Swapped in place, so modules that imported NODE_TYPES see the new catalog
+    NODE_TYPES._types = node_types._types
+    return node_types
 
 
 class ConnectorType(str, enum.Enum):
@@ -145,6 +229,8 @@ class ConnectorType(str, enum.Enum):
 
 
 class NodeInput(BaseModel):
+    model_config = ConfigDict(defer_build=True)
+
     node_id: str
     name: str
     fixed_value: Any = None
@@ -156,6 +242,8 @@ class NodeInput(BaseModel):
 
 
 class EdgePoint(BaseModel):
+    model_config = ConfigDict(defer_build=True)
+
     node_id: str
     connector_name: str
     key: str | None = None
@@ -163,12 +251,16 @@ class EdgePoint(BaseModel):
 
 
 class Edge(BaseModel):
+    model_config = ConfigDict(defer_build=True)
+
     from_id: EdgePoint
     to_id: EdgePoint
     id: str | None = None
 
 
 class NodeOutput(BaseModel):
+    model_config = ConfigDict(defer_build=True)
+
     node_id: str
     name: str
     type: ConnectorType
@@ -179,6 +271,8 @@ class NodeOutput(BaseModel):
 
 
 class Node(BaseModel):
+    model_config = ConfigDict(defer_build=True)
+
     type: str
     id: str
     name: str = ""
@@ -290,8 +384,12 @@ class Node(BaseModel):
             )
         return EdgePoint(node_id=output.node_id, connector_name=output.name, key=None)
 
-    def create(self, x: int, y: int) -> "Node":
-        node_type = NODE_TYPES.get(self.type)
+    def create(self, x: int, y: int, node_types: NodeRegistry | None = None) -> "Node":
+        if node_types is None:
+            node_types = _active_node_types.get()
+            if node_types is None:
+                node_types = NODE_TYPES
+        node_type = node_types.get(self.type)
         assert node_type, f"Node type {self.type} not found"
         self.config_definition = node_type.config
         self.inputs = [
@@ -303,9 +401,10 @@ class Node(BaseModel):
             for output in node_type.outputs
         ]
         if not self.connector_config:
+            # input() and output() add keys and type definitions to these
             self.connector_config = {
-                "inputs": node_type.inputs,
-                "outputs": node_type.outputs,
+                "inputs": copy.deepcopy(node_type.inputs),
+                "outputs": copy.deepcopy(node_type.outputs),
             }
         self.name = node_type.title
         self.display = {"position": {"x": x, "y": y}}
@@ -334,7 +433,7 @@ class Node(BaseModel):
 
 
 class WorkflowDefinition(BaseModel):
-    model_config = ConfigDict(arbitrary_types_allowed=True)
+    model_config = ConfigDict(defer_build=True, arbitrary_types_allowed=True)
     client: Client | None = Field(default=None, exclude=True)
     id: str = ""
     group_id: str | None = Field(default=None, exclude=True)
@@ -345,6 +444,13 @@ class WorkflowDefinition(BaseModel):
     x: int = 0
     error_handler: uuid.UUID | None = None
 
+    @model_validator(mode="wrap")
+    @classmethod
+    def _with_client_node_types(cls, values, handler):
+        client = values.get("client") if isinstance(values, dict) else None
+        with _using_node_types(client):
+            return handler(values)
+
     @model_validator(mode="before")
     @classmethod
     def _definition_flattener(cls, values):
@@ -367,7 +473,8 @@ class WorkflowDefinition(BaseModel):
         return d
 
     def refresh_from_data(self, client: Client | None = None, **data):
-        n = self.__class__.model_validate(data)
+        with _using_node_types(client):
+            n = self.__class__.model_validate(data)
         for k in n.model_fields_set:
             v = getattr(n, k)
             setattr(self, k, v)
@@ -400,7 +507,11 @@ class WorkflowDefinition(BaseModel):
         if workflow_version_id:
             req["workflow_version_id"] = str(workflow_version_id)
 
-        response = self.client.post(url, req)
+        with self.client.span(
+            "WorkflowDefinition.run", {"workflow.id": self.id}
+        ) as span:
+            response = self.client.post(url, req)
+            span.set_attribute("run.id", response.get("id"))
         return Run(client=self.client, **response)
 
     async def arun(
@@ -413,7 +524,11 @@ class WorkflowDefinition(BaseModel):
         req: dict[str, Any] = {"input": body}
         if workflow_version_id:
             req["workflow_version_id"] = str(workflow_version_id)
-        response = await self.client.apost(f"/v1/workflows/{self.id}/runs", req)
+        with self.client.span(
+            "WorkflowDefinition.run", {"workflow.id": self.id}
+        ) as span:
+            response = await self.client.apost(f"/v1/workflows/{self.id}/runs", req)
+            span.set_attribute("run.id", response.get("id"))
         return Run(client=self.client, **response)
 
     def update(self, force: bool = False):
@@ -500,8 +615,8 @@ class WorkflowDefinition(BaseModel):
     def node(self, name) -> "Node":
         self.verify_name_legal(name)
         self.x += 350
-        n = Node(id=str(uuid.uuid4()), type=name)
-        n.create(x=self.x, y=0)
+        n = Node.model_construct(id=str(uuid.uuid4()), type=name)
+        n.create(x=self.x, y=0, node_types=client_node_types(self.client))
         self.nodes.append(n)
         return n
 
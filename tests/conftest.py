@@ -3,9 +3,11 @@ import tempfile
 import uuid
 from pathlib import Path
 
+import httpx
 import pytest
 from filelock import FileLock
 from noxus_sdk.client import Client
+from noxus_sdk.fake_backend import FakeBackend
 from noxus_sdk.resources.knowledge_bases import (
     KBConfigV3,
 )
@@ -16,8 +18,44 @@ def anyio_backend():
     return "asyncio"
 
 
+@pytest.fixture
+def make_client():
+    """Builds clients that send every request to ``handler`` in-process."""
+
+    def make(handler, **kwargs) -> Client:
+        return Client(
+            "test-key",
+            base_url="http://noxus.test",
+            load_nodes=False,
+            load_me=False,
+            transport=httpx.MockTransport(handler),
+            async_transport=httpx.MockTransport(handler),
+            **kwargs,
+        )
+
+    return make
+
+
+# NOXUS_FAKE_BACKEND=1 runs the integration tests against the in-process fake
+USE_FAKE_BACKEND = os.environ.get("NOXUS_FAKE_BACKEND") == "1"
+
+
+@pytest.fixture
+def fake_backend():
+    return FakeBackend()
+
+
 @pytest.fixture(scope="session")
-def workspace_client():
+def shared_fake_backend():
+    return FakeBackend(run_duration=1.0)
+
+
+@pytest.fixture(scope="session")
+def workspace_client(request: pytest.FixtureRequest):
+    if USE_FAKE_BACKEND:
+        yield request.getfixturevalue("shared_fake_backend").client()
+        return
+
     client = Client(
         os.environ.get("NOXUS_API_KEY", ""),
         base_url=os.environ.get("NOXUS_BASE_URL", "https://backend.noxus.ai"),
@@ -46,7 +84,9 @@ def api_key(workspace_client: Client):
 
 
 @pytest.fixture
-def client(api_key: str):
+def client(api_key: str, request: pytest.FixtureRequest):
+    if USE_FAKE_BACKEND:
+        return request.getfixturevalue("shared_fake_backend").client(api_key)
     return Client(
         api_key, base_url=os.environ.get("NOXUS_BASE_URL", "https://backend.noxus.ai")
     )
@@ -4,6 +4,7 @@ from uuid import uuid4
 import httpx
 import pytest
 from noxus_sdk.client import Client
+from noxus_sdk.fake_backend import FakeBackend
 from noxus_sdk.resources.conversations import (
     ConversationFile,
     ConversationSettings,
@@ -293,3 +294,16 @@ def test_invalid_creation_params(
 
     with pytest.raises(ValueError):
         client.conversations.create(name="Invalid")
+
+
+@pytest.mark.anyio
+async def test_fake_backend_conversation_events():
+    backend = FakeBackend(stream_interval=0.01)
+    settings = ConversationSettings(model=["gpt-4o"], temperature=0, tools=[])
+    async with backend.client() as client:
+        conversation = await client.conversations.acreate("chat", settings)
+        await conversation.aadd_message(MessageRequest(content="hello"))
+        events = [m async for m in conversation.aiter_messages()]
+    assert "".join(e.content or "" for e in events) == "You said: hello "
+    assert events[-1].type == "conversation_end"
+    assert len(conversation.messages) == 2
@@ -0,0 +1,131 @@
+import asyncio
+import io
+import time
+
+import httpx
+import pytest
+from noxus_sdk.retry import RetryPolicy
+from noxus_sdk.uploads import MultipartUpload
+
+
+def _file_handler(blob: bytes, ranges: bool = True):
+    def handler(request: httpx.Request) -> httpx.Response:
+        header = request.headers.get("range")
+        if not ranges or header is None:
+            return httpx.Response(200, content=blob)
+        assert request.headers["accept-encoding"] == "identity"
+        start, end = (int(x) for x in header.removeprefix("bytes=").split("-"))
+        if start >= len(blob):
+            return httpx.Response(
+                416, headers={"Content-Range": f"bytes */{len(blob)}"}
+            )
+        end = min(end, len(blob) - 1)
+        return httpx.Response(
+            206,
+            content=blob[start : end + 1],
+            headers={"Content-Range": f"bytes {start}-{end}/{len(blob)}"},
+        )
+
+    return handler
+
+
+@pytest.mark.parametrize("ranges", [True, False])
+def test_download_to_with_parallel_ranges(make_client, tmp_path, ranges: bool):
+    blob = bytes(range(256)) * 5
+    with make_client(_file_handler(blob, ranges)) as client:
+        target = client.files.download_to("f", tmp_path / "out", 4, part_size=100)
+        assert target.read_bytes() == blob
+        assert b"".join(client.files.iter_bytes("f", chunk_size=7)) == blob
+
+
+@pytest.mark.anyio
+async def test_download_empty_file_with_parallel_ranges(make_client, tmp_path):
+    async with make_client(_file_handler(b"")) as client:
+        target = client.files.download_to("f", tmp_path / "sync", 4)
+        assert target.read_bytes() == b""
+        target = await client.files.adownload_to("f", tmp_path / "async", 4)
+        assert target.read_bytes() == b""
+
+
+@pytest.mark.anyio
+async def test_adownload_to_with_parallel_ranges(make_client, tmp_path):
+    blob = bytes(range(256)) * 5
+    async with make_client(_file_handler(blob)) as client:
+        target = await client.files.adownload_to("f", tmp_path / "out", 3, 100)
+        assert target.read_bytes() == blob
+        chunks = [chunk async for chunk in client.files.aiter_bytes("f", 100)]
+        assert max(map(len, chunks)) == 100
+        assert b"".join(chunks) == blob
+
+
+@pytest.mark.anyio
+async def test_failed_part_stops_the_download_and_removes_the_file(
+    make_client, tmp_path
+):
+    blob = bytes(range(256)) * 5
+    serve = _file_handler(blob)
+    requested, finished = [], []
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        requested.append(request.headers["range"])
+        if request.headers["range"].startswith("bytes=200-"):
+            return httpx.Response(404, json={})
+        if not request.headers["range"].startswith("bytes=0-"):
+            time.sleep(0.2)
+        return serve(request)
+
+    async def ahandler(request: httpx.Request) -> httpx.Response:
+        requested.append(request.headers["range"])
+        if request.headers["range"].startswith("bytes=200-"):
+            return httpx.Response(404, json={})
+        if not request.headers["range"].startswith("bytes=0-"):
+            await asyncio.sleep(1)
+            finished.append(request.headers["range"])
+        return serve(request)
+
+    with make_client(handler) as client:
+        with pytest.raises(httpx.HTTPStatusError):
+            client.files.download_to("f", tmp_path / "sync", 3, part_size=100)
+    assert not (tmp_path / "sync").exists()
+    assert len(requested) < len(blob) // 100
+
+    requested.clear()
+    client = make_client(ahandler)
+    start = time.monotonic()
+    with pytest.raises(httpx.HTTPStatusError):
+        await client.files.adownload_to("f", tmp_path / "async", 3, part_size=100)
+    assert time.monotonic() - start < 0.5
+    assert not (tmp_path / "async").exists()
+    assert len(requested) < len(blob) // 100 and finished == []
+    await client.aclose()
+
+
+def test_upload_that_cannot_rewind_is_not_retried(make_client):
+    class Unseekable(io.RawIOBase):
+        name = "pipe.bin"
+
+        def __init__(self):
+            self.data = io.BytesIO(b"y" * 100)
+
+        def readable(self):
+            return True
+
+        def readinto(self, buffer):
+            return self.data.readinto(buffer)
+
+        def tell(self):
+            raise OSError("not seekable")
+
+    calls = []
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        request.read()
+        calls.append(len(request.content))
+        return httpx.Response(429, headers={"Retry-After": "0"})
+
+    with make_client(handler, retry_policy=RetryPolicy(base_delay=0)) as client:
+        with pytest.raises(httpx.HTTPStatusError):
+            client.post(
+                "/v1/file", files=MultipartUpload.from_files("file", [Unseekable()])
+            )
+    assert len(calls) == 1
@@ -5,12 +5,15 @@ from pathlib import Path
 import httpx
 import pytest
 from noxus_sdk.client import Client
+from noxus_sdk.fake_backend import FakeBackend
 from noxus_sdk.resources.knowledge_bases import (
     CreateDocument,
     KBConfigV3,
     KnowledgeBase,
     UpdateDocument,
 )
+from noxus_sdk.retry import RetryPolicy
+from noxus_sdk.uploads import MultipartUpload
 
 
 async def wait_for_documents(kb: KnowledgeBase, expected_count: int, timeout: int = 30):
@@ -130,3 +133,103 @@ async def test_kb_training(client: Client, test_file: Path):
     training_docs = await kb.alist_documents(status="training")
     uploaded_docs = await kb.alist_documents(status="uploaded")
     assert len(trained_docs) + len(training_docs) + len(uploaded_docs) == 1
+
+
+def _multipart_files(request: httpx.Request) -> list[tuple[str, bytes]]:
+    from email.parser import BytesParser
+
+    message = BytesParser().parsebytes(
+        b"Content-Type: "
+        + request.headers["content-type"].encode()
+        + b"\r\n\r\n"
+        + request.content
+    )
+    return [
+        (part.get_filename(), part.get_payload(decode=True))
+        for part in message.get_payload()
+    ]
+
+
+def test_streaming_upload_from_paths_and_file_objects(make_client, tmp_path):
+    big = tmp_path / "big.bin"
+    big.write_bytes(b"a" * 200_000)
+    received = []
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        request.read()
+        assert int(request.headers["content-length"]) == len(request.content)
+        received.append(_multipart_files(request))
+        return httpx.Response(200, json=["run-1"])
+
+    upload = MultipartUpload.from_files("files", [big], chunk_size=4096)
+    assert max(len(chunk) for chunk in upload.iter_bytes()) <= 4096
+
+    with make_client(handler) as client, open(big, "rb") as fd:
+        fd.read(10)
+        client.post("/v1/knowledge-bases/k/upload_train", files=upload)
+        client.post("/v1/file", files=MultipartUpload.from_files("file", [fd]))
+
+    assert received[0] == [("big.bin", b"a" * 200_000)]
+    assert received[1] == [("big.bin", b"a" * 199_990)]
+
+
+@pytest.mark.anyio
+async def test_async_streaming_upload_is_replayed_on_retry(make_client, tmp_path):
+    doc = tmp_path / "doc.txt"
+    doc.write_text("hello")
+    statuses = iter([429, 200])
+    received = []
+
+    async def handler(request: httpx.Request) -> httpx.Response:
+        await request.aread()
+        received.append(_multipart_files(request))
+        return httpx.Response(next(statuses), json=["run-1"])
+
+    async with make_client(handler, retry_policy=RetryPolicy(base_delay=0)) as client:
+        result = await client.apost(
+            "/v1/knowledge-bases/k/upload_train",
+            files=MultipartUpload.from_files("files", [doc, str(doc)]),
+        )
+    assert result == ["run-1"]
+    assert received == [[("doc.txt", b"hello"), ("doc.txt", b"hello")]] * 2
+
+
+@pytest.mark.anyio
+async def test_async_file_and_bytes_uploads_are_replayed_on_retry(
+    make_client, tmp_path
+):
+    aiofiles = pytest.importorskip("aiofiles")
+    doc = tmp_path / "doc.txt"
+    doc.write_bytes(b"x" * 1000)
+    statuses = iter([429, 200])
+    received = []
+
+    async def handler(request: httpx.Request) -> httpx.Response:
+        await request.aread()
+        received.append(_multipart_files(request))
+        return httpx.Response(next(statuses), json=["run-1"])
+
+    async with make_client(handler, retry_policy=RetryPolicy(base_delay=0)) as client:
+        async with aiofiles.open(doc, "rb") as f:
+            await f.read(10)
+            upload = MultipartUpload.from_files("files", [f, b"raw bytes"])
+            await client.apost("/v1/knowledge-bases/k/upload_train", files=upload)
+    expected = [("doc.txt", b"x" * 990), ("upload", b"raw bytes")]
+    assert received == [expected, expected]
+
+
+def test_fake_backend_knowledge_base_and_files(tmp_path):
+    document = tmp_path / "notes.txt"
+    document.write_text("the quick brown fox jumps over the quick dog")
+    with FakeBackend().client() as client:
+        kb = client.knowledge_bases.create(
+            name="kb", description="", document_types=["text"], settings_=KBConfigV3()
+        )
+        assert len(kb.upload_document([document])) == 1
+        assert kb.refresh().trained_documents == 1
+        [result] = kb.search("quick")
+        assert result.score == 2 and result.source == "notes.txt"
+        assert kb.search("cat") == []
+
+        file = client.files.save(document)
+        assert client.files.get(str(file.id)) == document.read_bytes()
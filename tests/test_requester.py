@@ -0,0 +1,1132 @@
+import asyncio
+import sys
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import httpx
+import pytest
+from noxus_sdk.cache import ResponseCache
+from noxus_sdk.cassette import Cassette, CassetteMiss
+from noxus_sdk.circuit import CircuitBreaker, CircuitOpenError
+from noxus_sdk.client import Client
+from noxus_sdk.codec import JsonCodec, default_codec
+from noxus_sdk.compression import RequestCompressor
+from noxus_sdk.concurrency import ConcurrencyLimiter
+from noxus_sdk.deadlines import DeadlineExceeded, deadline_scope
+from noxus_sdk.endpoints import endpoint_family, url_template
+from noxus_sdk.fake_backend import (
+    DEFAULT_NODES,
+    FAKE_API_KEY,
+    FAKE_BASE_URL,
+    FakeBackend,
+)
+from noxus_sdk.metrics import LatencyHistogram, Metrics
+from noxus_sdk.node_cache import NodeCatalogCache
+from noxus_sdk.resources.runs import RunService
+from noxus_sdk.retry import RetryPolicy
+from noxus_sdk.tracing import JsonlSpanExporter, Tracer
+from noxus_sdk.workflows import WorkflowDefinition
+
+
+def test_sync_client_is_reused(make_client):
+    seen = []
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        seen.append(request.headers["X-API-Key"])
+        return httpx.Response(200, json={"ok": True})
+
+    with make_client(handler) as client:
+        assert client.get("/v1/nodes") == {"ok": True}
+        pool = client._get_client()
+        assert client.get("/v1/nodes") == {"ok": True}
+        assert client._get_client() is pool
+    assert seen == ["test-key", "test-key"]
+    assert client._client is None
+
+
+@pytest.mark.anyio
+async def test_async_client_is_reused(make_client):
+    def handler(request: httpx.Request) -> httpx.Response:
+        return httpx.Response(200, json={"path": request.url.path})
+
+    async with make_client(handler) as client:
+        assert await client.aget("/v1/nodes") == {"path": "/v1/nodes"}
+        pool = client._get_async_client()
+        await client.aget("/v1/nodes")
+        assert client._get_async_client() is pool
+    assert not client._async_clients
+
+
+def test_event_loops_sharing_a_client_keep_their_own_pools():
+    class Handler(BaseHTTPRequestHandler):
+        protocol_version = "HTTP/1.1"
+
+        def do_GET(self) -> None:
+            time.sleep(0.1)
+            self.send_response(200)
+            self.send_header("Content-Length", "2")
+            self.end_headers()
+            self.wfile.write(b"{}")
+
+        def log_message(self, *args) -> None:
+            pass
+
+    server = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    client = Client("test-key", load_nodes=False, load_me=False)
+    client.base_url = f"http://127.0.0.1:{server.server_address[1]}"
+
+    async def calls() -> list:
+        return await asyncio.gather(*(client.aget("/v1/nodes") for _ in range(5)))
+
+    def run(delay: float) -> list:
+        time.sleep(delay)
+        return asyncio.run(calls())
+
+    try:
+        # The second loop starts while the first one's requests are in flight
+        with ThreadPoolExecutor(2) as executor:
+            results = list(executor.map(run, [0, 0.05]))
+        assert results == [[{}] * 5] * 2
+        # Both loops are closed, so their pools are dropped on the next use
+        asyncio.run(client.aget("/v1/nodes"))
+        assert len(client._async_clients) <= 1
+        client.close()
+    finally:
+        server.shutdown()
+        server.server_close()
+
+
+def test_close_closes_pools_on_their_running_loops():
+    closed = []
+
+    class Transport(httpx.AsyncBaseTransport):
+        async def handle_async_request(self, request):
+            return httpx.Response(200, json={})
+
+        async def aclose(self) -> None:
+            closed.append(asyncio.get_running_loop())
+
+    loop = asyncio.new_event_loop()
+    thread = threading.Thread(target=loop.run_forever, daemon=True)
+    thread.start()
+    client = Client("test-key", load_nodes=False, load_me=False)
+    client.async_transport = Transport()
+    try:
+        asyncio.run_coroutine_threadsafe(client.aget("/v1/nodes"), loop).result(5)
+        asyncio.run(client.aget("/v1/nodes"))
+        asyncio.run_coroutine_threadsafe(asyncio.sleep(0), loop).result(5)
+        assert closed == []
+        client.close()
+        asyncio.run_coroutine_threadsafe(asyncio.sleep(0), loop).result(5)
+        assert closed == [loop]
+        assert not client._async_clients
+    finally:
+        loop.call_soon_threadsafe(loop.stop)
+        thread.join(5)
+        loop.close()
+
+
+def test_event_stream_uses_pool(make_client):
+    def handler(request: httpx.Request) -> httpx.Response:
+        return httpx.Response(
+            200,
+            headers={"content-type": "text/event-stream"},
+            content=b'data: {"role": "assistant", "type": "message"}\n\n',
+        )
+
+    with make_client(handler) as client:
+        event = next(client.event_stream("/v1/conversations/1/events"))
+        assert event.json()["type"] == "message"
+        assert client._client is not None
+
+
+@pytest.mark.anyio
+@pytest.mark.parametrize("is_async", [False, True])
+async def test_event_streams_hold_a_concurrency_slot(make_client, is_async: bool):
+    def handler(request: httpx.Request) -> httpx.Response:
+        return httpx.Response(
+            200,
+            headers={"content-type": "text/event-stream"},
+            content=b"data: 0\n\ndata: 1\n\n",
+        )
+
+    limiter = ConcurrencyLimiter(
+        max_concurrency=4, endpoint_limits={"conversations": 1}
+    )
+    active = []
+    with make_client(handler, concurrency=limiter) as client:
+        if is_async:
+            async for _ in client.aevent_stream("/v1/conversations/c/events"):
+                active.append(limiter.snapshot()["conversations"]["active"])
+        else:
+            for _ in client.event_stream("/v1/conversations/c/events"):
+                active.append(limiter.snapshot()["conversations"]["active"])
+    assert active == [1, 1]
+    stats = limiter.snapshot()
+    assert stats["conversations"]["acquired"] == 1
+    assert stats["conversations"]["active"] == stats["global"]["active"] == 0
+
+
+def test_http2_requires_h2(monkeypatch):
+    monkeypatch.setitem(sys.modules, "h2", None)
+    with pytest.raises(ImportError, match="noxus-sdk\\[http2\\]"):
+        Client("test-key", load_nodes=False, load_me=False, http2=True)
+
+
+@pytest.mark.anyio
+async def test_http2_reaches_both_pools():
+    pytest.importorskip("h2")
+    limits = httpx.Limits(max_connections=7)
+    async with Client(
+        "test-key", load_nodes=False, load_me=False, http2=True, limits=limits
+    ) as client:
+        for pool in (
+            client._get_client()._transport._pool,
+            client._get_async_client()._transport._pool,
+        ):
+            assert pool._http2 is True
+            assert pool._max_connections == 7
+
+
+def test_retries_throttled_request(make_client, monkeypatch):
+    sleeps = []
+    monkeypatch.setattr("noxus_sdk.client.time.sleep", sleeps.append)
+    responses = iter(
+        [
+            httpx.Response(429, headers={"Retry-After": "2"}),
+            httpx.Response(429),
+            httpx.Response(200, json={"ok": True}),
+        ]
+    )
+
+    with make_client(lambda request: next(responses)) as client:
+        assert client.get("/v1/nodes") == {"ok": True}
+
+    assert len(sleeps) == 2
+    assert 2 <= sleeps[0] <= 2.2
+    stats = client.throttle_stats.snapshot()
+    assert stats["throttled_requests"] == 1
+    assert stats["throttle_responses"] == 2
+    assert stats["total_wait"] == pytest.approx(sum(sleeps))
+
+
+def test_retry_budget_is_bounded(make_client, monkeypatch):
+    monkeypatch.setattr("noxus_sdk.client.time.sleep", lambda _: None)
+    calls = []
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        calls.append(request)
+        return httpx.Response(429)
+
+    with make_client(handler, retry_policy=RetryPolicy(max_retries=3)) as client:
+        with pytest.raises(httpx.HTTPStatusError):
+            client.get("/v1/nodes")
+    assert len(calls) == 4
+
+
+def test_paces_when_quota_is_exhausted(make_client, monkeypatch):
+    sleeps = []
+    monkeypatch.setattr("noxus_sdk.client.time.sleep", sleeps.append)
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        return httpx.Response(
+            200,
+            json={},
+            headers={"X-RateLimit-Remaining": "0", "X-RateLimit-Reset": "5"},
+        )
+
+    with make_client(handler) as client:
+        client.get("/v1/nodes")
+        assert sleeps == []
+        client.get("/v1/nodes")
+    assert len(sleeps) == 1
+    assert 0 < sleeps[0] <= 5.5
+    assert client.throttle_stats.snapshot()["paced_requests"] == 1
+
+
+def test_pacing_delay_is_jittered():
+    response = httpx.Response(
+        200, headers={"X-RateLimit-Remaining": "0", "X-RateLimit-Reset": "5"}
+    )
+    delays = {RetryPolicy().pacing_delay(response) for _ in range(20)}
+    assert len(delays) > 1
+    assert all(5 <= delay <= 5.5 for delay in delays)
+
+
+@pytest.mark.parametrize(
+    "remaining, low, high", [("4", 1.0, 1.1), ("9", 0.5, 0.55), ("10", 0, 0)]
+)
+def test_pacing_spreads_the_last_requests_of_a_window(remaining, low, high):
+    response = httpx.Response(
+        200, headers={"X-RateLimit-Remaining": remaining, "X-RateLimit-Reset": "5"}
+    )
+    assert low <= RetryPolicy().pacing_delay(response) <= high
+
+
+def test_retry_after_beyond_the_budget_fails_fast(make_client, monkeypatch):
+    sleeps = []
+    monkeypatch.setattr("noxus_sdk.client.time.sleep", sleeps.append)
+    calls = []
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        calls.append(request)
+        return httpx.Response(429, headers={"Retry-After": "30"})
+
+    policy = RetryPolicy(max_total_delay=10)
+    with make_client(handler, retry_policy=policy) as client:
+        with pytest.raises(httpx.HTTPStatusError):
+            client.get("/v1/nodes")
+    assert len(calls) == 1 and sleeps == []
+
+
+@pytest.mark.anyio
+async def test_concurrency_limit_queues_requests(make_client):
+    in_flight = 0
+    peak = 0
+
+    async def handler(request: httpx.Request) -> httpx.Response:
+        nonlocal in_flight, peak
+        in_flight += 1
+        peak = max(peak, in_flight)
+        await asyncio.sleep(0.01)
+        in_flight -= 1
+        return httpx.Response(200, json={"id": "run"})
+
+    limiter = ConcurrencyLimiter(max_concurrency=4, endpoint_limits={"runs": 2})
+    async with make_client(handler, concurrency=limiter) as client:
+        await asyncio.gather(
+            *(client.apost("/v1/workflows/w/runs", {"input": {}}) for _ in range(10)),
+            *(client.aget(f"/v1/workflows/{i}") for i in range(10)),
+        )
+
+    assert peak <= 4
+    stats = limiter.snapshot()
+    assert stats["runs"]["acquired"] == 10
+    assert stats["runs"]["max_queue_depth"] == 8
+    assert stats["runs"]["active"] == 0
+    assert stats["global"]["acquired"] == 20
+    assert stats["global"]["total_wait"] > 0
+
+
+@pytest.mark.anyio
+@pytest.mark.parametrize("is_async", [False, True])
+async def test_deadline_bounds_the_wait_for_a_concurrency_slot(is_async: bool):
+    release = threading.Event()
+
+    def slow(request: httpx.Request) -> httpx.Response:
+        release.wait(5)
+        return httpx.Response(200, json={})
+
+    async def aslow(request: httpx.Request) -> httpx.Response:
+        await asyncio.to_thread(release.wait, 5)
+        return httpx.Response(200, json={})
+
+    limiter = ConcurrencyLimiter(max_concurrency=1)
+    client = Client(
+        "test-key",
+        base_url="http://noxus.test",
+        load_nodes=False,
+        load_me=False,
+        transport=httpx.MockTransport(slow),
+        async_transport=httpx.MockTransport(aslow),
+        concurrency=limiter,
+    )
+    with ThreadPoolExecutor(1) as executor:
+        if is_async:
+            busy = asyncio.ensure_future(client.aget("/v1/nodes"))
+            await asyncio.sleep(0.05)
+        else:
+            pending = executor.submit(client.get, "/v1/nodes")
+            time.sleep(0.05)
+        start = time.monotonic()
+        with pytest.raises(DeadlineExceeded, match="global slot"):
+            with deadline_scope(0.2):
+                if is_async:
+                    await client.aget("/v1/nodes")
+                else:
+                    client.get("/v1/nodes")
+        assert time.monotonic() - start < 0.5
+        assert limiter.snapshot()["global"]["queue_depth"] == 0
+        release.set()
+        if is_async:
+            await busy
+        else:
+            pending.result()
+    assert limiter.snapshot()["global"]["active"] == 0
+    await client.aclose()
+
+
+def test_endpoint_families():
+    assert endpoint_family("POST", "/v1/workflows/w/runs") == "runs"
+    assert endpoint_family("GET", "/v1/workflows/w/run/r") == "runs"
+    assert endpoint_family("POST", "/v1/knowledge-bases/k/search") == "kb_search"
+    assert endpoint_family("POST", "/v1/knowledge-bases/k/upload_train") == "uploads"
+    assert endpoint_family("POST", "/v1/file") == "uploads"
+    assert endpoint_family("GET", "/v1/file/f") is None
+    assert endpoint_family("POST", "/v1/conversations/c") == "conversations"
+    assert endpoint_family("GET", "/v1/nodes") is None
+
+
+@pytest.mark.anyio
+async def test_identical_gets_are_coalesced(make_client):
+    calls = []
+
+    async def handler(request: httpx.Request) -> httpx.Response:
+        calls.append(str(request.url))
+        await asyncio.sleep(0.01)
+        return httpx.Response(200, json={"id": request.url.path})
+
+    async with make_client(handler, coalesce_gets=True) as client:
+        results = await asyncio.gather(
+            *(client.aget("/v1/workflows/w") for _ in range(5)),
+            client.aget("/v1/workflows/w", params={"v": 1}),
+        )
+        results[0]["id"] = "mutated"
+
+    assert results[1] == {"id": "/v1/workflows/w"}
+    assert len(calls) == 2
+    assert client.single_flight.deduplicated == 4
+
+
+def test_identical_gets_are_coalesced_across_threads(make_client):
+    calls = []
+    release = threading.Event()
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        calls.append(request)
+        release.wait(1)
+        return httpx.Response(200, json={"ok": True})
+
+    with make_client(handler, coalesce_gets=True) as client:
+        with ThreadPoolExecutor(4) as pool:
+            futures = [pool.submit(client.get, "/v1/nodes") for _ in range(4)]
+            while client.single_flight.deduplicated < 3:
+                time.sleep(0.001)
+            release.set()
+            assert [f.result() for f in futures] == [{"ok": True}] * 4
+    assert len(calls) == 1
+
+
+def test_cache_revalidates_with_etag(make_client):
+    seen = []
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        seen.append(request.headers.get("If-None-Match"))
+        if request.headers.get("If-None-Match") == '"v1"':
+            return httpx.Response(304, headers={"ETag": '"v1"'})
+        return httpx.Response(200, json={"name": "wf"}, headers={"ETag": '"v1"'})
+
+    cache = ResponseCache()
+    with make_client(handler, cache=cache) as client:
+        assert client.get("/v1/workflows/w") == {"name": "wf"}
+        assert client.get("/v1/workflows/w") == {"name": "wf"}
+    assert seen == [None, '"v1"']
+    assert cache.snapshot()["revalidated"] == 1
+
+
+def test_cache_ttl_override_and_invalidation(make_client):
+    calls = []
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        calls.append((request.method, request.url.path))
+        return httpx.Response(200, json=[{"type": "InputNode"}])
+
+    cache = ResponseCache(ttl_overrides={"/v1/nodes": 60, "/v1/workflows": 60})
+    with make_client(handler, cache=cache) as client:
+        client.get("/v1/nodes")
+        client.get("/v1/nodes")
+        client.get("/v1/workflows/w")
+        client.patch("/v1/workflows/w?force=False", {})
+        client.get("/v1/workflows/w")
+    assert calls.count(("GET", "/v1/nodes")) == 1
+    assert calls.count(("GET", "/v1/workflows/w")) == 2
+
+
+def test_cache_evicts_by_size(make_client):
+    def handler(request: httpx.Request) -> httpx.Response:
+        return httpx.Response(200, content=b"x" * 60, headers={"ETag": "e"})
+
+    cache = ResponseCache(max_bytes=100)
+    with make_client(handler, cache=cache) as client:
+        client._request("GET", "/v1/file/a")
+        client._request("GET", "/v1/file/b")
+    assert cache.snapshot()["entries"] == 1
+    assert cache.snapshot()["evictions"] == 1
+
+
+@pytest.mark.parametrize("codec", [JsonCodec(), default_codec()])
+def test_json_codec_round_trip(make_client, codec: JsonCodec):
+    bodies = []
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        bodies.append(request)
+        return httpx.Response(200, content=request.content)
+
+    body = {"input": {"text": "olá", "n": 1}, "nodes": [None, True]}
+    with make_client(handler, json_codec=codec) as client:
+        assert client.post("/v1/workflows/w/runs", body) == body
+    assert bodies[0].headers["content-type"] == "application/json"
+
+
+@pytest.mark.parametrize("encoding", ["gzip", "br", "zstd"])
+def test_large_bodies_are_compressed(make_client, encoding: str):
+    pytest.importorskip({"gzip": "gzip", "br": "brotli", "zstd": "zstandard"}[encoding])
+    requests = []
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        requests.append(request)
+        return httpx.Response(200, json={})
+
+    compressor = RequestCompressor(encoding, threshold=1024)
+    with make_client(handler, compression=compressor) as client:
+        client.post("/v1/workflows", {"name": "small"})
+        client.post("/v1/workflows", {"name": "x" * 100_000})
+
+    assert "content-encoding" not in requests[0].headers
+    assert requests[1].headers["content-encoding"] == encoding
+    assert len(requests[1].content) < 10_000
+    assert compressor.snapshot()["compressed_requests"] == 1
+
+
+def test_deadline_stops_retries_and_clamps_timeouts(make_client):
+    timeouts = []
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        timeouts.append(request.extensions["timeout"]["read"])
+        return httpx.Response(429, headers={"Retry-After": "5"})
+
+    with make_client(handler, deadline=1) as client:
+        start = time.monotonic()
+        with pytest.raises(DeadlineExceeded):
+            client.get("/v1/nodes")
+        assert time.monotonic() - start < 1
+        with deadline_scope(0.5), pytest.raises(DeadlineExceeded):
+            client.get("/v1/nodes", timeout=30)
+    assert len(timeouts) == 2
+    assert timeouts[0] <= 1 and timeouts[1] <= 0.5
+
+
+def test_circuit_breaker_opens_and_probes(make_client):
+    statuses = [500, 500, 200]
+    calls = []
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        calls.append(request.url.path)
+        if request.url.path.endswith("timeout"):
+            raise httpx.ReadTimeout("slow", request=request)
+        return httpx.Response(statuses.pop(0), json={})
+
+    breaker = CircuitBreaker(failure_threshold=2, recovery_time=0.1)
+    with make_client(handler, circuit_breaker=breaker) as client:
+        for _ in range(2):
+            with pytest.raises(httpx.HTTPStatusError):
+                client.get("/v1/workflows/w/runs/r")
+        with pytest.raises(CircuitOpenError):
+            client.get("/v1/workflows/w/runs/other")
+        assert len(calls) == 2
+        assert breaker.state("noxus.test", "runs") == "open"
+        assert not breaker.healthy()
+        # Other endpoint families keep their own circuit
+        with pytest.raises(httpx.ReadTimeout):
+            client.get("/v1/conversations/timeout")
+        assert breaker.state("noxus.test", "conversations") == "closed"
+
+        time.sleep(0.1)
+        assert breaker.state("noxus.test", "runs") == "half_open"
+        # Health agrees with state() once the recovery time has passed
+        assert breaker.healthy()
+        assert client.get("/v1/workflows/w/runs/r") == {}
+        assert breaker.state("noxus.test", "runs") == "closed"
+        assert breaker.snapshot()["noxus.test/runs"]["times_opened"] == 1
+        assert breaker.healthy()
+
+
+def test_streams_release_the_half_open_probe_on_headers(make_client):
+    statuses = [500, 200, 200]
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        return httpx.Response(statuses.pop(0), json={})
+
+    breaker = CircuitBreaker(failure_threshold=1, recovery_time=0)
+    with make_client(handler, circuit_breaker=breaker) as client:
+        with pytest.raises(httpx.HTTPStatusError):
+            client.get("/v1/workflows/w/runs/r")
+        with client.stream("GET", "/v1/workflows/w/runs/r") as response:
+            # The probe succeeded with its headers, so others get through
+            assert breaker.state("noxus.test", "runs") == "closed"
+            assert client.get("/v1/workflows/w/runs/r") == {}
+            assert response.read() == b"{}"
+
+
+def test_deadline_timeouts_do_not_open_the_circuit(make_client):
+    def handler(request: httpx.Request) -> httpx.Response:
+        time.sleep(0.02)
+        raise httpx.ReadTimeout("timed out", request=request)
+
+    breaker = CircuitBreaker(failure_threshold=1)
+    with make_client(handler, circuit_breaker=breaker) as client:
+        for _ in range(3):
+            with pytest.raises(DeadlineExceeded), deadline_scope(0.01):
+                client.get("/v1/workflows/w/runs/r")
+        assert breaker.state("noxus.test", "runs") == "closed"
+        with pytest.raises(httpx.ReadTimeout):
+            client.get("/v1/workflows/w/runs/r")
+        assert breaker.state("noxus.test", "runs") == "open"
+
+
+def test_url_template():
+    assert url_template("/v1/workflows/3f2a/runs?page=2") == "/v1/workflows/{id}/runs"
+    assert url_template("/v1/models/llms/presets") == "/v1/models/llms/presets"
+    assert (
+        url_template("/v1/admin/groups/g1/api-keys") == "/v1/admin/groups/{id}/api-keys"
+    )
+
+
+@pytest.mark.anyio
+@pytest.mark.parametrize("is_async", [False, True])
+async def test_lifecycle_hooks(make_client, is_async: bool):
+    statuses = [429, 200, 500]
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        return httpx.Response(statuses.pop(0), json={"ok": True})
+
+    events = []
+    with make_client(handler, retry_policy=RetryPolicy(base_delay=0)) as client:
+        for event in ("request", "response", "retry", "throttle", "error"):
+            client.hooks.on(event, events.append)
+        if is_async:
+            await client.apost("/v1/workflows/w1/runs", {"input": 1})
+            with pytest.raises(httpx.HTTPStatusError):
+                await client.aget("/v1/workflows/w1")
+        else:
+            client.post("/v1/workflows/w1/runs", {"input": 1})
+            with pytest.raises(httpx.HTTPStatusError):
+                client.get("/v1/workflows/w1")
+
+    assert [(e.event, e.status, e.attempt) for e in events] == [
+        ("request", None, 0),
+        ("response", 429, 0),
+        ("retry", 429, 0),
+        ("request", None, 1),
+        ("response", 200, 1),
+        ("request", None, 0),
+        ("response", 500, 0),
+        ("error", 500, 0),
+    ]
+    response = events[4]
+    assert response.template == "/v1/workflows/{id}/runs"
+    assert response.request_bytes == len(b'{"input":1}')
+    assert response.response_bytes == len(b'{"ok":true}')
+    assert response.queue_time is not None and response.elapsed >= 0
+    assert isinstance(events[-1].error, httpx.HTTPStatusError)
+
+
+@pytest.mark.anyio
+@pytest.mark.parametrize("is_async", [False, True])
+async def test_lifecycle_hooks_on_streams(make_client, is_async: bool):
+    statuses = [429, 200, 200, 503]
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        status = statuses.pop(0)
+        if status == 200 and request.url.path.endswith("/events"):
+            return httpx.Response(
+                200,
+                headers={"Content-Type": "text/event-stream"},
+                content=b"".join(f"data: {i}\n\n".encode() for i in range(3)),
+            )
+        return httpx.Response(status, content=b"file")
+
+    events = []
+    with make_client(handler, retry_policy=RetryPolicy(base_delay=0)) as client:
+        for event in ("request", "response", "retry", "error"):
+            client.hooks.on(event, events.append)
+        if is_async:
+            async with client.astream("GET", "/v1/file/f1") as response:
+                assert await response.aread() == b"file"
+            received = [
+                e.data async for e in client.aevent_stream("/v1/conversations/c/events")
+            ]
+            with pytest.raises(httpx.HTTPStatusError):
+                async with client.astream("GET", "/v1/file/f2"):
+                    pass
+        else:
+            with client.stream("GET", "/v1/file/f1") as response:
+                assert response.read() == b"file"
+            received = [
+                e.data for e in client.event_stream("/v1/conversations/c/events")
+            ]
+            with pytest.raises(httpx.HTTPStatusError):
+                with client.stream("GET", "/v1/file/f2"):
+                    pass
+
+    assert received == ["0", "1", "2"]
+    assert [(e.event, e.template, e.status, e.attempt) for e in events] == [
+        ("request", "/v1/file/{id}", None, 0),
+        ("response", "/v1/file/{id}", 429, 0),
+        ("retry", "/v1/file/{id}", 429, 0),
+        ("request", "/v1/file/{id}", None, 1),
+        ("response", "/v1/file/{id}", 200, 1),
+        ("request", "/v1/conversations/{id}/events", None, 0),
+        ("response", "/v1/conversations/{id}/events", 200, 0),
+        ("request", "/v1/file/{id}", None, 0),
+        ("response", "/v1/file/{id}", 503, 0),
+        ("error", "/v1/file/{id}", 503, 0),
+    ]
+    # Fired after the body was read, so the whole stream is counted
+    assert events[4].response_bytes == len(b"file")
+    assert events[6].response_bytes == len(b"data: 0\n\n") * 3
+
+
+def test_latency_histogram_quantiles():
+    histogram = LatencyHistogram()
+    for i in range(1, 1001):
+        histogram.record(i / 1000)
+    assert histogram.quantile(0.5) == pytest.approx(0.5, rel=0.02)
+    assert histogram.quantile(0.99) == pytest.approx(0.99, rel=0.02)
+    assert histogram.quantile(1) == 1
+
+
+def test_client_stats_and_prometheus_export(make_client, tmp_path):
+    statuses = [429, 200, 404]
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        return httpx.Response(statuses.pop(0), json={"ok": True})
+
+    with make_client(
+        handler, retry_policy=RetryPolicy(base_delay=0), metrics=Metrics()
+    ) as client:
+        client.post("/v1/workflows/w1/runs", {"input": 1})
+        with pytest.raises(httpx.HTTPStatusError):
+            client.get("/v1/workflows/w2/runs")
+        stats = client.stats()
+        runs = stats["POST /v1/workflows/{id}/runs"]
+        assert runs["count"] == 2 and runs["throttled"] == 1 and runs["errors"] == 0
+        assert runs["bytes_out"] == 2 * len(b'{"input":1}')
+        assert runs["latency"]["p99"] > 0
+        assert stats["GET /v1/workflows/{id}/runs"]["errors"] == 1
+
+        client.metrics.write_prometheus(tmp_path / "noxus.prom")
+        text = (tmp_path / "noxus.prom").read_text()
+        assert (
+            'noxus_sdk_throttled_total{method="POST",endpoint="/v1/workflows/{id}/runs"} 1'
+            in text
+        )
+        server = client.metrics.serve_prometheus(port=0)
+        try:
+            port = server.server_address[1]
+            served = httpx.get(f"http://127.0.0.1:{port}/metrics").text
+        finally:
+            server.shutdown()
+            server.server_close()
+        assert "noxus_sdk_request_duration_seconds_count" in served
+
+
+@pytest.mark.anyio
+async def test_client_stats_count_streams(make_client):
+    def handler(request: httpx.Request) -> httpx.Response:
+        if request.url.path.endswith("/events"):
+            return httpx.Response(
+                200,
+                headers={"Content-Type": "text/event-stream"},
+                content=b"data: 1\n\n",
+            )
+        return httpx.Response(200, content=b"x" * 100)
+
+    with make_client(handler) as client:
+        with client.stream("GET", "/v1/file/f1") as response:
+            response.read()
+        assert client.stats() == {}
+
+    with make_client(handler, metrics=Metrics()) as client:
+        with client.stream("GET", "/v1/file/f1") as response:
+            response.read()
+        async with client.astream("GET", "/v1/file/f2") as response:
+            await response.aread()
+        list(client.event_stream("/v1/conversations/c/events"))
+        [e async for e in client.aevent_stream("/v1/conversations/c/events")]
+        stats = client.stats()
+    assert stats["GET /v1/file/{id}"]["count"] == 2
+    assert stats["GET /v1/file/{id}"]["bytes_in"] == 200
+    assert stats["GET /v1/conversations/{id}/events"]["count"] == 2
+
+
+@pytest.mark.anyio
+@pytest.mark.parametrize("is_async", [False, True])
+async def test_streams_emit_attempt_spans(make_client, is_async: bool):
+    statuses = [429, 200, 200, 200, 500]
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        status = statuses.pop(0)
+        if status == 200 and request.url.path.endswith("/events"):
+            return httpx.Response(
+                200,
+                headers={"Content-Type": "text/event-stream"},
+                content=b"data: 1\n\n",
+            )
+        return httpx.Response(status, headers={"Retry-After": "0"}, json=[])
+
+    tracer = Tracer()
+    with make_client(handler, tracer=tracer) as client:
+        with tracer.start_as_current_span("outer") as outer:
+            if is_async:
+                async with client.astream("GET", "/v1/file/f1") as response:
+                    await response.aread()
+                    # Calls made while the stream is open are not its children
+                    await client.aget("/v1/nodes")
+                [e async for e in client.aevent_stream("/v1/conversations/c/events")]
+                with pytest.raises(httpx.HTTPStatusError):
+                    async with client.astream("GET", "/v1/file/f2"):
+                        pass
+            else:
+                with client.stream("GET", "/v1/file/f1") as response:
+                    response.read()
+                    client.get("/v1/nodes")
+                list(client.event_stream("/v1/conversations/c/events"))
+                with pytest.raises(httpx.HTTPStatusError):
+                    with client.stream("GET", "/v1/file/f2"):
+                        pass
+
+    spans = tracer.exporter.get_finished_spans()
+    assert [s.name for s in spans] == [
+        "GET /v1/file/{id}",
+        "GET /v1/nodes",
+        "GET /v1/file/{id}",
+        "GET /v1/conversations/{id}/events",
+        "GET /v1/file/{id}",
+        "outer",
+    ]
+    assert {s.parent_id for s in spans[:-1]} == {outer.span_id}
+    retried, nodes, streamed, events, failed = spans[:-1]
+    assert retried.attributes["http.response.status_code"] == 429
+    assert retried.events[0]["name"] == "retry"
+    assert streamed.attributes["http.request.resend_count"] == 1
+    # The download span stays open until the caller leaves the block
+    assert streamed.end_time >= nodes.end_time
+    assert events.attributes["http.response.status_code"] == 200
+    assert failed.status == "ERROR"
+
+
+def test_jsonl_span_exporter(tmp_path):
+    exporter = JsonlSpanExporter(tmp_path / "spans.jsonl")
+    tracer = Tracer(exporter)
+    with tracer.start_as_current_span("outer"), tracer.start_as_current_span("inner"):
+        pass
+    with pytest.raises(ValueError), tracer.start_as_current_span("failing"):
+        raise ValueError("boom")
+    exporter.shutdown()
+    lines = [
+        JsonCodec().loads(line)
+        for line in (tmp_path / "spans.jsonl").read_text().splitlines()
+    ]
+    assert [line["name"] for line in lines] == ["inner", "outer", "failing"]
+    assert lines[0]["parent_span_id"] == lines[1]["span_id"]
+    assert lines[2]["status"]["code"] == "ERROR"
+
+
+def _sse_handler(request: httpx.Request) -> httpx.Response:
+    if not request.url.path.endswith("/events"):
+        return httpx.Response(200, json={"path": request.url.path})
+
+    def events():
+        for i in range(3):
+            time.sleep(0.05)
+            yield f"event: message\ndata: {i}\n\n".encode()
+
+    return httpx.Response(
+        200, headers={"Content-Type": "text/event-stream"}, content=events()
+    )
+
+
+def test_cassette_record_and_replay(make_client, tmp_path):
+    path = tmp_path / "api.jsonl.gz"
+    with make_client(_sse_handler, cassette=Cassette(path, mode="record")) as client:
+        assert client.get("/v1/nodes") == {"path": "/v1/nodes"}
+        events = [e.data for e in client.event_stream("/v1/conversations/c/events")]
+        client.cassette.close()
+    assert events == ["0", "1", "2"]
+
+    def offline(request: httpx.Request) -> httpx.Response:
+        raise AssertionError("replay must not reach the transport")
+
+    cassette = Cassette(path, allow_repeats=False)
+    with make_client(offline, cassette=cassette) as client:
+        start = time.monotonic()
+        assert client.get("/v1/nodes") == {"path": "/v1/nodes"}
+        replayed = [e.data for e in client.event_stream("/v1/conversations/c/events")]
+        assert time.monotonic() - start < 0.1
+        assert replayed == events
+        with pytest.raises(CassetteMiss):
+            client.get("/v1/nodes", headers={"X-Other": "1"})
+
+    with make_client(offline, cassette=Cassette(path, speed=1.0)) as client:
+        start = time.monotonic()
+        list(client.event_stream("/v1/conversations/c/events"))
+        assert time.monotonic() - start >= 0.14
+
+
+@pytest.mark.anyio
+async def test_cassette_async_replay(make_client, tmp_path):
+    path = tmp_path / "api.jsonl"
+    with make_client(_sse_handler, cassette=Cassette(path, mode="record")) as client:
+        client.get("/v1/workflows/w")
+        client.cassette.close()
+    async with make_client(_sse_handler, cassette=Cassette(path)) as client:
+        results = await asyncio.gather(
+            *(client.aget("/v1/workflows/w") for _ in range(5))
+        )
+    assert results == [{"path": "/v1/workflows/w"}] * 5
+
+
+def test_fake_backend_throttling_is_retried():
+    backend = FakeBackend(throttle_rate=0.5, seed=1)
+    with backend.client(load_me=False, load_nodes=False) as client:
+        for _ in range(10):
+            client.get("/v1/models/llms")
+        assert client.throttle_stats.throttle_responses == backend.throttled > 0
+    assert backend.requests["GET /v1/models/llms"] == 10 + backend.throttled
+
+
+def test_fake_backend_serves_over_http():
+    pytest.importorskip("hypercorn")
+    backend = FakeBackend()
+    with backend.serve() as base_url:
+        client = Client(FAKE_API_KEY, base_url=base_url)
+        assert client.get_models() == backend.models
+    assert backend.requests["GET /v1/nodes"] == 1
+
+
+def test_services_are_built_on_first_access(make_client):
+    client = make_client(lambda request: httpx.Response(200, json={}))
+    assert "runs" not in vars(client)
+    assert isinstance(client.runs, RunService)
+    assert client.runs is client.runs
+    assert "knowledge_bases" not in vars(client)
+
+
+@pytest.mark.anyio
+async def test_acreate_loads_nodes_and_identity_concurrently():
+    catalogs = [[], DEFAULT_NODES[:1]]
+    calls = []
+
+    async def handler(request: httpx.Request) -> httpx.Response:
+        calls.append(request.url.path)
+        await asyncio.sleep(0.1)
+        if request.url.path == "/v1/nodes":
+            return httpx.Response(200, json=catalogs[min(len(calls), 2) - 1])
+        me = {"id": "k", "name": "key", "tenant_admin": True, "value": "v"}
+        return httpx.Response(200, json=me)
+
+    def blocking(request: httpx.Request) -> httpx.Response:
+        raise AssertionError("acreate must not use the sync client")
+
+    start = time.monotonic()
+    client = await Client.acreate(
+        "test-key",
+        base_url="http://noxus.test",
+        transport=httpx.MockTransport(blocking),
+        async_transport=httpx.MockTransport(handler),
+        refresh_nodes_every=0.05,
+    )
+    assert time.monotonic() - start < 0.18
+    assert client.admin.enabled is True
+    assert sorted(calls) == ["/v1/admin/me", "/v1/nodes"]
+
+    await asyncio.sleep(0.2)
+    assert client.nodes == DEFAULT_NODES[:1]
+    await client.aclose()
+    refreshes = len(calls)
+    await asyncio.sleep(0.2)
+    assert len(calls) == refreshes > 2
+
+
+@pytest.mark.anyio
+@pytest.mark.parametrize("from_thread", [False, True])
+async def test_close_stops_refreshing_nodes(tmp_path, from_thread: bool):
+    backend = FakeBackend()
+    cache = NodeCatalogCache(tmp_path, ttl=0)
+    load, threads = cache.load, []
+
+    def recording_load(*args):
+        threads.append(threading.get_ident())
+        return load(*args)
+
+    cache.load = recording_load
+    client = await Client.acreate(
+        FAKE_API_KEY,
+        base_url=FAKE_BASE_URL,
+        transport=backend.transport(),
+        async_transport=backend.async_transport(),
+        load_me=False,
+        node_cache=cache,
+        refresh_nodes_every=0.01,
+    )
+    await asyncio.sleep(0.05)
+    assert len(threads) > 1 and threading.get_ident() not in threads
+
+    refresher = client._nodes_refresher
+    if from_thread:
+        await asyncio.to_thread(client.close)
+    else:
+        client.close()
+    await asyncio.wait({refresher}, timeout=1)
+    assert refresher.cancelled()
+    fetches = backend.requests["GET /v1/nodes"]
+    await asyncio.sleep(0.05)
+    assert backend.requests["GET /v1/nodes"] == fetches
+
+
+@pytest.mark.anyio
+async def test_acreate_cleans_up_when_loading_fails(monkeypatch):
+    cancelled = asyncio.Event()
+
+    async def handler(request: httpx.Request) -> httpx.Response:
+        if request.url.path == "/v1/nodes":
+            return httpx.Response(500, json={})
+        try:
+            await asyncio.sleep(10)
+        except asyncio.CancelledError:
+            cancelled.set()
+            raise
+        return httpx.Response(200, json={})
+
+    closed = []
+    original = Client.aclose
+
+    async def aclose(self) -> None:
+        closed.append(self)
+        await original(self)
+
+    monkeypatch.setattr(Client, "aclose", aclose)
+    with pytest.raises(httpx.HTTPStatusError):
+        await Client.acreate(
+            "test-key",
+            base_url="http://noxus.test",
+            async_transport=httpx.MockTransport(handler),
+        )
+    assert cancelled.is_set()
+    assert len(closed) == 1 and not closed[0]._async_clients
+
+
+def test_iter_all_streams_every_page_with_prefetch():
+    backend = FakeBackend()
+    runs = [backend._new_run("w", {}, {})["id"] for _ in range(1050)]
+    with backend.client(load_me=False, load_nodes=False) as client:
+        assert [run.id for run in client.runs.iter_all("w", page_size=50)] == runs
+        requests = backend.requests["GET /v1/workflows/{id}/runs"]
+        # Page sizes grow on the fast fake backend, and the total stops the scan
+        assert requests < 1050 // 50
+
+        pages = client.iter_pages("/v1/workflows/w/runs", page_size=100)
+        first = next(pages)
+        deadline = time.monotonic() + 1
+        while backend.requests["GET /v1/workflows/{id}/runs"] < requests + 2:
+            assert time.monotonic() < deadline, "next page was not prefetched"
+            time.sleep(0.01)
+        assert [run["id"] for run in first] == runs[:100]
+        pages.close()
+
+
+def test_iter_pages_handles_capped_page_sizes_and_short_pages(make_client):
+    items = [{"n": n} for n in range(237)]
+    sizes = []
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        page = int(request.url.params["page"])
+        size = min(int(request.url.params["size"]), 40)
+        sizes.append(int(request.url.params["size"]))
+        chunk = items[(page - 1) * size : page * size]
+        return httpx.Response(200, json={"items": chunk, "page": page, "size": size})
+
+    with make_client(handler) as client:
+        pages = list(client.iter_pages("/v1/things", page_size=25, prefetch=False))
+    assert [item for page in pages for item in page] == items
+    assert max(len(page) for page in pages) <= 40
+    assert max(sizes) > 40
+
+
+@pytest.mark.anyio
+@pytest.mark.parametrize("is_async", [False, True])
+async def test_iter_pages_falls_back_when_a_grown_size_is_rejected(
+    make_client, is_async: bool
+):
+    items = [{"id": i} for i in range(700)]
+    sizes = []
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        page, size = int(request.url.params["page"]), int(request.url.params["size"])
+        sizes.append(size)
+        if size > 200:
+            return httpx.Response(422, json={"detail": "size must be <= 200"})
+        chunk = items[(page - 1) * size : page * size]
+        return httpx.Response(200, json={"items": chunk, "total": len(items)})
+
+    with make_client(handler) as client:
+        if is_async:
+            pages = client.aiter_pages("/v1/things", page_size=100)
+            received = [item async for page in pages for item in page]
+        else:
+            pages = client.iter_pages("/v1/things", page_size=100)
+            received = [item for page in pages for item in page]
+    assert received == items
+    assert sizes.count(400) == 1
+    assert max(sizes[sizes.index(400) + 1 :]) == 200
+
+
+def test_iter_pages_does_not_retry_a_rejected_first_page(make_client):
+    def handler(request: httpx.Request) -> httpx.Response:
+        return httpx.Response(422, json={"detail": "size must be <= 50"})
+
+    with make_client(handler) as client:
+        with pytest.raises(httpx.HTTPStatusError):
+            list(client.iter_pages("/v1/things", page_size=100))
+
+
+@pytest.mark.anyio
+async def test_aiter_all_streams_every_page():
+    backend = FakeBackend()
+    with backend.client(load_me=False, load_nodes=False) as client:
+        saved = [
+            client.workflows.save(WorkflowDefinition(name=f"w{i}")).id
+            for i in range(25)
+        ]
+    async with backend.client(load_me=False, load_nodes=False) as client:
+        workflows = client.workflows.aiter_all(page_size=10)
+        assert [w.id async for w in workflows] == saved
+        workflows = client.workflows.aiter_all(page_size=10, concurrency=3)
+        assert [w.id async for w in workflows] == saved
+
+
+@pytest.mark.anyio
+@pytest.mark.parametrize("ordered", [True, False])
+async def test_aiter_pages_fetches_concurrently_with_bounded_window(
+    make_client, ordered
+):
+    items = [{"n": n} for n in range(1000)]
+    state = {"active": 0, "peak": 0, "requests": 0}
+
+    async def handler(request: httpx.Request) -> httpx.Response:
+        page = int(request.url.params["page"])
+        size = int(request.url.params["size"])
+        state["requests"] += 1
+        state["active"] += 1
+        state["peak"] = max(state["peak"], state["active"])
+        # Later pages answer faster, so unordered results come out of order
+        await asyncio.sleep(0.05 / page)
+        state["active"] -= 1
+        chunk = items[(page - 1) * size : page * size]
+        return httpx.Response(200, json={"items": chunk, "total": len(items)})
+
+    async with make_client(handler) as client:
+        pages = client.aiter_pages(
+            "/v1/things", page_size=50, concurrency=4, ordered=ordered
+        )
+        received = [item async for page in pages for item in page]
+    assert state["requests"] == 20
+    assert state["peak"] == 4
+    if ordered:
+        assert received == items
+    else:
+        assert sorted(received, key=lambda item: item["n"]) == items
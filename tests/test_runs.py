@@ -0,0 +1,86 @@
+import time
+
+import httpx
+import pytest
+from noxus_sdk.deadlines import DeadlineExceeded, deadline_scope
+from noxus_sdk.fake_backend import FakeBackend
+from noxus_sdk.resources.runs import Run
+from noxus_sdk.tracing import Tracer
+from noxus_sdk.workflows import WorkflowDefinition
+
+
+def _run_handler(request: httpx.Request) -> httpx.Response:
+    return httpx.Response(
+        200,
+        json={
+            "id": "r",
+            "group_id": "g",
+            "workflow_id": "w",
+            "input": {},
+            "status": "running",
+            "progress": 0,
+            "created_at": "2024-01-01",
+        },
+    )
+
+
+def test_run_wait_timeout(make_client):
+    with make_client(_run_handler) as client:
+        run = Run(client=client, **client.get("/v1/workflows/w/runs/r"))
+        start = time.monotonic()
+        with pytest.raises(DeadlineExceeded):
+            run.wait(interval=0.05, timeout=0.3)
+        assert time.monotonic() - start < 0.5
+
+
+@pytest.mark.anyio
+async def test_run_a_wait_shares_outer_deadline(make_client):
+    async with make_client(_run_handler) as client:
+        run = Run(client=client, **(await client.aget("/v1/workflows/w/runs/r")))
+        with deadline_scope(0.2), pytest.raises(DeadlineExceeded):
+            await run.a_wait(interval=0.05, timeout=10)
+
+
+def test_run_wait_emits_nested_spans(make_client):
+    responses = [429, "running", "completed"]
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        status = responses.pop(0)
+        if status == 429:
+            return httpx.Response(429, headers={"Retry-After": "0"})
+        return httpx.Response(
+            200, json={**_run_handler(request).json(), "status": status}
+        )
+
+    tracer = Tracer()
+    run_data = _run_handler(httpx.Request("GET", "http://noxus.test")).json()
+    with make_client(handler, tracer=tracer) as client:
+        run = Run(client=client, **run_data)
+        run.wait(interval=0)
+    spans = {s.name: s for s in tracer.exporter.get_finished_spans()}
+    wait, http = spans["Run.wait"], spans["GET /v1/workflows/{id}/runs/{id}"]
+    assert wait.parent_id is None and wait.attributes["poll.count"] == 2
+    polls = [
+        s for s in tracer.exporter.get_finished_spans() if s.name == "Run.wait.poll"
+    ]
+    assert {p.parent_id for p in polls} == {wait.span_id}
+    attempts = [s for s in tracer.exporter.get_finished_spans() if s.name == http.name]
+    assert [a.attributes["http.response.status_code"] for a in attempts] == [
+        429,
+        200,
+        200,
+    ]
+    assert attempts[0].events[0]["name"] == "retry"
+    assert attempts[0].parent_id == attempts[1].parent_id == polls[0].span_id
+    assert {s.trace_id for s in spans.values()} == {wait.trace_id}
+
+
+def test_fake_backend_workflow_run_progress():
+    backend = FakeBackend(run_duration=0.2)
+    with backend.client() as client:
+        workflow = client.workflows.save(WorkflowDefinition(name="fake"))
+        run = workflow.run({"text": "hi"})
+        assert run.status == "queued"
+        assert run.wait(interval=0.02).output == {"output": {"text": "hi"}}
+        assert [w.id for w in client.workflows.list()] == [workflow.id]
+    assert backend.requests["GET /v1/workflows/{id}/runs/{id}"] > 1
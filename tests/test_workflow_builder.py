@@ -1,6 +1,19 @@
+import os
+from concurrent.futures import ThreadPoolExecutor
+
+import httpx
 import pytest
+from pydantic import ValidationError
 from noxus_sdk.client import Client
-from noxus_sdk.workflows import ConfigError, WorkflowDefinition
+from noxus_sdk.fake_backend import (
+    DEFAULT_NODES,
+    FAKE_API_KEY,
+    FAKE_BASE_URL,
+    FakeBackend,
+)
+from noxus_sdk.node_cache import NodeCatalogCache
+from noxus_sdk.workflows import ConfigError, WorkflowDefinition, load_node_types
+from noxus_sdk.workflows.workflow import NODE_TYPES
 
 
 @pytest.mark.test
@@ -52,3 +65,126 @@ def test_full_workflow_link_many(client: Client):
     workflow.link_many(ai, output)
     assert len(workflow.nodes) == 3
     assert len(workflow.edges) == 2
+
+
+COMPOSE_NODE = {
+    **DEFAULT_NODES[1],
+    "type": "ComposeNode",
+    "title": "Compose",
+    "inputs": [{"name": "parts", "type": "variable_type_size_connector"}],
+}
+
+
+def test_connector_config_is_not_shared_with_the_registry():
+    backend = FakeBackend(nodes=[*DEFAULT_NODES, COMPOSE_NODE])
+    with backend.client() as client:
+        for key in ("a", "b"):
+            workflow = WorkflowDefinition(client=client)
+            compose = workflow.node("ComposeNode").config(template="x")
+            compose.input("parts", key, type_definition="str")
+            assert list(compose.connector_config["inputs"][0]["type_definitions"]) == [
+                key
+            ]
+        assert client.node_types["ComposeNode"].inputs == COMPOSE_NODE["inputs"]
+
+
+def test_load_node_types_updates_the_module_registry_in_place():
+    registry = NODE_TYPES
+    load_node_types([COMPOSE_NODE])
+    assert list(registry) == ["ComposeNode"]
+    node_types = load_node_types(DEFAULT_NODES)
+    assert list(registry) == list(node_types) == [n["type"] for n in DEFAULT_NODES]
+
+
+def test_empty_client_catalog_does_not_fall_back_to_the_module_registry():
+    with FakeBackend(nodes=[]).client() as client:
+        assert len(client.node_types) == 0
+        load_node_types(DEFAULT_NODES)
+        workflow = WorkflowDefinition(name="w")
+        workflow.node("InputNode")
+        with pytest.raises(ValidationError, match="InputNode not found"):
+            WorkflowDefinition.model_validate({"client": client, **workflow.to_noxus()})
+
+
+def test_node_catalog_cache_skips_and_revalidates_fetches(tmp_path):
+    backend = FakeBackend()
+    cache = NodeCatalogCache(tmp_path)
+    with backend.client(node_cache=cache) as client:
+        assert client.nodes == DEFAULT_NODES
+    with backend.client(node_cache=cache) as client:
+        workflow = WorkflowDefinition(name="cached")
+        workflow.node("TextGenerationNode").config(template="((Input))")
+    assert backend.requests["GET /v1/nodes"] == 1
+
+    stale = NodeCatalogCache(tmp_path, ttl=0)
+    entry = stale.load(FAKE_BASE_URL, FAKE_API_KEY)
+    assert entry is not None and entry.etag
+    with backend.client(node_cache=stale) as client:
+        assert client.nodes == DEFAULT_NODES
+    assert backend.requests["GET /v1/nodes"] == 2
+    assert stale.load(FAKE_BASE_URL, FAKE_API_KEY).fetched_at > entry.fetched_at
+
+    with backend.client("other-workspace-key", node_cache=cache) as client:
+        assert client.nodes == DEFAULT_NODES
+    assert backend.requests["GET /v1/nodes"] == 3
+    assert cache.path(FAKE_BASE_URL, "other-workspace-key") != cache.path(
+        FAKE_BASE_URL, FAKE_API_KEY
+    )
+
+
+@pytest.mark.parametrize(
+    "content",
+    ["{not json", "[]", '{"format": 1}', '{"format": 1, "base_url": null}'],
+)
+def test_node_catalog_cache_treats_malformed_files_as_a_miss(tmp_path, content):
+    cache = NodeCatalogCache(tmp_path)
+    path = cache.path(FAKE_BASE_URL, FAKE_API_KEY)
+    path.write_text(content)
+    assert cache.load(FAKE_BASE_URL, FAKE_API_KEY) is None
+
+
+def test_node_catalog_cache_removes_its_temporary_file_on_failure(
+    tmp_path, monkeypatch
+):
+    def fail(src, dst):
+        raise OSError("disk full")
+
+    monkeypatch.setattr(os, "replace", fail)
+    with FakeBackend().client(node_cache=NodeCatalogCache(tmp_path)) as client:
+        assert client.nodes == DEFAULT_NODES
+    assert list(tmp_path.iterdir()) == []
+
+
+def test_clients_keep_their_own_node_types(make_client):
+    def catalog(nodes):
+        return lambda request: httpx.Response(200, json=nodes)
+
+    full = make_client(catalog(DEFAULT_NODES))
+    inputs_only = make_client(catalog(DEFAULT_NODES[:1]))
+    full.refresh_nodes()
+    inputs_only.refresh_nodes()
+    assert "TextGenerationNode" in full.node_types
+    assert list(inputs_only.node_types) == ["InputNode"]
+
+    workflow = WorkflowDefinition(client=full, name="isolated")
+    workflow.node("TextGenerationNode")
+    with pytest.raises(AssertionError):
+        WorkflowDefinition(client=inputs_only).node("TextGenerationNode")
+    # Nodes loaded from the backend are resolved with the client's catalog too
+    data = {"client": full, **workflow.to_noxus()}
+    assert len(WorkflowDefinition.model_validate(data).nodes) == 1
+
+    registries = []
+
+    def refresh():
+        for _ in range(50):
+            full.refresh_nodes()
+
+    def read():
+        for _ in range(500):
+            registries.append(len(full.node_types))
+
+    with ThreadPoolExecutor(4) as pool:
+        for future in [pool.submit(refresh), pool.submit(read), pool.submit(read)]:
+            future.result()
+    assert set(registries) == {len(DEFAULT_NODES)}